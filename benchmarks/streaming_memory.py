@@ -0,0 +1,107 @@
+"""Peak memory of a full build over synthetic notes, with and without streaming mode.
+
+Each build runs in a fresh subprocess, so the reported peak RSS belongs to that
+build only. Streaming mode drops each article after its page is written, but
+it still keeps a small record per note (metadata, build plan entry, taxonomy
+and feed entries), so its peak grows with the number of notes, only much more
+slowly than a default build. Run from the repository root:
+
+```shell
+uv run python benchmarks/streaming_memory.py
+uv run python benchmarks/streaming_memory.py --sizes 1000 10000 --modes streaming
+```
+
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import harrix_pyssg as hsg
+
+DEFAULT_SIZES = (1_000, 10_000, 50_000)
+MODES = ("default", "streaming")
+PARAGRAPHS = 20
+
+_NOTE_TEMPLATE = """---
+date: {date}
+categories: [bench]
+tags: [tag-{tag}]
+---
+
+# Note {number}
+
+{body}
+"""
+
+
+def build(md_folder: Path, html_folder: Path, *, streaming: bool) -> None:
+    """Build the site and print `seconds peak_rss_kib` on one line."""
+    start = time.perf_counter()
+    sg = hsg.StaticSiteGenerator(md_folder, streaming=streaming)
+    sg.generate_site(html_folder, taxonomy_pages=True)
+    print(f"{time.perf_counter() - start:.2f} {_peak_rss_kib()}")
+
+
+def main() -> None:
+    """Generate corpora and print a table of peak RSS per size and mode."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "MD_FOLDER", "HTML_FOLDER"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, md_folder, html_folder = args.child
+        build(Path(md_folder), Path(html_folder), streaming=mode == "streaming")
+        return
+
+    print(f"{'notes':>8} {'mode':>10} {'seconds':>9} {'peak RSS, MiB':>14}")
+    for size in args.sizes:
+        with TemporaryDirectory() as temp_dir:
+            md_folder = Path(temp_dir) / "md"
+            write_notes(md_folder, size)
+            for mode in args.modes:
+                html_folder = Path(temp_dir) / f"html-{mode}"
+                result = subprocess.run(
+                    [sys.executable, __file__, "--child", mode, str(md_folder), str(html_folder)],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+                seconds, peak_kib = result.stdout.split()[-2:]
+                print(f"{size:>8} {mode:>10} {seconds:>9} {int(peak_kib) / 1024:>14.1f}")
+
+
+def write_notes(md_folder: Path, count: int) -> None:
+    """Write `count` notes as `<md_folder>/<name>/<name>.md`."""
+    body = "\n\n".join(f"Paragraph {index} with `code`, **bold** text and a [link](#)." for index in range(PARAGRAPHS))
+    for number in range(count):
+        name = f"note-{number:06d}"
+        folder = md_folder / name[:-3] / name
+        folder.mkdir(parents=True, exist_ok=True)
+        date = f"20{number % 20:02d}-{number % 12 + 1:02d}-{number % 28 + 1:02d}"
+        (folder / f"{name}.md").write_text(
+            _NOTE_TEMPLATE.format(date=date, tag=number % 50, number=number, body=body), encoding="utf8"
+        )
+
+
+def _peak_rss_kib() -> int:
+    """Return the peak resident set size of this process in KiB (needs `psutil` on Windows)."""
+    try:
+        import resource  # noqa: PLC0415
+    except ImportError:  # Windows
+        import psutil  # noqa: PLC0415
+
+        return psutil.Process().memory_info().peak_wset // 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,19 @@
 """Harrix PySSG — Simple static site generator in Python."""
 
+from .archive import ArchiveFileSystem
 from .article import Article
+from .article_meta import ArticleMeta
+from .build_events import BuildEvent, BuildEvents, JsonLinesSink
+from .build_plan import BuildPlan
+from .cli import main
+from .discovery import DiscoveryCache, iter_markdown_files
+from .feeds import FeedEntry, write_atom_feeds, write_sitemap
+from .filesystem import FileSystem, LocalFileSystem, MemoryFileSystem
+from .git_source import GitFileSystem
+from .html_minifier import HtmlMinifier, minify_html
+from .image_sizes import ImageSizeCache, read_image_size
+from .link_index import BrokenLink, LinkIndex
+from .memory_profile import AllocationSite, MemoryBudgetError, MemoryProfiler, PhaseMemory
 from .note_meta import (
     ResolvedNoteDate,
     resolve_note_date,
@@ -9,20 +22,68 @@ from .note_meta import (
     title_from_id,
 )
 from .page_assembler import PageAssembler, PageFeatures, detect_page_features, extract_title
+from .pipeline import PipelineStats, QueueStats, run_pipeline
+from .precompress import Precompressor, PrecompressStats
+from .render_budget import BudgetViolation, RenderBudget, RenderGuard
+from .search_index import SearchIndex, extract_search_terms
+from .sharding import Shard, merge_shards
 from .static_site_generator import StaticSiteGenerator
-from .theme_slicer import ThemeSlicer
+from .taxonomy import TaxonomyEntry, TaxonomyIndex
+from .theme_slicer import SliceStats, ThemeSlicer, compile_theme_bundle
 
 __all__ = [
+    "AllocationSite",
+    "ArchiveFileSystem",
     "Article",
+    "ArticleMeta",
+    "BrokenLink",
+    "BudgetViolation",
+    "BuildEvent",
+    "BuildEvents",
+    "BuildPlan",
+    "DiscoveryCache",
+    "FeedEntry",
+    "FileSystem",
+    "GitFileSystem",
+    "HtmlMinifier",
+    "ImageSizeCache",
+    "JsonLinesSink",
+    "LinkIndex",
+    "LocalFileSystem",
+    "MemoryBudgetError",
+    "MemoryFileSystem",
+    "MemoryProfiler",
     "PageAssembler",
     "PageFeatures",
+    "PhaseMemory",
+    "PipelineStats",
+    "PrecompressStats",
+    "Precompressor",
+    "QueueStats",
+    "RenderBudget",
+    "RenderGuard",
     "ResolvedNoteDate",
+    "SearchIndex",
+    "Shard",
+    "SliceStats",
     "StaticSiteGenerator",
+    "TaxonomyEntry",
+    "TaxonomyIndex",
     "ThemeSlicer",
+    "compile_theme_bundle",
     "detect_page_features",
+    "extract_search_terms",
     "extract_title",
+    "iter_markdown_files",
+    "main",
+    "merge_shards",
+    "minify_html",
+    "read_image_size",
     "resolve_note_date",
     "resolve_note_date_for_path",
     "resolve_note_title",
+    "run_pipeline",
     "title_from_id",
+    "write_atom_feeds",
+    "write_sitemap",
 ]
@@ -0,0 +1,211 @@
+"""Write a built site straight into a `.zip` or `.tar.gz` deploy archive."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import os
+import shutil
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Self
+
+from harrix_pyssg.filesystem import FileSystem, LocalFileSystem
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+ARCHIVE_FORMATS = ("zip", "tar.gz")
+ARCHIVE_MTIME = 315_532_800  # 1980-01-01T00:00:00Z, the earliest time a zip entry can hold
+ARCHIVE_GZIP_LEVEL = 6
+ARCHIVE_STORED_SUFFIXES = frozenset(
+    {".gz", ".zst", ".br", ".zip", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".woff", ".woff2", ".mp4"}
+)
+
+
+class ArchiveFileSystem(FileSystem):
+    """Write-only target that streams every written file into one archive.
+
+    Entries are added in the order they are written, which for `generate_site()`
+    is the build order (theme assets, then articles by handle with their files
+    sorted by name). Timestamps, permissions and owners are fixed, so the same
+    site gives a byte-identical archive. Written files are not kept in memory,
+    and local files are copied into the archive in chunks.
+
+    Files cannot be read back or removed once written; the folder index is kept
+    so that listings (used by link checking) still work. Zip entries of formats
+    that are already compressed, such as images and `.gz` sidecars, are stored
+    without compression.
+
+    ## Usage examples
+
+    ```python
+    import harrix_pyssg as hsg
+
+    sg = hsg.StaticSiteGenerator("./tests/data")
+    sg.generate_site("./build_site", archive="./site.tar.gz")
+    ```
+
+    ```python
+    import harrix_pyssg as hsg
+
+    with hsg.ArchiveFileSystem("./site.zip", "./build_site") as target:
+        hsg.StaticSiteGenerator("./tests/data").generate_site("./build_site", target=target)
+    ```
+
+    """
+
+    def __init__(
+        self,
+        archive: str | Path | IO[bytes],
+        root: str | Path,
+        *,
+        archive_format: str | None = None,
+        mtime: int | None = None,
+    ) -> None:
+        """Open the archive for writing.
+
+        Args:
+
+        - `archive` (`str | Path | IO[bytes]`): Archive file to create, or a binary stream
+          that is written to but not closed. Streams do not need to be seekable.
+        - `root` (`str | Path`): Folder that maps to the archive root, usually the
+          `html_folder` of the build. Nothing is created there.
+        - `archive_format` (`str | None`): `"zip"` or `"tar.gz"`. Defaults to `None`
+          (taken from the suffix of `archive`: `.zip`, `.tar.gz` or `.tgz`).
+        - `mtime` (`int | None`): Timestamp of all entries in seconds since the epoch.
+          Defaults to `None` (`SOURCE_DATE_EPOCH` when set, otherwise 1980-01-01).
+
+        """
+        if archive_format is None:
+            name = Path(archive).name.lower() if isinstance(archive, str | Path) else ""
+            archive_format = "zip" if name.endswith(".zip") else "tar.gz" if name.endswith((".tar.gz", ".tgz")) else ""
+        if archive_format not in ARCHIVE_FORMATS:
+            msg = f"archive format must be one of {', '.join(ARCHIVE_FORMATS)}"
+            raise ValueError(msg)
+        self.archive_format = archive_format
+        self.root = Path(root).absolute()
+        self.mtime = mtime if mtime is not None else int(os.environ.get("SOURCE_DATE_EPOCH", ARCHIVE_MTIME))
+        self.names: list[str] = []
+        self._folders: dict[str, set[str]] = {"": set()}
+        self._owned = isinstance(archive, str | Path)
+        self._file: IO[bytes] = Path(archive).open("wb") if isinstance(archive, str | Path) else archive  # noqa: SIM115
+        self._gzip: gzip.GzipFile | None = None
+        self._tar: tarfile.TarFile | None = None
+        self._zip: zipfile.ZipFile | None = None
+        if archive_format == "zip":
+            self._zip = zipfile.ZipFile(self._file, "w", compression=zipfile.ZIP_DEFLATED)
+        else:
+            self._gzip = gzip.GzipFile(
+                filename="", mode="wb", fileobj=self._file, compresslevel=ARCHIVE_GZIP_LEVEL, mtime=self.mtime
+            )
+            self._tar = tarfile.open(fileobj=self._gzip, mode="w", format=tarfile.PAX_FORMAT)  # noqa: SIM115
+
+    def __enter__(self) -> Self:
+        """Return the archive."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Finish the archive."""
+        self.close()
+
+    def close(self) -> None:
+        """Write the archive trailer and close the file if the archive opened it."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        if self._tar is not None and self._gzip is not None:
+            self._tar.close()
+            self._gzip.close()
+            self._tar = self._gzip = None
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def copy_from(self, source: FileSystem, source_path: str | Path, target_path: str | Path) -> None:
+        """Add a file from another file system; local files are streamed in chunks."""
+        if not isinstance(source, LocalFileSystem):
+            super().copy_from(source, source_path, target_path)
+            return
+        size, _ = source.stat(source_path)
+        with Path(source_path).open("rb") as file:
+            self._add(target_path, file, size)
+
+    def is_file(self, path: str | Path) -> bool:
+        """Return `True` when `path` was written to the archive."""
+        folder, _, name = self._name(path).rpartition("/")
+        return name in self._folders.get(folder, ()) and self._name(path) not in self._folders
+
+    def list_folder(self, path: str | Path, *, follow_symlinks: bool = True) -> list[tuple[str, bool]]:  # noqa: ARG002
+        """Return `(name, is_dir)` of the entries written under a folder, sorted by name."""
+        key = self._name(path)
+        if key not in self._folders:
+            raise FileNotFoundError(path)
+        return sorted((name, f"{key}/{name}".lstrip("/") in self._folders) for name in self._folders[key])
+
+    def make_folder(self, path: str | Path) -> None:
+        """Do nothing: folders are implied by the paths of the entries."""
+
+    def read_bytes(self, path: str | Path) -> bytes:
+        """Raise `io.UnsupportedOperation`: entries cannot be read back."""
+        msg = f"{path} is streamed into the archive and cannot be read back"
+        raise io.UnsupportedOperation(msg)
+
+    def remove(self, path: str | Path) -> None:
+        """Do nothing for paths without entries; raise `io.UnsupportedOperation` otherwise."""
+        key = self._name(path)
+        if self._folders.get(key) or self.is_file(path):
+            msg = f"{path} is already in the archive and cannot be removed"
+            raise io.UnsupportedOperation(msg)
+
+    def stat(self, path: str | Path) -> tuple[int, float]:
+        """Raise `io.UnsupportedOperation`: entries cannot be read back."""
+        msg = f"{path} is streamed into the archive and cannot be read back"
+        raise io.UnsupportedOperation(msg)
+
+    def write_bytes(self, path: str | Path, data: bytes) -> None:
+        """Add a file to the archive."""
+        self._add(path, io.BytesIO(data), len(data))
+
+    def _add(self, path: str | Path, file: IO[bytes], size: int) -> None:
+        """Write one entry with fixed metadata and record it in the folder index."""
+        name = self._name(path)
+        if not name or name in self._folders or self.is_file(path):
+            msg = f"{path} is already in the archive"
+            raise io.UnsupportedOperation(msg)
+        if self._zip is not None:
+            info = zipfile.ZipInfo(name, time.gmtime(self.mtime)[:6])
+            info.create_system = 3
+            info.external_attr = 0o100644 << 16
+            info.file_size = size
+            info.compress_type = (
+                zipfile.ZIP_STORED if Path(name).suffix.lower() in ARCHIVE_STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+            )
+            with self._zip.open(info, "w", force_zip64=size > zipfile.ZIP64_LIMIT) as entry:
+                shutil.copyfileobj(file, entry)
+        elif self._tar is not None:
+            info = tarfile.TarInfo(name)
+            info.size = size
+            info.mtime = self.mtime
+            info.mode = 0o644
+            self._tar.addfile(info, file)
+        else:
+            msg = "the archive is closed"
+            raise ValueError(msg)
+        self.names.append(name)
+        parts = name.split("/")
+        for depth, part in enumerate(parts):
+            self._folders.setdefault("/".join(parts[:depth]), set()).add(part)
+
+    def _name(self, path: str | Path) -> str:
+        """Return the entry name of a path under `root`."""
+        relative = Path(path).absolute().relative_to(self.root)
+        return relative.as_posix() if relative.parts else ""
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import shutil
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import harrix_pylib as h
 import yaml
@@ -14,6 +15,7 @@ from mdit_py_plugins.footnote import footnote_plugin
 from mdit_py_plugins.front_matter import front_matter_plugin
 from mdit_py_plugins.tasklists import tasklists_plugin
 
+from harrix_pyssg.filesystem import FileSystem, LocalFileSystem
 from harrix_pyssg.note_meta import resolve_note_title
 from harrix_pyssg.page_assembler import (
     PageAssembler,
@@ -21,6 +23,16 @@ from harrix_pyssg.page_assembler import (
     detect_page_features,
 )
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from harrix_pyssg.build_events import BuildEvents
+    from harrix_pyssg.html_minifier import HtmlMinifier
+    from harrix_pyssg.page_assembler import PageFeatures
+
+# The libyaml loader parses front matter several times faster; streaming builds load every note twice.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class Article:
     """All information about one article from the site.
@@ -160,7 +172,9 @@ class Article:
 
     """
 
-    def __init__(self, md_filename: str | Path) -> None:
+    def __init__(
+        self, md_filename: str | Path, *, events: BuildEvents | None = None, filesystem: FileSystem | None = None
+    ) -> None:
         """Get all information about the Markdown file with folders.
 
         Constructor `__init__` does not generate new files and folders.
@@ -168,6 +182,11 @@ class Article:
         Args:
 
         - `md_filename` (`str | Path`): Full filename of the Markdown file.
+        - `events` (`BuildEvents | None`): Receives `error` events when the file cannot
+          be read or saved. Without listeners a message is printed instead. Defaults to `None`.
+        - `filesystem` (`FileSystem | None`): File system the note is read from and saved
+          to, and where featured images are looked up. `generate_html()` always uses the
+          local disk. Defaults to `None` (local disk).
 
         Example:
 
@@ -180,6 +199,8 @@ class Article:
         """
         self._html_folder = None
         self._md_yaml_dict = {}
+        self.events = events
+        self.filesystem = filesystem if filesystem is not None else LocalFileSystem()
         self.load(md_filename)
 
     @property
@@ -205,9 +226,9 @@ class Article:
 
         """
         return [
-            file.name
-            for file in self.md_filename.parent.iterdir()
-            if file.is_file() and file.name.startswith("featured-image")
+            name
+            for name, is_dir in self.filesystem.list_folder(self.md_filename.parent)
+            if not is_dir and name.startswith("featured-image")
         ]
 
     def generate_html(
@@ -217,6 +238,10 @@ class Article:
         theme_dir: str | Path | None = None,
         site_root: str | Path | None = None,
         page_assembler: PageAssembler | None = None,
+        html_minifier: HtmlMinifier | None = None,
+        append_html: str = "",
+        content_filters: Sequence[Callable[[Article, str], str]] = (),
+        copy_files: bool = True,
     ) -> Article:
         """Generate HTML file and folders from the Markdown file.
 
@@ -229,6 +254,17 @@ class Article:
           paths. Defaults to `html_folder`.
         - `page_assembler` (`PageAssembler | None`): Preloaded theme assembler. Takes
           precedence over `theme_dir`.
+        - `html_minifier` (`HtmlMinifier | None`): Minifier applied to the written HTML.
+          Defaults to `None` (write HTML as rendered).
+        - `append_html` (`str`): HTML added after the article body, for example the
+          list of articles with the same `related-id`. Defaults to `""`.
+        - `content_filters` (`Sequence[Callable[[Article, str], str]]`): Functions called
+          in order with the article and its rendered body HTML (before `append_html`);
+          each returns the HTML passed on. Used by build stages that inspect or rewrite
+          the render pass output.
+        - `copy_files` (`bool`): Clear `html_folder` and copy sub-folders and featured
+          images into it. Pass `False` when a `BuildPlan` manages the files of the folder;
+          only `index.html` is written then. Defaults to `True`.
 
         Returns:
 
@@ -249,37 +285,23 @@ class Article:
         if html_folder is not None:
             self.html_folder = html_folder
 
-        self._clear_html_folder_directory()
-        self._copy_dirs()
-        self._copy_featured_images()
+        if copy_files:
+            self._clear_html_folder_directory()
+            self._copy_dirs()
+            self._copy_featured_images()
+        elif self.html_folder is not None:
+            self.html_folder.mkdir(parents=True, exist_ok=True)
 
         if self.html_filename is not None:
-            content_html = self.get_html_code()
-            assembler = page_assembler
-            if assembler is None and theme_dir is not None:
-                assembler = PageAssembler(theme_dir)
-                root = Path(site_root) if site_root is not None else self.html_folder
-                if root is not None:
-                    assembler.copy_assets_to(root)
-
-            if assembler is not None and self.html_folder is not None:
-                root = Path(site_root) if site_root is not None else self.html_folder
-                prefix = asset_prefix_for(self.html_folder, root)
-                features = detect_page_features(
-                    content_html,
-                    md_content=self.md_content_no_yaml,
-                    yaml_dict=self.md_yaml_dict,
-                )
-                title = resolve_note_title(self.md_content, file_stem=self.md_filename.stem)
-                html = assembler.assemble(
-                    content_html=content_html,
-                    title=title,
-                    features=features,
-                    asset_prefix=prefix,
-                )
-                self.html_filename.write_text(html, encoding="utf8")
-            else:
-                self.html_filename.write_text(content_html, encoding="utf8")
+            html = self.render_html(
+                theme_dir=theme_dir,
+                site_root=site_root,
+                page_assembler=page_assembler,
+                html_minifier=html_minifier,
+                append_html=append_html,
+                content_filters=content_filters,
+            )
+            self.html_filename.write_text(html, encoding="utf8")
         return self
 
     def get_html_code(self) -> str:
@@ -308,17 +330,7 @@ class Article:
         ```
 
         """
-        md = (
-            MarkdownIt("gfm-like", {"typographer": True, "linkify": False})
-            .use(front_matter_plugin)
-            .use(tasklists_plugin)
-            .use(anchors_plugin)
-            .use(dollarmath_plugin)
-            .use(footnote_plugin)
-            .enable(["replacements"])
-        )
-
-        return md.render(self.md_content).lstrip()
+        return render_markdown(self.md_content)
 
     @property
     def html_filename(self) -> Path | None:
@@ -403,18 +415,21 @@ class Article:
         """
         self._md_filename = Path(md_filename)
         try:
-            md = Path(self.md_filename).read_text(encoding="utf8").lstrip()
+            md = self.filesystem.read_text(self.md_filename).lstrip()
 
             yaml_content, self._md_content_no_yaml = h.md.split_yaml_content(md)
 
             if yaml_content:
                 # Remove "---" from start and end
                 yaml_text = yaml_content[4:-4].strip()
-                self._md_yaml_dict = yaml.safe_load(yaml_text) if yaml_text else {}
+                self._md_yaml_dict = yaml.load(yaml_text, Loader=_YAML_LOADER) if yaml_text else {}  # noqa: S506
             else:
                 self._md_yaml_dict = {}
-        except Exception:
-            print(f'The file "{md_filename}" does not open')
+        except Exception as e:
+            if self.events:
+                self.events.emit_error(e, operation="load", path=md_filename)
+            else:
+                print(f'The file "{md_filename}" does not open')
 
     @property
     def md_content(self) -> str:
@@ -610,6 +625,76 @@ class Article:
         """
         return self._md_yaml_dict
 
+    def render_html(
+        self,
+        *,
+        theme_dir: str | Path | None = None,
+        site_root: str | Path | None = None,
+        page_assembler: PageAssembler | None = None,
+        html_minifier: HtmlMinifier | None = None,
+        append_html: str = "",
+        content_filters: Sequence[Callable[[Article, str], str]] = (),
+        content_html: str | None = None,
+        features: PageFeatures | None = None,
+    ) -> str:
+        """Render the page of the article without writing any files.
+
+        This is the CPU-bound part of `generate_html()`; the arguments have the same
+        meaning. `html_folder` must be set when a theme is used, because theme asset
+        paths are relative to it.
+
+        `content_html` and `features` take the result of `get_html_code()` and
+        `detect_page_features()` computed elsewhere, for example in a worker process;
+        by default they are computed here.
+
+        Returns:
+
+        - `str`: Full HTML page, or the body fragment when no theme is used.
+
+        Example:
+
+        ```python
+        import harrix_pyssg as hsg
+
+        article = hsg.Article("./tests/data/test_01/test_01.md")
+        print(article.render_html())
+        ```
+
+        """
+        if content_html is None:
+            content_html = self.get_html_code()
+        for content_filter in content_filters:
+            content_html = content_filter(self, content_html)
+        content_html += append_html
+        assembler = page_assembler
+        if assembler is None and theme_dir is not None:
+            assembler = PageAssembler(theme_dir)
+            root = Path(site_root) if site_root is not None else self.html_folder
+            if root is not None:
+                assembler.copy_assets_to(root)
+
+        if assembler is not None and self.html_folder is not None:
+            root = Path(site_root) if site_root is not None else self.html_folder
+            prefix = asset_prefix_for(self.html_folder, root)
+            if features is None:
+                features = detect_page_features(
+                    content_html,
+                    md_content=self.md_content_no_yaml,
+                    yaml_dict=self.md_yaml_dict,
+                )
+            title = resolve_note_title(self.md_content, file_stem=self.md_filename.stem)
+            html = assembler.assemble(
+                content_html=content_html,
+                title=title,
+                features=features,
+                asset_prefix=prefix,
+            )
+        else:
+            html = content_html
+        if html_minifier is not None:
+            html = html_minifier.minify(html)
+        return html
+
     def save(self) -> None:
         r"""Save the Markdown file.
 
@@ -628,9 +713,12 @@ class Article:
 
         """
         try:
-            Path(self.md_filename).write_text(self.md_content, encoding="utf8")
-        except Exception:
-            print(f'The file "{self.md_filename}" does not save')
+            self.filesystem.write_text(self.md_filename, self.md_content)
+        except Exception as e:
+            if self.events:
+                self.events.emit_error(e, operation="save", path=self.md_filename)
+            else:
+                print(f'The file "{self.md_filename}" does not save')
 
     def _clear_html_folder_directory(self) -> None:
         """Clear `self.html_folder` with sub-directories."""
@@ -656,3 +744,27 @@ class Article:
             file = self.md_filename.parent / filename
             output_file = self.html_folder / filename
             shutil.copy(file, output_file)
+
+
+def render_markdown(md_content: str) -> str:
+    """Render Markdown of a note, front matter included, to HTML as `Article.get_html_code()` does.
+
+    Args:
+
+    - `md_content` (`str`): Markdown with optional YAML front matter.
+
+    Returns:
+
+    - `str`: Clean HTML code.
+
+    """
+    md = (
+        MarkdownIt("gfm-like", {"typographer": True, "linkify": False})
+        .use(front_matter_plugin)
+        .use(tasklists_plugin)
+        .use(anchors_plugin)
+        .use(dollarmath_plugin)
+        .use(footnote_plugin)
+        .enable(["replacements"])
+    )
+    return md.render(md_content).lstrip()
@@ -0,0 +1,126 @@
+"""Compact per-article metadata record for site-wide indexes."""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from harrix_pyssg.note_meta import parse_date_value, resolve_note_date, resolve_note_title
+
+if TYPE_CHECKING:
+    from harrix_pyssg.article import Article
+
+DEFAULT_LANG = "en"
+
+
+@dataclass(frozen=True, slots=True)
+class ArticleMeta:
+    """Front matter and file facts of one article without its content.
+
+    The record has `__slots__` and holds only short strings, numbers and tuples,
+    so the generator can keep one per note for sorting, feeds and taxonomies while
+    the `Article` objects with Markdown text and parsed YAML are released. The path,
+    handle, terms and language are interned, so records share one copy of each string with
+    each other and with `BuildPlan`.
+
+    `handle` is the article folder relative to the Markdown root in POSIX form;
+    `content_hash` is the SHA-1 of `Article.md_content`.
+
+    ## Usage examples
+
+    ```python
+    import harrix_pyssg as hsg
+
+    article = hsg.Article("./tests/data/test_01/test_01.md")
+    meta = hsg.ArticleMeta.from_article(article, "./tests/data")
+    print(meta.handle, meta.title, meta.date, meta.tags)  # test_01 Title 2022-09-18 ('CSS',)
+    ```
+
+    """
+
+    path: str
+    handle: str
+    size: int
+    mtime: float
+    content_hash: str
+    title: str
+    date: dt.date | None = None
+    updated: dt.date | None = None
+    categories: tuple[str, ...] = ()
+    tags: tuple[str, ...] = ()
+    series: str | None = None
+    lang: str = DEFAULT_LANG
+    author: str | None = None
+    permalink: str | None = None
+    published: bool = True
+
+    @classmethod
+    def from_article(cls, article: Article, md_folder: str | Path) -> ArticleMeta:
+        """Build a record from a loaded article.
+
+        Args:
+
+        - `article` (`Article`): Loaded article.
+        - `md_folder` (`str | Path`): Markdown root used to compute the handle.
+
+        Returns:
+
+        - `ArticleMeta`: Record with file facts and resolved front matter values.
+
+        """
+        md_filename = article.md_filename
+        relative = md_filename.parent.relative_to(Path(md_folder).absolute())
+        yaml_dict = article.md_yaml_dict
+        md_content = article.md_content
+        try:
+            size, mtime = article.filesystem.stat(md_filename)
+        except OSError:
+            size, mtime = 0, 0.0
+        resolved = resolve_note_date(
+            md_content,
+            file_name=md_filename.name,
+            mtime=dt.datetime.fromtimestamp(mtime, tz=dt.UTC) if mtime else None,
+        )
+        series = yaml_dict.get("related-id")
+        author = yaml_dict.get("author")
+        permalink = yaml_dict.get("permalink")
+        return cls(
+            path=sys.intern(str(md_filename)),
+            handle=sys.intern(relative.as_posix()) if relative.parts else "",
+            size=size,
+            mtime=mtime,
+            content_hash=hashlib.sha1(md_content.encode(), usedforsecurity=False).hexdigest(),
+            title=resolve_note_title(md_content, file_stem=md_filename.stem),
+            date=resolved.value if resolved is not None else None,
+            updated=parse_date_value(yaml_dict["update"]) if yaml_dict.get("update") else None,
+            categories=_as_terms(yaml_dict.get("categories")),
+            tags=_as_terms(yaml_dict.get("tags")),
+            series=sys.intern(str(series)) if series not in (None, "") else None,
+            lang=sys.intern(str(yaml_dict.get("lang") or DEFAULT_LANG)),
+            author=str(author) if author else None,
+            permalink=str(permalink) if permalink else None,
+            published=yaml_dict.get("published", True) is not False,
+        )
+
+    @property
+    def md_filename(self) -> Path:
+        """Full filename of the Markdown file."""
+        return Path(self.path)
+
+    @property
+    def sort_key(self) -> tuple[dt.date, str, str]:
+        """Sort key: oldest first, undated records first, then title and handle."""
+        return (self.date or dt.date.min, self.title.casefold(), self.handle)
+
+
+def _as_terms(value: object) -> tuple[str, ...]:
+    """Normalize a YAML list or scalar of terms to a tuple of interned strings."""
+    if value is None or value == "":
+        return ()
+    if isinstance(value, (list, tuple, set)):
+        return tuple(sys.intern(str(item)) for item in value if item not in (None, ""))
+    return (sys.intern(str(value)),)
@@ -0,0 +1,192 @@
+"""Structured build events with callback listeners and a JSON-lines sink."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Self
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from types import TracebackType
+
+
+@dataclass(frozen=True, slots=True)
+class BuildEvent:
+    """One event of a build.
+
+    Kinds emitted by `StaticSiteGenerator`:
+
+    - `discovery`: `notes`, `published`, `seconds`.
+    - `build_start`: `html_folder`, `notes`.
+    - `article_start`: `handle`, `path`.
+    - `article_finish`: `handle`, `seconds`, `bytes_in`, `bytes_out`.
+    - `article_skipped`: `handle`, `reason`.
+    - `error`: `operation`, `path`, `error`, `message`, `traceback`.
+    - `build_finish`: `pages`, `bytes_out`, `seconds`, `pages_per_second`.
+    """
+
+    kind: str
+    time: float
+    data: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the event as a flat dictionary with `event` and `time` keys first."""
+        return {"event": self.kind, "time": self.time, **self.data}
+
+
+class BuildEvents:
+    """Dispatcher of `BuildEvent` records to listeners.
+
+    A dispatcher without listeners is falsy, and emitters check it before
+    measuring anything, so a build nobody listens to pays one truth test per
+    event. Listeners are called synchronously, possibly from worker threads of
+    `generate_site_async()`.
+
+    ## Usage examples
+
+    ```python
+    import harrix_pyssg as hsg
+
+    events = hsg.BuildEvents([lambda event: print(event.to_dict())])
+    sg = hsg.StaticSiteGenerator("./tests/data", events=events)
+    sg.generate_site("./build_site")
+    ```
+
+    """
+
+    def __init__(self, listeners: Iterable[Callable[[BuildEvent], object]] = ()) -> None:
+        """Create a dispatcher.
+
+        Args:
+
+        - `listeners` (`Iterable[Callable[[BuildEvent], object]]`): Initial listeners.
+          Defaults to `()`.
+
+        """
+        self._listeners: list[Callable[[BuildEvent], object]] = list(listeners)
+
+    def __bool__(self) -> bool:
+        """Return `True` when at least one listener is attached."""
+        return bool(self._listeners)
+
+    def add_listener(self, listener: Callable[[BuildEvent], object]) -> None:
+        """Attach a listener that is called with every event.
+
+        Args:
+
+        - `listener` (`Callable[[BuildEvent], object]`): Callback.
+
+        """
+        self._listeners.append(listener)
+
+    def emit(self, kind: str, **data: Any) -> None:
+        """Send an event to all listeners; does nothing without listeners.
+
+        Args:
+
+        - `kind` (`str`): Event kind, for example `article_finish`.
+        - `**data` (`Any`): Event fields. Values should be JSON-serializable.
+
+        """
+        if not self._listeners:
+            return
+        event = BuildEvent(kind, time.time(), data)
+        for listener in self._listeners:
+            listener(event)
+
+    def emit_error(self, error: BaseException, *, operation: str, path: str | Path | None = None) -> None:
+        """Send an `error` event with the exception type, message and traceback.
+
+        Args:
+
+        - `error` (`BaseException`): Exception that was raised.
+        - `operation` (`str`): What failed, for example `load` or `build`.
+        - `path` (`str | Path | None`): File involved, if any. Defaults to `None`.
+
+        """
+        if not self._listeners:
+            return
+        self.emit(
+            "error",
+            operation=operation,
+            path=str(path) if path is not None else None,
+            error=type(error).__name__,
+            message=str(error),
+            traceback="".join(traceback.format_exception(error)),
+        )
+
+    def remove_listener(self, listener: Callable[[BuildEvent], object]) -> None:
+        """Detach a listener added with `add_listener()`.
+
+        Args:
+
+        - `listener` (`Callable[[BuildEvent], object]`): Callback to remove.
+
+        """
+        self._listeners.remove(listener)
+
+
+class JsonLinesSink:
+    """Listener that writes each event as one JSON object per line.
+
+    ## Usage examples
+
+    ```python
+    import harrix_pyssg as hsg
+
+    sg = hsg.StaticSiteGenerator("./tests/data")
+    with hsg.JsonLinesSink("./build-events.jsonl") as sink:
+        sg.events.add_listener(sink)
+        sg.generate_site("./build_site")
+        sg.events.remove_listener(sink)
+    ```
+
+    """
+
+    def __init__(self, target: str | Path | IO[str]) -> None:
+        """Open the output.
+
+        Args:
+
+        - `target` (`str | Path | IO[str]`): File to create, or an open text stream that
+          is written to but not closed.
+
+        """
+        if isinstance(target, str | Path):
+            self._file: IO[str] = Path(target).open("w", encoding="utf8")  # noqa: SIM115
+            self._owned = True
+        else:
+            self._file = target
+            self._owned = False
+        self._lock = threading.Lock()
+
+    def __call__(self, event: BuildEvent) -> None:
+        """Write one event line."""
+        line = json.dumps(event.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def __enter__(self) -> Self:
+        """Return the sink."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the output."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the file if the sink opened it, otherwise flush the stream."""
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
@@ -0,0 +1,298 @@
+"""Assign every output file of a build to exactly one article."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from harrix_pyssg.filesystem import FileSystem, LocalFileSystem
+from harrix_pyssg.precompress import SIDECAR_SUFFIXES
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+FEATURED_IMAGE_PREFIX = "featured-image"
+
+
+class BuildPlan:
+    """Output ownership of article folders, resolved once for the whole site.
+
+    Every folder with a note is an article folder identified by its handle (the
+    folder relative to the Markdown root in POSIX form). The article owns its
+    `index.html`, its featured images and all files of its sub-folders, except
+    sub-folders that are article folders themselves: those are owned by the
+    nested article. When one folder has several notes, the note with the smallest
+    path owns it and the others are reported by `conflicts`.
+
+    Because ownership does not depend on the order in which articles are
+    rendered, no file is copied or deleted twice and nested articles never erase
+    each other's output.
+
+    ## Usage examples
+
+    ```python
+    from pathlib import Path
+
+    import harrix_pyssg as hsg
+
+    plan = hsg.BuildPlan("./tests/data", Path("./tests/data").rglob("*.md"))
+    for handle in plan.handles:
+        print(handle, [str(target) for _, target in plan.owned_files(handle)])
+    ```
+
+    """
+
+    def __init__(
+        self, md_folder: str | Path, md_filenames: Iterable[str | Path] = (), *, filesystem: FileSystem | None = None
+    ) -> None:
+        """Create a plan for the given notes.
+
+        Args:
+
+        - `md_folder` (`str | Path`): Markdown root.
+        - `md_filenames` (`Iterable[str | Path]`): Notes under `md_folder`. Defaults to `()`.
+        - `filesystem` (`FileSystem | None`): File system of the notes and their files.
+          Defaults to `None` (local disk).
+
+        """
+        self.md_folder = Path(md_folder).absolute()
+        self.filesystem = filesystem if filesystem is not None else LocalFileSystem()
+        self._candidates: dict[str, list[str]] = {}
+        for md_filename in md_filenames:
+            self.add(md_filename)
+
+    def __len__(self) -> int:
+        """Return the number of article folders."""
+        return len(self._candidates)
+
+    def add(self, md_filename: str | Path) -> str:
+        """Add a note to the plan.
+
+        Args:
+
+        - `md_filename` (`str | Path`): Note under `md_folder`.
+
+        Returns:
+
+        - `str`: Handle of the article folder of the note.
+
+        """
+        md_filename = Path(md_filename).absolute()
+        handle = self.handle_for(md_filename)
+        candidates = self._candidates.setdefault(handle, [])
+        path = sys.intern(str(md_filename))
+        if path not in candidates:
+            candidates.append(path)
+            candidates.sort()
+        return handle
+
+    @property
+    def conflicts(self) -> list[Path]:
+        """Notes that share a folder with another note and do not own it.
+
+        Returns:
+
+        - `list[Path]`: Sorted note paths that are not rendered.
+
+        """
+        return [Path(path) for handle in sorted(self._candidates) for path in self._candidates[handle][1:]]
+
+    def copy_files(self, handle: str, html_folder: str | Path, target: FileSystem | None = None) -> list[Path]:
+        """Copy the files owned by an article into its output folder.
+
+        Args:
+
+        - `handle` (`str`): Article handle.
+        - `html_folder` (`str | Path`): Site output root.
+        - `target` (`FileSystem | None`): File system of the output. Defaults to `None` (local disk).
+
+        Returns:
+
+        - `list[Path]`: Written files.
+
+        """
+        target = target if target is not None else LocalFileSystem()
+        target_root = Path(html_folder) / handle
+        written: list[Path] = []
+        for source, relative in self.owned_files(handle):
+            target.copy_from(self.filesystem, source, target_root / relative)
+            written.append(target_root / relative)
+        return written
+
+    def handle_for(self, md_filename: str | Path) -> str:
+        """Return the article handle of a note.
+
+        Args:
+
+        - `md_filename` (`str | Path`): Note under `md_folder`.
+
+        Returns:
+
+        - `str`: Folder of the note relative to `md_folder` in POSIX form.
+
+        """
+        relative = Path(md_filename).absolute().parent.relative_to(self.md_folder)
+        return sys.intern(relative.as_posix()) if relative.parts else ""
+
+    @property
+    def handles(self) -> list[str]:
+        """Sorted handles of all article folders.
+
+        Returns:
+
+        - `list[str]`: Handles, parents before their nested articles.
+
+        """
+        return sorted(self._candidates)
+
+    def owned_files(self, handle: str) -> Iterator[tuple[Path, Path]]:
+        """Yield the source files owned by an article, in a deterministic order.
+
+        Args:
+
+        - `handle` (`str`): Article handle.
+
+        Yields:
+
+        - `tuple[Path, Path]`: Source path and target path relative to the article output folder.
+
+        """
+        if handle not in self._candidates:
+            return
+        article_folder = self.md_folder / handle
+        try:
+            entries = self.filesystem.list_folder(article_folder)
+        except OSError:
+            return
+        sub_folders: list[str] = []
+        for name, is_dir in entries:
+            if is_dir:
+                sub_folders.append(name)
+            elif name.startswith(FEATURED_IMAGE_PREFIX):
+                yield article_folder / name, Path(name)
+        stack = [name for name in reversed(sub_folders) if not self._is_article(handle, name)]
+        while stack:
+            relative = stack.pop()
+            try:
+                entries = self.filesystem.list_folder(article_folder / relative)
+            except OSError:
+                continue
+            nested: list[str] = []
+            for name, is_dir in entries:
+                entry_relative = f"{relative}/{name}"
+                if is_dir:
+                    if not self._is_article(handle, entry_relative):
+                        nested.append(entry_relative)
+                else:
+                    yield article_folder / entry_relative, Path(entry_relative)
+            stack.extend(reversed(nested))
+
+    def owner(self, handle: str) -> Path | None:
+        """Return the note that owns an article folder.
+
+        Args:
+
+        - `handle` (`str`): Article handle.
+
+        Returns:
+
+        - `Path | None`: Owning note, or `None` when the folder has no notes.
+
+        """
+        candidates = self._candidates.get(handle)
+        return Path(candidates[0]) if candidates else None
+
+    def owner_of_path(self, path: str | Path) -> Path | None:
+        """Return the note whose article folder holds a file.
+
+        Args:
+
+        - `path` (`str | Path`): Note or any other file under `md_folder`; it does not
+          need to exist.
+
+        Returns:
+
+        - `Path | None`: Owner of the nearest article folder above `path`, or `None` when
+          `path` is outside `md_folder` or no folder above it has notes.
+
+        """
+        parent = Path(path).absolute().parent
+        for folder in (parent, *parent.parents):
+            if not folder.is_relative_to(self.md_folder):
+                break
+            relative = folder.relative_to(self.md_folder)
+            handle = relative.as_posix() if relative.parts else ""
+            if handle in self._candidates:
+                return self.owner(handle)
+        return None
+
+    def remove(self, md_filename: str | Path) -> str:
+        """Remove a note from the plan.
+
+        Args:
+
+        - `md_filename` (`str | Path`): Note under `md_folder`.
+
+        Returns:
+
+        - `str`: Handle of the article folder of the note.
+
+        """
+        md_filename = Path(md_filename).absolute()
+        handle = self.handle_for(md_filename)
+        candidates = self._candidates.get(handle, [])
+        if str(md_filename) in candidates:
+            candidates.remove(str(md_filename))
+        if not candidates:
+            self._candidates.pop(handle, None)
+        return handle
+
+    def remove_stale_files(self, handle: str, html_folder: str | Path, target: FileSystem | None = None) -> list[Path]:
+        """Delete files in an article output folder that the article no longer owns.
+
+        `index.html`, owned files, their `.gz`/`.zst` sidecars and nested article
+        folders are kept. The site root article (handle `""`) is skipped because
+        its folder also holds theme assets and site-wide pages.
+
+        Args:
+
+        - `handle` (`str`): Article handle.
+        - `html_folder` (`str | Path`): Site output root.
+        - `target` (`FileSystem | None`): File system of the output. Defaults to `None` (local disk).
+
+        Returns:
+
+        - `list[Path]`: Deleted files.
+
+        """
+        if not handle:
+            return []
+        target = target if target is not None else LocalFileSystem()
+        target_root = Path(html_folder) / handle
+        keep = {Path("index.html"), *(relative for _, relative in self.owned_files(handle))}
+        deleted: list[Path] = []
+        stack = [""]
+        while stack:
+            relative = stack.pop()
+            try:
+                entries = target.list_folder(target_root / relative, follow_symlinks=False)
+            except OSError:
+                continue
+            for name, is_dir in entries:
+                entry_relative = f"{relative}/{name}" if relative else name
+                if is_dir:
+                    if not self._is_article(handle, entry_relative):
+                        stack.append(entry_relative)
+                    continue
+                kept_name = entry_relative
+                for suffix in SIDECAR_SUFFIXES:
+                    kept_name = kept_name.removesuffix(suffix)
+                if Path(kept_name) not in keep:
+                    target.remove(target_root / entry_relative)
+                    deleted.append(target_root / entry_relative)
+        return deleted
+
+    def _is_article(self, handle: str, relative: str) -> bool:
+        """Return `True` when `relative` inside the folder of `handle` is an article folder."""
+        return (f"{handle}/{relative}" if handle else relative) in self._candidates
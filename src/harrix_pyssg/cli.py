@@ -0,0 +1,136 @@
+"""Command-line interface: `harrix-pyssg build` and `harrix-pyssg merge`."""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import sys
+from typing import TYPE_CHECKING
+
+import harrix_pyssg as hsg
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the `harrix-pyssg` command.
+
+    Args:
+
+    - `argv` (`Sequence[str] | None`): Arguments without the program name.
+      Defaults to `None` (`sys.argv[1:]`).
+
+    Returns:
+
+    - `int`: Exit code.
+
+    Example:
+
+    ```shell
+    harrix-pyssg build ./content ./build_shards/1 --shard 1/2
+    harrix-pyssg build ./content ./build_shards/2 --shard 2/2
+    harrix-pyssg merge ./build_site ./build_shards/1 ./build_shards/2
+    ```
+
+    """
+    parser = _make_parser()
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "build":
+            return _build(args)
+        written = hsg.merge_shards(args.shard_folders, args.html_folder)
+        print(f"Merged {len(args.shard_folders)} shards: {len(written)} files in {args.html_folder}")
+    except ValueError as e:
+        parser.exit(2, f"harrix-pyssg: error: {e}\n")
+    except hsg.MemoryBudgetError as e:
+        parser.exit(1, f"harrix-pyssg: error: {e}\n")
+    return 0
+
+
+def _build(args: argparse.Namespace) -> int:
+    """Run the `build` sub-command; return 1 when broken links were found."""
+    with (
+        hsg.JsonLinesSink(args.events) if args.events else contextlib.nullcontext() as sink,
+        hsg.GitFileSystem(args.md_folder, args.git_commit) if args.git_commit else contextlib.nullcontext() as source,
+    ):
+        events = hsg.BuildEvents([sink] if sink is not None else ())
+        sg = hsg.StaticSiteGenerator(
+            args.md_folder,
+            args.theme,
+            cache_dir=args.cache_dir,
+            exclude=args.exclude,
+            events=events,
+            source=source,
+            streaming=args.streaming,
+        )
+        render_budget = None
+        if args.max_note_bytes is not None or args.max_render_seconds is not None:
+            render_budget = hsg.RenderBudget(
+                max_bytes=args.max_note_bytes, max_seconds=args.max_render_seconds, fallback=args.fallback_pages
+            )
+        sg.generate_site(
+            args.html_folder,
+            archive=args.archive,
+            atom_feeds=args.atom_feeds,
+            base_url=args.base_url,
+            check_links=args.check_links,
+            image_sizes=args.image_sizes,
+            memory_budget=args.memory_budget,
+            memory_profile=args.memory_profile,
+            minify=args.minify,
+            precompress=args.precompress,
+            render_budget=render_budget,
+            search_index=args.search_index,
+            shard=args.shard,
+            sitemap=args.sitemap,
+            taxonomy_pages=args.taxonomy_pages,
+        )
+        shard = f" (shard {args.shard})" if args.shard else ""
+        print(f"Built {args.md_folder} into {args.html_folder}{shard}")
+        for violation in sg.budget_violations:
+            print(f"Over render budget: {violation}", file=sys.stderr)
+        broken = [str(link) for links in sg.broken_links.values() for link in links]
+        for line in broken:
+            print(f"Broken link: {line}", file=sys.stderr)
+        return 1 if broken else 0
+
+
+def _make_parser() -> argparse.ArgumentParser:
+    """Create the argument parser."""
+    parser = argparse.ArgumentParser(prog="harrix-pyssg", description="Static site generator for Markdown notes.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Generate the site from Markdown notes.")
+    build.add_argument("md_folder", help="Folder with Markdown notes.")
+    build.add_argument("html_folder", help="Output folder (cleared before the build).")
+    build.add_argument("--theme", help="Sliced theme folder.")
+    build.add_argument("--cache-dir", help="Folder for build caches, outside the output folder.")
+    build.add_argument("--exclude", action="append", default=[], help="Glob of files or folders to skip.")
+    build.add_argument("--base-url", help="Absolute site URL, required for --sitemap and --atom-feeds.")
+    build.add_argument("--shard", type=hsg.Shard.parse, help="Build only shard i of N, written as i/N.")
+    build.add_argument("--git-commit", help="Read md_folder from this git commit instead of the work tree.")
+    build.add_argument("--archive", help="Write the site into this .zip or .tar.gz file instead of html_folder.")
+    build.add_argument("--events", help="Write build events to this file as JSON lines.")
+    build.add_argument("--memory-profile", help="Trace memory and write a JSON report to this file.")
+    build.add_argument("--memory-budget", type=int, help="Fail the build when traced memory exceeds this many bytes.")
+    build.add_argument("--max-note-bytes", type=int, help="Skip notes larger than this many bytes.")
+    build.add_argument("--max-render-seconds", type=float, help="Stop rendering a note after this many seconds.")
+    for flag, help_text in (
+        ("--atom-feeds", "Write per-language Atom feeds."),
+        ("--check-links", "Report broken internal links and exit with code 1 if any."),
+        ("--fallback-pages", "Write plain pages for notes over the render budget."),
+        ("--image-sizes", "Add image sizes and lazy loading to <img> tags."),
+        ("--minify", "Minify written pages."),
+        ("--precompress", "Write .gz/.zst sidecar files."),
+        ("--search-index", "Write the client-side search index."),
+        ("--sitemap", "Write sitemap.xml."),
+        ("--streaming", "Keep only compact metadata in memory."),
+        ("--taxonomy-pages", "Write category and tag listings."),
+    ):
+        build.add_argument(flag, action="store_true", help=help_text)
+
+    merge = commands.add_parser("merge", help="Merge the outputs of shard builds.")
+    merge.add_argument("html_folder", help="Output folder for the merged site (cleared first).")
+    merge.add_argument("shard_folders", nargs="+", help="Output folders of all shards.")
+    return parser
@@ -0,0 +1,241 @@
+"""Find Markdown notes with `os.scandir`, pruning skipped folders before descending."""
+
+from __future__ import annotations
+
+import fnmatch
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from harrix_pyssg.filesystem import FileSystem, LocalFileSystem
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+DEFAULT_INCLUDE = ("*.md",)
+DISCOVERY_CACHE_VERSION = 1
+RACY_MTIME_NS = 2_000_000_000
+
+
+class DiscoveryCache:
+    """Folder listings persisted between builds and keyed on folder mtimes.
+
+    A folder mtime changes when an entry is added, removed or renamed inside it,
+    so a folder whose mtime matches the cached value is not listed again: its
+    cached note names and sub-folders are used and only the sub-folders are
+    `stat`-ed. A no-op rebuild of a large tree then costs one `stat` per folder
+    and a `scandir` per changed folder.
+
+    The whole cache is dropped (full walk) when the file is missing or broken, when
+    the root or patterns differ, or when a cached sub-folder has disappeared while
+    its parent mtime stayed the same. Folders modified within `RACY_MTIME_NS` of the
+    walk are stored without an mtime, so a change in the same timestamp tick is
+    never missed.
+
+    ## Usage examples
+
+    ```python
+    import harrix_pyssg as hsg
+
+    cache = hsg.DiscoveryCache("./.cache/discovery.json")
+    notes = list(cache.iter_markdown_files("./tests/data"))
+    cache.save()
+    print(cache.listed, cache.reused)
+    ```
+
+    """
+
+    def __init__(self, cache_filename: str | Path) -> None:
+        """Load cached listings from `cache_filename` if it exists.
+
+        Args:
+
+        - `cache_filename` (`str | Path`): JSON cache file. Missing or broken files are ignored.
+
+        """
+        self.cache_filename = Path(cache_filename)
+        self._filesystem = LocalFileSystem()
+        self.listed = 0
+        self.reused = 0
+        self._key: dict[str, object] = {}
+        self._folders: dict[str, dict] = {}
+        try:
+            data = json.loads(self.cache_filename.read_text(encoding="utf8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == DISCOVERY_CACHE_VERSION:
+            self._key = data.get("key", {})
+            self._folders = data.get("folders", {})
+
+    def iter_markdown_files(
+        self,
+        md_folder: str | Path,
+        *,
+        include: Iterable[str] = DEFAULT_INCLUDE,
+        exclude: Iterable[str] = (),
+    ) -> Iterator[Path]:
+        """Yield the same files as `iter_markdown_files()`, reusing unchanged listings.
+
+        Args:
+
+        - `md_folder` (`str | Path`): Root folder with notes.
+        - `include` (`Iterable[str]`): Patterns of files to yield. Defaults to `("*.md",)`.
+        - `exclude` (`Iterable[str]`): Patterns of files and folders to skip. Defaults to `()`.
+
+        Yields:
+
+        - `Path`: Note file path (`md_folder` joined with the relative path).
+
+        """
+        include, exclude = list(include), list(exclude)
+        root = Path(md_folder)
+        key = {"root": str(root.absolute()), "include": include, "exclude": exclude}
+        files = self._walk(root, self._folders, include, exclude) if self._key == key else None
+        if files is None:
+            files = self._walk(root, {}, include, exclude) or []
+        self._key = key
+        for relative in files:
+            yield root / relative
+
+    def save(self) -> None:
+        """Write the listings of the last walk to `cache_filename`."""
+        self.cache_filename.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": DISCOVERY_CACHE_VERSION, "key": self._key, "folders": self._folders}
+        self.cache_filename.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf8")
+
+    def _walk(
+        self, root: Path, old_folders: dict[str, dict], include: list[str], exclude: list[str]
+    ) -> list[str] | None:
+        """Walk the tree; return relative paths of found files, or `None` when the cache is inconsistent."""
+        include_re = _compile_patterns(include)
+        exclude_re = _compile_patterns(exclude)
+        root_str = os.fspath(root)
+        racy_after = time.time_ns() - RACY_MTIME_NS
+        folders: dict[str, dict] = {}
+        paths: list[str] = []
+        listed = reused = 0
+        stack: list[str] = [""]
+        while stack:
+            relative = stack.pop()
+            try:
+                mtime_ns = os.stat(os.path.join(root_str, relative)).st_mtime_ns  # noqa: PTH116, PTH118
+            except OSError:
+                if relative in old_folders:
+                    return None
+                continue
+            old = old_folders.get(relative)
+            if old is not None and old["mtime_ns"] == mtime_ns:
+                files, sub_folders = old["files"], old["folders"]
+                reused += 1
+            else:
+                try:
+                    files, sub_folders = _list_folder(self._filesystem, root, relative, include_re, exclude_re)
+                except OSError:
+                    continue
+                listed += 1
+            folders[relative] = {
+                "mtime_ns": mtime_ns if mtime_ns < racy_after else None,
+                "files": files,
+                "folders": sub_folders,
+            }
+            paths.extend(_join(relative, name) for name in files)
+            stack.extend(_join(relative, name) for name in reversed(sub_folders))
+        self._folders = folders
+        self.listed += listed
+        self.reused += reused
+        return paths
+
+
+def iter_markdown_files(
+    md_folder: str | Path,
+    *,
+    include: Iterable[str] = DEFAULT_INCLUDE,
+    exclude: Iterable[str] = (),
+    filesystem: FileSystem | None = None,
+) -> Iterator[Path]:
+    """Lazily yield note files under `md_folder` in a deterministic order.
+
+    Folders and files whose name starts with `.` are skipped, and so are folders
+    matching an `exclude` pattern: they are never listed, so large trees such as
+    `.git` or `node_modules` cost one directory entry each. File and folder types
+    come from the cached `os.DirEntry` data; symlinked folders are not followed.
+
+    Patterns are shell globs matched case-insensitively against the entry name
+    and against its POSIX path relative to `md_folder` (for example `*.md`,
+    `node_modules` or `drafts/*`). Within a folder files are yielded first, then
+    sub-folders are walked, each sorted by name.
+
+    Args:
+
+    - `md_folder` (`str | Path`): Root folder with notes.
+    - `include` (`Iterable[str]`): Patterns of files to yield. Defaults to `("*.md",)`.
+    - `exclude` (`Iterable[str]`): Patterns of files and folders to skip. Defaults to `()`.
+    - `filesystem` (`FileSystem | None`): File system to walk. Defaults to `None` (local disk).
+
+    Yields:
+
+    - `Path`: Note file path (`md_folder` joined with the relative path).
+
+    Example:
+
+    ```python
+    import harrix_pyssg as hsg
+
+    for md_filename in hsg.iter_markdown_files("./tests/data", exclude=["test_03"]):
+        print(md_filename)
+    ```
+
+    """
+    include_re = _compile_patterns(include)
+    exclude_re = _compile_patterns(exclude)
+    root = Path(md_folder)
+    filesystem = filesystem if filesystem is not None else LocalFileSystem()
+    stack: list[str] = [""]
+    while stack:
+        relative = stack.pop()
+        try:
+            files, sub_folders = _list_folder(filesystem, root, relative, include_re, exclude_re)
+        except OSError:
+            continue
+        for name in files:
+            yield root / _join(relative, name)
+        stack.extend(_join(relative, name) for name in reversed(sub_folders))
+
+
+def _compile_patterns(patterns: Iterable[str]) -> re.Pattern[str] | None:
+    """Join shell globs into one case-insensitive regex, or `None` when there are none."""
+    translated = [fnmatch.translate(pattern) for pattern in patterns]
+    if not translated:
+        return None
+    return re.compile("|".join(translated), re.IGNORECASE)
+
+
+def _join(relative: str, name: str) -> str:
+    """Join a relative POSIX folder and an entry name."""
+    return f"{relative}/{name}" if relative else name
+
+
+def _list_folder(
+    filesystem: FileSystem,
+    root: Path,
+    relative: str,
+    include_re: re.Pattern[str] | None,
+    exclude_re: re.Pattern[str] | None,
+) -> tuple[list[str], list[str]]:
+    """Return sorted names of matching files and of sub-folders to walk in one folder."""
+    files: list[str] = []
+    sub_folders: list[str] = []
+    for name, is_dir in filesystem.list_folder(root / relative if relative else root, follow_symlinks=False):
+        if name.startswith("."):
+            continue
+        entry_relative = _join(relative, name)
+        if exclude_re is not None and (exclude_re.match(name) or exclude_re.match(entry_relative)):
+            continue
+        if is_dir:
+            sub_folders.append(name)
+        elif include_re is not None and (include_re.match(name) or include_re.match(entry_relative)):
+            files.append(name)
+    return files, sub_folders
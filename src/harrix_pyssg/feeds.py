@@ -0,0 +1,347 @@
+"""Stream `sitemap.xml` and per-language Atom feeds for the generated site."""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import urljoin, urlsplit
+from xml.sax.saxutils import XMLGenerator
+
+from harrix_pyssg.article_meta import DEFAULT_LANG, ArticleMeta
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from typing import TextIO
+
+    from harrix_pyssg.article import Article
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+ATOM_NS = "http://www.w3.org/2005/Atom"
+SITEMAP_MAX_URLS = 50_000
+ATOM_FOLDER = "atom"
+ATOM_LIMIT = 50
+
+
+@dataclass(frozen=True, slots=True)
+class FeedEntry:
+    """Metadata of one published page for sitemaps and feeds."""
+
+    url: str
+    title: str
+    date: dt.date | None = None
+    updated: dt.date | None = None
+    lang: str = DEFAULT_LANG
+    author: str | None = None
+
+    @classmethod
+    def from_article(cls, article: Article, md_folder: str | Path, base_url: str) -> FeedEntry:
+        """Build an entry from a loaded article.
+
+        Args:
+
+        - `article` (`Article`): Loaded article.
+        - `md_folder` (`str | Path`): Markdown root.
+        - `base_url` (`str`): Absolute site URL such as `https://harrix.dev/`.
+
+        Returns:
+
+        - `FeedEntry`: Entry for `write_sitemap()` and `write_atom_feeds()`.
+
+        """
+        return cls.from_meta(ArticleMeta.from_article(article, md_folder), base_url)
+
+    @classmethod
+    def from_meta(cls, meta: ArticleMeta, base_url: str) -> FeedEntry:
+        """Build an entry from an article metadata record.
+
+        The URL is the `permalink` from front matter, or `base_url` joined with the
+        article handle.
+
+        Args:
+
+        - `meta` (`ArticleMeta`): Metadata record of the article.
+        - `base_url` (`str`): Absolute site URL such as `https://harrix.dev/`.
+
+        Returns:
+
+        - `FeedEntry`: Entry for `write_sitemap()` and `write_atom_feeds()`.
+
+        """
+        url = meta.permalink or urljoin(_with_slash(base_url), f"{meta.handle}/" if meta.handle else "")
+        return cls(
+            url=url,
+            title=meta.title,
+            date=meta.date,
+            updated=meta.updated,
+            lang=meta.lang,
+            author=meta.author,
+        )
+
+    @property
+    def last_modified(self) -> dt.date | None:
+        """Date of the last update, falling back to the creation date."""
+        return self.updated or self.date
+
+
+def write_atom_feeds(
+    entries: Iterable[FeedEntry],
+    html_folder: str | Path,
+    base_url: str,
+    *,
+    site_title: str | None = None,
+    limit: int = ATOM_LIMIT,
+    cache_filename: str | Path | None = None,
+) -> list[Path]:
+    """Write one Atom feed per language to `<html_folder>/atom/<lang>.xml`.
+
+    Each feed holds the newest `limit` entries. A feed is written only when the
+    file is missing or its entries changed since the hash stored in `cache_filename`.
+    Feeds of languages that no longer have entries are deleted with their hashes.
+
+    Args:
+
+    - `entries` (`Iterable[FeedEntry]`): Published pages.
+    - `html_folder` (`str | Path`): Site output root.
+    - `base_url` (`str`): Absolute site URL.
+    - `site_title` (`str | None`): Feed title. Defaults to the host of `base_url`.
+    - `limit` (`int`): Maximum number of entries per feed.
+    - `cache_filename` (`str | Path | None`): JSON file with hashes of the last output.
+
+    Returns:
+
+    - `list[Path]`: Feeds that were (re)written.
+
+    """
+    site_title = site_title or urlsplit(base_url).netloc or base_url
+    by_lang: dict[str, list[FeedEntry]] = {}
+    for entry in entries:
+        by_lang.setdefault(entry.lang, []).append(entry)
+
+    hashes = _load_hashes(cache_filename)
+    written: list[Path] = []
+    for lang in sorted(by_lang):
+        newest = sorted(by_lang[lang], key=_newest_first_key)[:limit]
+        path = Path(html_folder) / ATOM_FOLDER / f"{lang}.xml"
+        key = f"atom/{lang}"
+        digest = _entries_hash(newest, site_title, base_url)
+        if path.is_file() and hashes.get(key) == digest:
+            continue
+        path.parent.mkdir(parents=True, exist_ok=True)
+        feed_url = urljoin(_with_slash(base_url), f"{ATOM_FOLDER}/{lang}.xml")
+        with path.open("w", encoding="utf8", newline="\n") as file:
+            _write_atom(file, newest, feed_url=feed_url, base_url=base_url, site_title=site_title, lang=lang)
+        hashes[key] = digest
+        written.append(path)
+    atom_folder = Path(html_folder) / ATOM_FOLDER
+    for stale in atom_folder.glob("*.xml") if atom_folder.is_dir() else ():
+        if stale.stem not in by_lang:
+            stale.unlink()
+    for key in [key for key in hashes if key.startswith(f"{ATOM_FOLDER}/") and key.split("/", 1)[1] not in by_lang]:
+        del hashes[key]
+    _save_hashes(cache_filename, hashes)
+    return written
+
+
+def write_sitemap(
+    entries: Iterable[FeedEntry],
+    html_folder: str | Path,
+    base_url: str,
+    *,
+    max_urls: int = SITEMAP_MAX_URLS,
+    cache_filename: str | Path | None = None,
+) -> list[Path]:
+    """Write `sitemap.xml`, split into a sitemap index and child sitemaps when needed.
+
+    Up to `max_urls` URLs go into a single `sitemap.xml`. For more URLs,
+    `sitemap-1.xml`, `sitemap-2.xml`, … are written and `sitemap.xml` becomes
+    a sitemap index. Output is streamed, and skipped when the files exist and
+    the entries did not change since the hash stored in `cache_filename`.
+
+    Args:
+
+    - `entries` (`Iterable[FeedEntry]`): Published pages.
+    - `html_folder` (`str | Path`): Site output root.
+    - `base_url` (`str`): Absolute site URL used for child sitemap locations.
+    - `max_urls` (`int`): URL limit of one sitemap file (50 000 by the protocol).
+    - `cache_filename` (`str | Path | None`): JSON file with hashes of the last output.
+
+    Returns:
+
+    - `list[Path]`: Sitemap files that were (re)written.
+
+    """
+    html_folder = Path(html_folder)
+    ordered = sorted(entries, key=lambda entry: entry.url)
+    hashes = _load_hashes(cache_filename)
+    digest = _entries_hash(ordered, str(max_urls), base_url)
+    index_path = html_folder / "sitemap.xml"
+    if index_path.is_file() and hashes.get("sitemap") == digest:
+        return []
+
+    html_folder.mkdir(parents=True, exist_ok=True)
+    for old_child in html_folder.glob("sitemap-*.xml"):
+        old_child.unlink()
+    written: list[Path] = []
+    chunks = [ordered[start : start + max_urls] for start in range(0, len(ordered), max_urls)] or [[]]
+    if len(chunks) == 1:
+        with index_path.open("w", encoding="utf8", newline="\n") as file:
+            _write_urlset(file, chunks[0])
+        written.append(index_path)
+    else:
+        child_urls: list[tuple[str, dt.date | None]] = []
+        for number, chunk in enumerate(chunks, start=1):
+            child_path = html_folder / f"sitemap-{number}.xml"
+            with child_path.open("w", encoding="utf8", newline="\n") as file:
+                _write_urlset(file, chunk)
+            written.append(child_path)
+            dates = [entry.last_modified for entry in chunk if entry.last_modified is not None]
+            child_urls.append((urljoin(_with_slash(base_url), child_path.name), max(dates) if dates else None))
+        with index_path.open("w", encoding="utf8", newline="\n") as file:
+            _write_sitemap_index(file, child_urls)
+        written.append(index_path)
+    hashes["sitemap"] = digest
+    _save_hashes(cache_filename, hashes)
+    return written
+
+
+def _entries_hash(entries: Sequence[FeedEntry], *extra: str) -> str:
+    """Hash the fields of `entries` that appear in sitemaps and feeds."""
+    digest = hashlib.sha256("\0".join(extra).encode())
+    for entry in entries:
+        fields = (entry.url, entry.title, entry.date, entry.updated, entry.lang, entry.author)
+        digest.update(json.dumps(fields, default=str, ensure_ascii=False).encode())
+    return digest.hexdigest()
+
+
+def _load_hashes(cache_filename: str | Path | None) -> dict[str, str]:
+    """Load output hashes, or an empty dict when there is no usable cache."""
+    if cache_filename is None:
+        return {}
+    try:
+        return json.loads(Path(cache_filename).read_text(encoding="utf8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _newest_first_key(entry: FeedEntry) -> tuple[int, str]:
+    """Sort key for feeds: newest `last_modified` first, then URL."""
+    date = entry.last_modified or dt.date.min
+    return (-date.toordinal(), entry.url)
+
+
+def _save_hashes(cache_filename: str | Path | None, hashes: dict[str, str]) -> None:
+    """Save output hashes when a cache file is configured."""
+    if cache_filename is None:
+        return
+    cache_filename = Path(cache_filename)
+    cache_filename.parent.mkdir(parents=True, exist_ok=True)
+    cache_filename.write_text(json.dumps(hashes, indent=2, sort_keys=True) + "\n", encoding="utf8")
+
+
+def _text_element(xml: XMLGenerator, name: str, text: str, attrs: dict[str, str] | None = None) -> None:
+    """Write `<name>text</name>` followed by a newline."""
+    xml.startElement(name, attrs or {})
+    xml.characters(text)
+    xml.endElement(name)
+    xml.ignorableWhitespace("\n")
+
+
+def _timestamp(date: dt.date | None) -> str:
+    """Format a date as an RFC 3339 timestamp at midnight UTC."""
+    date = date or dt.date(1970, 1, 1)
+    return f"{date.isoformat()}T00:00:00Z"
+
+
+def _with_slash(url: str) -> str:
+    """Return `url` with a trailing slash so `urljoin` appends paths."""
+    return url if url.endswith("/") else f"{url}/"
+
+
+def _write_atom(
+    file: TextIO,
+    entries: Sequence[FeedEntry],
+    *,
+    feed_url: str,
+    base_url: str,
+    site_title: str,
+    lang: str,
+) -> None:
+    """Stream an Atom feed document."""
+    xml = XMLGenerator(file, encoding="utf-8", short_empty_elements=True)
+    xml.startDocument()
+    xml.startElement("feed", {"xmlns": ATOM_NS, "xml:lang": lang})
+    xml.ignorableWhitespace("\n")
+    _text_element(xml, "id", feed_url)
+    _text_element(xml, "title", site_title)
+    updated = max((entry.last_modified for entry in entries if entry.last_modified), default=None)
+    _text_element(xml, "updated", _timestamp(updated))
+    xml.startElement("link", {"rel": "self", "href": feed_url})
+    xml.endElement("link")
+    xml.startElement("link", {"rel": "alternate", "href": base_url})
+    xml.endElement("link")
+    xml.ignorableWhitespace("\n")
+    xml.startElement("author", {})
+    _text_element(xml, "name", site_title)
+    xml.endElement("author")
+    xml.ignorableWhitespace("\n")
+    for entry in entries:
+        xml.startElement("entry", {})
+        xml.ignorableWhitespace("\n")
+        _text_element(xml, "id", entry.url)
+        _text_element(xml, "title", entry.title)
+        xml.startElement("link", {"href": entry.url})
+        xml.endElement("link")
+        xml.ignorableWhitespace("\n")
+        if entry.date is not None:
+            _text_element(xml, "published", _timestamp(entry.date))
+        _text_element(xml, "updated", _timestamp(entry.last_modified))
+        if entry.author:
+            xml.startElement("author", {})
+            _text_element(xml, "name", entry.author)
+            xml.endElement("author")
+            xml.ignorableWhitespace("\n")
+        xml.endElement("entry")
+        xml.ignorableWhitespace("\n")
+    xml.endElement("feed")
+    xml.ignorableWhitespace("\n")
+    xml.endDocument()
+
+
+def _write_sitemap_index(file: TextIO, children: Sequence[tuple[str, dt.date | None]]) -> None:
+    """Stream a sitemap index document."""
+    xml = XMLGenerator(file, encoding="utf-8")
+    xml.startDocument()
+    xml.startElement("sitemapindex", {"xmlns": SITEMAP_NS})
+    xml.ignorableWhitespace("\n")
+    for url, last_modified in children:
+        xml.startElement("sitemap", {})
+        _text_element(xml, "loc", url)
+        if last_modified is not None:
+            _text_element(xml, "lastmod", last_modified.isoformat())
+        xml.endElement("sitemap")
+        xml.ignorableWhitespace("\n")
+    xml.endElement("sitemapindex")
+    xml.ignorableWhitespace("\n")
+    xml.endDocument()
+
+
+def _write_urlset(file: TextIO, entries: Sequence[FeedEntry]) -> None:
+    """Stream a sitemap `urlset` document."""
+    xml = XMLGenerator(file, encoding="utf-8")
+    xml.startDocument()
+    xml.startElement("urlset", {"xmlns": SITEMAP_NS})
+    xml.ignorableWhitespace("\n")
+    for entry in entries:
+        xml.startElement("url", {})
+        _text_element(xml, "loc", entry.url)
+        if entry.last_modified is not None:
+            _text_element(xml, "lastmod", entry.last_modified.isoformat())
+        xml.endElement("url")
+        xml.ignorableWhitespace("\n")
+    xml.endElement("urlset")
+    xml.ignorableWhitespace("\n")
+    xml.endDocument()
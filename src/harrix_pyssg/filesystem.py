@@ -0,0 +1,312 @@
+"""Source and target file systems of a build: local disk and in-memory."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+_CREATED_CACHE_SIZE = 64
+
+
+class FileSystem(ABC):
+    """Files read or written by a build, addressed by `Path`.
+
+    `StaticSiteGenerator` reads notes and the files they own from a source file
+    system and writes pages and copies to a target file system. Implementations
+    provide listing, reading, writing, `stat` and removal; text helpers, copies
+    and recursive listing are built on them.
+    """
+
+    def copy_from(self, source: FileSystem, source_path: str | Path, target_path: str | Path) -> None:
+        """Copy a file from another file system into this one.
+
+        Args:
+
+        - `source` (`FileSystem`): File system to read from.
+        - `source_path` (`str | Path`): File in `source`.
+        - `target_path` (`str | Path`): File to write in this file system.
+
+        """
+        self.write_bytes(target_path, source.read_bytes(source_path))
+
+    @abstractmethod
+    def is_file(self, path: str | Path) -> bool:
+        """Return `True` when `path` is an existing file."""
+
+    def iter_files(self, folder: str | Path) -> Iterator[Path]:
+        """Recursively yield the files under a folder, sorted by name within each folder.
+
+        Args:
+
+        - `folder` (`str | Path`): Folder to walk. A missing folder yields nothing.
+
+        Yields:
+
+        - `Path`: File path (`folder` joined with the relative path).
+
+        """
+        stack = [Path(folder)]
+        while stack:
+            current = stack.pop()
+            try:
+                entries = self.list_folder(current)
+            except OSError:
+                continue
+            sub_folders: list[Path] = []
+            for name, is_dir in entries:
+                if is_dir:
+                    sub_folders.append(current / name)
+                else:
+                    yield current / name
+            stack.extend(reversed(sub_folders))
+
+    @abstractmethod
+    def list_folder(self, path: str | Path, *, follow_symlinks: bool = True) -> list[tuple[str, bool]]:
+        """Return `(name, is_dir)` of the files and folders in a folder, sorted by name.
+
+        Args:
+
+        - `path` (`str | Path`): Folder to list.
+        - `follow_symlinks` (`bool`): Report symlinks to folders as folders. Defaults to `True`.
+
+        Returns:
+
+        - `list[tuple[str, bool]]`: Entries that are files or folders. `OSError` is raised
+          when `path` is not a folder.
+
+        """
+
+    @abstractmethod
+    def make_folder(self, path: str | Path) -> None:
+        """Create a folder with its parents if it does not exist."""
+
+    @abstractmethod
+    def read_bytes(self, path: str | Path) -> bytes:
+        """Return the contents of a file; raise `OSError` when it is missing."""
+
+    def read_text(self, path: str | Path) -> str:
+        """Return the contents of a UTF-8 text file."""
+        return self.read_bytes(path).decode("utf8")
+
+    @abstractmethod
+    def remove(self, path: str | Path) -> None:
+        """Delete a file, or a folder with everything in it; missing paths are ignored."""
+
+    @abstractmethod
+    def stat(self, path: str | Path) -> tuple[int, float]:
+        """Return `(size, mtime)` of a file; raise `OSError` when it is missing."""
+
+    @abstractmethod
+    def write_bytes(self, path: str | Path, data: bytes) -> None:
+        """Write a file, creating its parent folders."""
+
+    def write_text(self, path: str | Path, text: str) -> None:
+        """Write a UTF-8 text file, creating its parent folders."""
+        self.write_bytes(path, text.encode("utf8"))
+
+
+class LocalFileSystem(FileSystem):
+    """The local disk.
+
+    Parent folders created by writes are remembered until the next `remove()`, so
+    writing many files into the same folder costs one `mkdir` per folder. Only the
+    last few dozen folders are remembered, which keeps a build of many articles
+    from holding one path per output folder.
+    """
+
+    def __init__(self) -> None:
+        """Create a local file system."""
+        self._created: set[Path] = set()
+
+    def copy_from(self, source: FileSystem, source_path: str | Path, target_path: str | Path) -> None:
+        """Copy a file with its modification time; local sources are copied by the OS."""
+        if not isinstance(source, LocalFileSystem):
+            super().copy_from(source, source_path, target_path)
+            return
+        target_path = Path(target_path)
+        self._make_parent(target_path)
+        shutil.copy2(source_path, target_path)
+
+    def is_file(self, path: str | Path) -> bool:
+        """Return `True` when `path` is an existing file."""
+        return Path(path).is_file()
+
+    def list_folder(self, path: str | Path, *, follow_symlinks: bool = True) -> list[tuple[str, bool]]:
+        """Return `(name, is_dir)` of the files and folders in a folder, sorted by name."""
+        entries: list[tuple[str, bool]] = []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        entries.append((entry.name, True))
+                    elif entry.is_file():
+                        entries.append((entry.name, False))
+                except OSError:
+                    continue
+        entries.sort()
+        return entries
+
+    def make_folder(self, path: str | Path) -> None:
+        """Create a folder with its parents if it does not exist."""
+        Path(path).mkdir(parents=True, exist_ok=True)
+
+    def read_bytes(self, path: str | Path) -> bytes:
+        """Return the contents of a file."""
+        return Path(path).read_bytes()
+
+    def read_text(self, path: str | Path) -> str:
+        """Return the contents of a UTF-8 text file."""
+        return Path(path).read_text(encoding="utf8")
+
+    def remove(self, path: str | Path) -> None:
+        """Delete a file, or a folder with everything in it."""
+        path = Path(path)
+        self._created.clear()
+        if path.is_dir() and not path.is_symlink():
+            shutil.rmtree(path)
+        else:
+            path.unlink(missing_ok=True)
+
+    def stat(self, path: str | Path) -> tuple[int, float]:
+        """Return `(size, mtime)` of a file."""
+        stat = os.stat(path)  # noqa: PTH116
+        return stat.st_size, stat.st_mtime
+
+    def write_bytes(self, path: str | Path, data: bytes) -> None:
+        """Write a file, creating its parent folders."""
+        path = Path(path)
+        self._make_parent(path)
+        path.write_bytes(data)
+
+    def write_text(self, path: str | Path, text: str) -> None:
+        """Write a UTF-8 text file, creating its parent folders."""
+        path = Path(path)
+        self._make_parent(path)
+        path.write_text(text, encoding="utf8")
+
+    def _make_parent(self, path: Path) -> None:
+        """Create the parent folder of `path` unless this file system created it already."""
+        if path.parent not in self._created:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if len(self._created) >= _CREATED_CACHE_SIZE:
+                self._created.clear()
+            self._created.add(path.parent)
+
+
+class MemoryFileSystem(FileSystem):
+    """Files kept in a dictionary, for previews, tests and benchmarks without disk I/O.
+
+    Paths are made absolute against the current folder, so relative and absolute
+    spellings of a path name the same file. Writes are guarded by a lock and can
+    come from the threads of `generate_site_async()`.
+
+    ## Usage examples
+
+    ```python
+    import harrix_pyssg as hsg
+
+    source = hsg.MemoryFileSystem({"notes/hello/hello.md": "# Hello", "notes/hello/img/a.txt": b"a"})
+    target = hsg.MemoryFileSystem()
+    hsg.StaticSiteGenerator("notes", source=source).generate_site("site", target=target)
+    print(target.read_text("site/hello/index.html"))
+    print([path.as_posix() for path in target.iter_files("site")])
+    ```
+
+    """
+
+    def __init__(self, files: Mapping[str | Path, bytes | str] | None = None) -> None:
+        """Create a file system, optionally with initial files.
+
+        Args:
+
+        - `files` (`Mapping[str | Path, bytes | str] | None`): File contents by path; text
+          is stored as UTF-8. Defaults to `None`.
+
+        """
+        self._files: dict[str, bytes] = {}
+        self._folders: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+        for path, data in (files or {}).items():
+            self.write_bytes(path, data.encode("utf8") if isinstance(data, str) else data)
+
+    def __len__(self) -> int:
+        """Return the number of files."""
+        return len(self._files)
+
+    def is_file(self, path: str | Path) -> bool:
+        """Return `True` when `path` is an existing file."""
+        return _key(path) in self._files
+
+    def list_folder(self, path: str | Path, *, follow_symlinks: bool = True) -> list[tuple[str, bool]]:  # noqa: ARG002
+        """Return `(name, is_dir)` of the files and folders in a folder, sorted by name."""
+        key = _key(path)
+        with self._lock:
+            names = self._folders.get(key)
+            if names is None:
+                raise FileNotFoundError(key)
+            return sorted((name, f"{key.rstrip('/')}/{name}" in self._folders) for name in names)
+
+    def make_folder(self, path: str | Path) -> None:
+        """Create a folder with its parents if it does not exist."""
+        with self._lock:
+            self._add_folder(_key(path))
+
+    def read_bytes(self, path: str | Path) -> bytes:
+        """Return the contents of a file."""
+        key = _key(path)
+        try:
+            return self._files[key]
+        except KeyError:
+            raise FileNotFoundError(key) from None
+
+    def remove(self, path: str | Path) -> None:
+        """Delete a file, or a folder with everything in it."""
+        key = _key(path)
+        prefix = f"{key.rstrip('/')}/"
+        with self._lock:
+            self._files.pop(key, None)
+            for name in [name for name in self._files if name.startswith(prefix)]:
+                del self._files[name]
+            self._folders.pop(key, None)
+            for name in [name for name in self._folders if name.startswith(prefix)]:
+                del self._folders[name]
+            parent, _, name = key.rpartition("/")
+            self._folders.get(parent or "/", set()).discard(name)
+
+    def stat(self, path: str | Path) -> tuple[int, float]:
+        """Return `(size, 0.0)` of a file; in-memory files have no modification time."""
+        return len(self.read_bytes(path)), 0.0
+
+    def write_bytes(self, path: str | Path, data: bytes) -> None:
+        """Write a file, creating its parent folders."""
+        key = _key(path)
+        parent, _, name = key.rpartition("/")
+        with self._lock:
+            self._add_folder(parent or "/")
+            self._folders[parent or "/"].add(name)
+            self._files[key] = bytes(data)
+
+    def _add_folder(self, key: str) -> None:
+        """Register a folder and its missing parents; call with the lock held."""
+        child = None
+        while True:
+            exists = key in self._folders
+            names = self._folders.setdefault(key, set())
+            if child is not None:
+                names.add(child)
+            parent, _, name = key.rpartition("/")
+            if exists or not name:
+                return
+            key, child = parent or "/", name
+
+
+def _key(path: str | Path) -> str:
+    """Return the absolute POSIX form of a path, used as the key of an in-memory file."""
+    return Path(os.path.abspath(path)).as_posix()  # noqa: PTH100
@@ -0,0 +1,230 @@
+"""Read notes and their files straight from a commit of a local git repository."""
+
+from __future__ import annotations
+
+import io
+import subprocess
+import threading
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Self
+
+from harrix_pyssg.filesystem import FileSystem
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+_GIT_BLOB_MODES = frozenset({"100644", "100755"})
+
+
+class GitFileSystem(FileSystem):
+    """Read-only source with the tree of one commit, without a checkout.
+
+    The tree is listed once with `git ls-tree`; file contents are requested by
+    object id from one long-running `git cat-file --batch` process and read from
+    its output as they are needed, so no file is written to disk. Symlinks and
+    submodules are skipped. Every file reports the commit time as its
+    modification time.
+
+    ## Usage examples
+
+    ```python
+    import harrix_pyssg as hsg
+
+    with hsg.GitFileSystem("C:/GitHub/harrix.dev-blog-2018", "main") as source:
+        sg = hsg.StaticSiteGenerator(source.root, source=source)
+        sg.generate_site("./build_site")
+    ```
+
+    Rebuild only the notes changed since the previous deploy:
+
+    ```python
+    import harrix_pyssg as hsg
+
+    with hsg.GitFileSystem("C:/GitHub/harrix.dev-blog-2018", "main") as source:
+        sg = hsg.StaticSiteGenerator(source.root, source=source)
+        sg.html_folder = "./build_site"
+        for md_filename in sg.changed_notes(source.diff("deployed")):
+            sg.update_article(md_filename)
+    ```
+
+    """
+
+    def __init__(self, repository: str | Path, commit: str = "HEAD", *, root: str | Path | None = None) -> None:
+        """List the tree of a commit.
+
+        Args:
+
+        - `repository` (`str | Path`): Local repository (work tree or bare).
+        - `commit` (`str`): Commit, branch or tag to read. Defaults to `"HEAD"`.
+        - `root` (`str | Path | None`): Path that maps to the top of the tree. Defaults
+          to `None` (the top of the work tree, or `repository` for a bare repository).
+
+        """
+        self.repository = Path(repository)
+        if root is None:
+            bare = self._git("rev-parse", "--is-bare-repository").strip() == b"true"
+            root = repository if bare else self._git("rev-parse", "--show-toplevel").decode().strip()
+        self.root = Path(root).absolute()
+        self.commit = self._git("rev-parse", "--verify", "--end-of-options", f"{commit}^{{commit}}").decode().strip()
+        self.mtime = float(self._git("show", "-s", "--format=%ct", self.commit).decode().strip())
+        self._objects: dict[str, tuple[str, int]] = {}
+        self._folders: dict[str, set[str]] = {"": set()}
+        listing = self._git("ls-tree", "-r", "-l", "-z", "--full-tree", self.commit)
+        for record in listing.split(b"\0"):
+            if not record:
+                continue
+            meta, _, path = record.partition(b"\t")
+            mode, kind, oid, size = meta.decode().split()
+            if kind != "blob" or mode not in _GIT_BLOB_MODES:
+                continue
+            name = path.decode("utf8", "surrogateescape")
+            self._objects[name] = (oid, int(size))
+            parts = name.split("/")
+            for depth, part in enumerate(parts):
+                self._folders.setdefault("/".join(parts[:depth]), set()).add(part)
+        self._process: subprocess.Popen[bytes] | None = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> Self:
+        """Return the file system."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop the `git cat-file` process."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of files in the tree."""
+        return len(self._objects)
+
+    def close(self) -> None:
+        """Stop the `git cat-file` process if it is running."""
+        if self._process is not None:
+            if self._process.stdin is not None:
+                self._process.stdin.close()
+            self._process.wait()
+            if self._process.stdout is not None:
+                self._process.stdout.close()
+            self._process = None
+
+    def diff(self, since: str) -> list[Path]:
+        """Return the files added, changed or deleted between `since` and this commit.
+
+        Args:
+
+        - `since` (`str`): Older commit, branch or tag, for example the last deployed one.
+
+        Returns:
+
+        - `list[Path]`: Sorted paths under `root`; renames give the old and the new path.
+
+        """
+        old = self._git("rev-parse", "--verify", "--end-of-options", f"{since}^{{commit}}").decode().strip()
+        output = self._git("diff", "--name-only", "--no-renames", "-z", old, self.commit, "--")
+        names = {name.decode("utf8", "surrogateescape") for name in output.split(b"\0") if name}
+        return [self.root / name for name in sorted(names)]
+
+    def is_file(self, path: str | Path) -> bool:
+        """Return `True` when `path` is a file of the tree."""
+        return self._name(path) in self._objects
+
+    def list_folder(self, path: str | Path, *, follow_symlinks: bool = True) -> list[tuple[str, bool]]:  # noqa: ARG002
+        """Return `(name, is_dir)` of the files and folders of a tree folder, sorted by name."""
+        key = self._name(path)
+        if key is None or key not in self._folders:
+            raise FileNotFoundError(path)
+        return sorted((name, f"{key}/{name}".lstrip("/") in self._folders) for name in self._folders[key])
+
+    def make_folder(self, path: str | Path) -> None:
+        """Raise `io.UnsupportedOperation`: the tree is read-only."""
+        _read_only(path)
+
+    def read_bytes(self, path: str | Path) -> bytes:
+        """Return the contents of a file of the tree."""
+        name = self._name(path)
+        if name not in self._objects:
+            raise FileNotFoundError(path)
+        oid, _ = self._objects[name]
+        with self._lock:
+            process = self._batch_process()
+            stdin, stdout = process.stdin, process.stdout
+            if stdin is None or stdout is None:  # pragma: no cover
+                msg = "git cat-file has no pipes"
+                raise OSError(msg)
+            stdin.write(f"{oid}\n".encode())
+            stdin.flush()
+            header = stdout.readline().split()
+            if len(header) != 3 or header[1] != b"blob":  # noqa: PLR2004
+                msg = f"git cat-file cannot read {path}: {b' '.join(header).decode()}"
+                raise OSError(msg)
+            data = _read_exactly(stdout, int(header[2]) + 1)
+        return data[:-1]
+
+    def remove(self, path: str | Path) -> None:
+        """Raise `io.UnsupportedOperation`: the tree is read-only."""
+        _read_only(path)
+
+    def stat(self, path: str | Path) -> tuple[int, float]:
+        """Return `(size, commit time)` of a file of the tree."""
+        name = self._name(path)
+        if name not in self._objects:
+            raise FileNotFoundError(path)
+        return self._objects[name][1], self.mtime
+
+    def write_bytes(self, path: str | Path, data: bytes) -> None:  # noqa: ARG002
+        """Raise `io.UnsupportedOperation`: the tree is read-only."""
+        _read_only(path)
+
+    def _batch_process(self) -> subprocess.Popen[bytes]:
+        """Start `git cat-file --batch` on first use; call with the lock held."""
+        if self._process is None:
+            self._process = subprocess.Popen(
+                ["git", "-C", str(self.repository), "cat-file", "--batch"],  # noqa: S607
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+        return self._process
+
+    def _git(self, *args: str) -> bytes:
+        """Run a git command in the repository and return its output; raise `ValueError` when it fails."""
+        try:
+            return subprocess.run(
+                ["git", "-C", str(self.repository), *args],  # noqa: S607
+                capture_output=True,
+                check=True,
+            ).stdout
+        except subprocess.CalledProcessError as e:
+            msg = f"git {args[0]} failed in {self.repository}: {e.stderr.decode(errors='replace').strip()}"
+            raise ValueError(msg) from e
+
+    def _name(self, path: str | Path) -> str | None:
+        """Return the tree path of `path`, or `None` when it is outside `root`."""
+        try:
+            relative = Path(path).absolute().relative_to(self.root)
+        except ValueError:
+            return None
+        return relative.as_posix() if relative.parts else ""
+
+
+def _read_exactly(stream: IO[bytes], size: int) -> bytes:
+    """Read `size` bytes from a pipe."""
+    chunks: list[bytes] = []
+    while size > 0:
+        chunk = stream.read(size)
+        if not chunk:
+            msg = "git cat-file ended early"
+            raise OSError(msg)
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _read_only(path: str | Path) -> None:
+    """Raise `io.UnsupportedOperation` for a write to a git tree."""
+    msg = f"{path} is in a git tree and cannot be changed"
+    raise io.UnsupportedOperation(msg)
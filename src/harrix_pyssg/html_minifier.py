@@ -0,0 +1,255 @@
+"""Minify assembled HTML pages without touching whitespace-sensitive blocks."""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from itertools import groupby
+
+PRESERVE_TAGS = frozenset({"pre", "code", "textarea", "script", "style"})
+BLOCK_TAGS = frozenset(
+    {
+        "!doctype",
+        "address",
+        "article",
+        "aside",
+        "blockquote",
+        "body",
+        "dd",
+        "details",
+        "dialog",
+        "div",
+        "dl",
+        "dt",
+        "fieldset",
+        "figcaption",
+        "figure",
+        "footer",
+        "form",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "head",
+        "header",
+        "hr",
+        "html",
+        "li",
+        "link",
+        "main",
+        "meta",
+        "nav",
+        "noscript",
+        "ol",
+        "p",
+        "pre",
+        "script",
+        "section",
+        "style",
+        "summary",
+        "table",
+        "tbody",
+        "td",
+        "tfoot",
+        "th",
+        "thead",
+        "title",
+        "tr",
+        "ul",
+    }
+)
+
+_TAG_RE = re.compile(r"<(/?)(!doctype|[a-zA-Z][\w:-]*)\b[^>]*>", re.IGNORECASE)
+_PRESERVE_CLASS_RE = re.compile(r"""\bclass=["'][^"']*\b(?:math|katex)\b""", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class HtmlMinifier:
+    """Minify HTML pages and count the bytes saved during a build.
+
+    The minifier removes comments (including `h-ssg` markers, but keeping
+    conditional comments) and collapses whitespace between and inside text
+    runs. Content of `<pre>`, `<code>`, `<textarea>`, `<script>`, `<style>`
+    and of elements with a `math`/`katex` class (KaTeX source) is copied as is.
+
+    ## Usage examples
+
+    ```python
+    import harrix_pyssg as hsg
+
+    minifier = hsg.HtmlMinifier()
+    html = minifier.minify("<div>  <p>Hello,   world!</p>  </div>")
+    print(html)  # <div><p>Hello, world!</p></div>
+    print(minifier.bytes_saved)
+    ```
+
+    """
+
+    def __init__(self) -> None:
+        """Start with zero counters."""
+        self.pages = 0
+        self.bytes_before = 0
+        self.bytes_after = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        """Total number of bytes removed by `minify()` calls.
+
+        Returns:
+
+        - `int`: Difference between input and output sizes in UTF-8.
+
+        """
+        return self.bytes_before - self.bytes_after
+
+    def minify(self, html: str) -> str:
+        """Minify one HTML document and update counters.
+
+        Args:
+
+        - `html` (`str`): HTML page or fragment.
+
+        Returns:
+
+        - `str`: Minified HTML.
+
+        """
+        result = minify_html(html)
+        self.pages += 1
+        self.bytes_before += len(html.encode("utf8"))
+        self.bytes_after += len(result.encode("utf8"))
+        return result
+
+
+def minify_html(html: str) -> str:
+    """Strip comments and collapse insignificant whitespace in linear time.
+
+    Args:
+
+    - `html` (`str`): HTML page or fragment.
+
+    Returns:
+
+    - `str`: Minified HTML.
+
+    """
+    tokens: list[tuple[str, str, str]] = []
+    for is_text, group in groupby(_tokenize(html), key=lambda token: token[0] == "text"):
+        if is_text:
+            tokens.append(("text", "", "".join(token[2] for token in group)))
+        else:
+            tokens.extend(group)
+    out: list[str] = []
+    for index, (kind, _name, text) in enumerate(tokens):
+        if kind != "text":
+            out.append(text)
+            continue
+        prev_block = index == 0 or tokens[index - 1][1] in BLOCK_TAGS
+        next_block = index == len(tokens) - 1 or tokens[index + 1][1] in BLOCK_TAGS
+        collapsed = _WHITESPACE_RE.sub(" ", text)
+        if prev_block:
+            collapsed = collapsed.lstrip()
+        if next_block:
+            collapsed = collapsed.rstrip()
+        if collapsed:
+            out.append(collapsed)
+    return "".join(out)
+
+
+class _ClosingTags:
+    """Closing tags of one tag name in a lowercased page, indexed in one forward scan.
+
+    Lookups are a binary search (preserved tags, which do not nest) or a dictionary
+    hit (elements with a math class, matched with a stack), so unclosed tags never
+    rescan the rest of the page.
+    """
+
+    __slots__ = ("_closes", "_ends", "_html_lower", "_matches", "_nests")
+
+    def __init__(self, html_lower: str, name: str) -> None:
+        self._html_lower = html_lower
+        self._nests = name not in PRESERVE_TAGS
+        self._closes: list[int] = []
+        self._matches: dict[int, int] = {}
+        self._ends: dict[int, int] = {}
+        open_stack: list[int] = []
+        for match in re.finditer(f"<(/?){re.escape(name)}", html_lower):
+            if not match.group(1):
+                open_stack.append(match.start())
+            else:
+                self._closes.append(match.start())
+                if open_stack:
+                    self._matches[open_stack.pop()] = match.start()
+
+    def find(self, open_at: int, start: int) -> int:
+        """Return the end index of the closing tag for the tag opened at `open_at`, or `-1`."""
+        if self._nests:
+            close_at = self._matches.get(open_at, -1)
+        else:
+            index = bisect_left(self._closes, start)
+            close_at = self._closes[index] if index < len(self._closes) else -1
+        if close_at == -1:
+            return -1
+        if close_at not in self._ends:
+            end = self._html_lower.find(">", close_at)
+            self._ends[close_at] = end + 1 if end != -1 else -1
+        return self._ends[close_at]
+
+
+def _tokenize(html: str) -> list[tuple[str, str, str]]:
+    """Split HTML into `(kind, tag_name, text)` tokens, dropping plain comments.
+
+    `kind` is `"text"`, `"tag"`, or `"raw"` (preserved element with its content).
+    """
+    html_lower = html.lower()
+    closing_tags: dict[str, _ClosingTags] = {}
+    tokens: list[tuple[str, str, str]] = []
+    text_start = 0
+    pos = 0
+    next_gt = -1
+    length = len(html)
+
+    def flush_text(end: int) -> None:
+        if end > text_start:
+            tokens.append(("text", "", html[text_start:end]))
+
+    while pos < length:
+        lt = html.find("<", pos)
+        if lt == -1:
+            break
+        if html.startswith("<!--", lt):
+            end = html.find("-->", lt + 4)
+            if end == -1:
+                break
+            flush_text(lt)
+            comment = html[lt : end + 3]
+            if comment.startswith(("<!--[if", "<!--<![endif]")):
+                tokens.append(("tag", "", comment))
+            text_start = pos = end + 3
+            continue
+        if next_gt < lt:
+            next_gt = html.find(">", lt)
+            if next_gt == -1:
+                break
+        match = _TAG_RE.fullmatch(html, lt, next_gt + 1)
+        if match is None:
+            pos = lt + 1
+            continue
+        flush_text(lt)
+        closing, name = match.group(1), match.group(2).lower()
+        end = next_gt + 1
+        if not closing and (name in PRESERVE_TAGS or _PRESERVE_CLASS_RE.search(match.group(0))):
+            if name not in closing_tags:
+                closing_tags[name] = _ClosingTags(html_lower, name)
+            close_end = closing_tags[name].find(lt, end)
+            if close_end != -1:
+                tokens.append(("raw", name, html[lt:close_end]))
+                text_start = pos = close_end
+                continue
+        tokens.append(("tag", name, match.group(0)))
+        text_start = pos = end
+
+    flush_text(length)
+    return tokens
@@ -0,0 +1,223 @@
+"""Read image dimensions from file headers and add size and lazy-loading attributes to `<img>` tags."""
+
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+from typing import BinaryIO
+
+from harrix_pyssg.build_plan import FEATURED_IMAGE_PREFIX
+
+SVG_HEADER_SIZE = 4096
+
+_IMG_RE = re.compile(r"<img\b[^>]*>", re.IGNORECASE)
+_SRC_RE = re.compile(r"""\bsrc\s*=\s*(["'])(.*?)\1""", re.IGNORECASE | re.DOTALL)
+_SVG_TAG_RE = re.compile(rb"<svg\b[^>]*>", re.IGNORECASE)
+_SVG_LENGTH_RE = r"""\b{name}\s*=\s*["']\s*([0-9]*\.?[0-9]+)\s*(?:px)?\s*["']"""
+_SVG_VIEWBOX_RE = re.compile(
+    rb"""\bviewBox\s*=\s*["']\s*[-0-9.]+[\s,]+[-0-9.]+[\s,]+([0-9]*\.?[0-9]+)[\s,]+([0-9]*\.?[0-9]+)\s*["']""",
+    re.IGNORECASE,
+)
+_JPEG_SOF_MARKERS = frozenset({0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF})
+_JPEG_STANDALONE_MARKERS = frozenset({0x01, *range(0xD0, 0xD9)})
+
+
+class ImageSizeCache:
+    """Intrinsic image sizes of one build, read once per file version.
+
+    Sizes are sniffed from the first bytes of PNG, GIF, WebP and SVG files and
+    from the segment headers of JPEG files, without an imaging library. Entries
+    are keyed by path, size and modification time, so an image shared by several
+    pages is read once and a replaced file is read again.
+
+    ## Usage examples
+
+    ```python
+    import harrix_pyssg as hsg
+
+    cache = hsg.ImageSizeCache()
+    html = cache.add_attributes('<img src="img/test-image.png" alt="" />', "./tests/data/test_01")
+    print(html)
+    # <img src="img/test-image.png" alt="" width="200" height="150" loading="lazy" decoding="async" />
+    ```
+
+    """
+
+    def __init__(self) -> None:
+        """Create an empty cache."""
+        self.hits = 0
+        self.misses = 0
+        self._sizes: dict[tuple[str, int, int], tuple[int, int] | None] = {}
+
+    def add_attributes(self, html: str, base_folder: str | Path) -> str:
+        """Add `width`, `height`, `loading="lazy"` and `decoding="async"` to local images.
+
+        Attributes already present on a tag are kept. Featured images
+        (`featured-image.*`) only get their size, since they are usually above the
+        fold. Remote, `data:` and missing images are left alone.
+
+        Args:
+
+        - `html` (`str`): Rendered HTML.
+        - `base_folder` (`str | Path`): Folder that relative `src` values point into,
+          usually the folder of the note.
+
+        Returns:
+
+        - `str`: HTML with the attributes added.
+
+        """
+        base_folder = Path(base_folder)
+
+        def _replace(match: re.Match[str]) -> str:
+            tag = match.group(0)
+            src_match = _SRC_RE.search(tag)
+            if src_match is None:
+                return tag
+            src = src_match.group(2).split("?", 1)[0].split("#", 1)[0]
+            if not src or "://" in src or src.startswith(("//", "/", "data:")):
+                return tag
+            attributes: list[str] = []
+            if not _has_attribute(tag, "width") and not _has_attribute(tag, "height"):
+                size = self.size(base_folder / src)
+                if size is not None:
+                    attributes.extend((f'width="{size[0]}"', f'height="{size[1]}"'))
+            if not Path(src).name.startswith(FEATURED_IMAGE_PREFIX):
+                if not _has_attribute(tag, "loading"):
+                    attributes.append('loading="lazy"')
+                if not _has_attribute(tag, "decoding"):
+                    attributes.append('decoding="async"')
+            if not attributes:
+                return tag
+            end = len(tag) - 2 if tag.endswith("/>") else len(tag) - 1
+            head = tag[:end].rstrip()
+            return f"{head} {' '.join(attributes)}{' ' if tag.endswith('/>') else ''}{tag[end:]}"
+
+        return _IMG_RE.sub(_replace, html)
+
+    def size(self, path: str | Path) -> tuple[int, int] | None:
+        """Return the cached or freshly read size of an image.
+
+        Args:
+
+        - `path` (`str | Path`): Image file.
+
+        Returns:
+
+        - `tuple[int, int] | None`: Width and height in pixels, or `None` when the file
+          is missing or not a recognised image.
+
+        """
+        path_str = os.fspath(path)
+        try:
+            stat = os.stat(path_str)  # noqa: PTH116
+        except OSError:
+            return None
+        key = (os.path.abspath(path_str), stat.st_size, stat.st_mtime_ns)  # noqa: PTH100
+        if key in self._sizes:
+            self.hits += 1
+            return self._sizes[key]
+        self.misses += 1
+        size = read_image_size(path_str)
+        self._sizes[key] = size
+        return size
+
+
+def read_image_size(path: str | Path) -> tuple[int, int] | None:
+    """Read the width and height of a PNG, JPEG, GIF, WebP or SVG file from its header.
+
+    Args:
+
+    - `path` (`str | Path`): Image file.
+
+    Returns:
+
+    - `tuple[int, int] | None`: Width and height in pixels, or `None` when the format
+      is not recognised or the size cannot be determined.
+
+    Example:
+
+    ```python
+    import harrix_pyssg as hsg
+
+    print(hsg.read_image_size("./tests/data/test_01/img/test-image.png"))  # (200, 150)
+    ```
+
+    """
+    try:
+        with Path(path).open("rb") as file:
+            head = file.read(32)
+            if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+                return int.from_bytes(head[16:20], "big"), int.from_bytes(head[20:24], "big")
+            if head[:6] in (b"GIF87a", b"GIF89a"):
+                return int.from_bytes(head[6:8], "little"), int.from_bytes(head[8:10], "little")
+            if head.startswith(b"\xff\xd8"):
+                return _jpeg_size(file)
+            if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+                return _webp_size(head)
+            file.seek(0)
+            return _svg_size(file.read(SVG_HEADER_SIZE))
+    except OSError:
+        return None
+
+
+def _has_attribute(tag: str, name: str) -> bool:
+    """Return `True` when the tag has the attribute `name`."""
+    return re.search(rf"\s{name}\s*(=|\s|/?>)", tag, re.IGNORECASE) is not None
+
+
+def _jpeg_size(file: BinaryIO) -> tuple[int, int] | None:
+    """Walk JPEG segment headers up to the first start-of-frame marker."""
+    file.seek(2)
+    while True:
+        byte = file.read(1)
+        while byte and byte != b"\xff":
+            byte = file.read(1)
+        while byte == b"\xff":
+            byte = file.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in _JPEG_STANDALONE_MARKERS:
+            continue
+        if marker in (0xD9, 0xDA):
+            return None
+        length = int.from_bytes(file.read(2), "big")
+        if length < 2:  # noqa: PLR2004
+            return None
+        if marker in _JPEG_SOF_MARKERS:
+            frame = file.read(5)
+            if len(frame) < 5:  # noqa: PLR2004
+                return None
+            return int.from_bytes(frame[3:5], "big"), int.from_bytes(frame[1:3], "big")
+        file.seek(length - 2, os.SEEK_CUR)
+
+
+def _svg_size(head: bytes) -> tuple[int, int] | None:
+    """Read the size of an SVG from the `width`/`height` or `viewBox` of its root tag."""
+    tag_match = _SVG_TAG_RE.search(head)
+    if tag_match is None:
+        return None
+    tag = tag_match.group(0)
+    width = re.search(_SVG_LENGTH_RE.format(name="width").encode(), tag, re.IGNORECASE)
+    height = re.search(_SVG_LENGTH_RE.format(name="height").encode(), tag, re.IGNORECASE)
+    if width is not None and height is not None:
+        return round(float(width.group(1))), round(float(height.group(1)))
+    view_box = _SVG_VIEWBOX_RE.search(tag)
+    if view_box is not None:
+        return round(float(view_box.group(1))), round(float(view_box.group(2)))
+    return None
+
+
+def _webp_size(head: bytes) -> tuple[int, int] | None:
+    """Read the size of a WebP image from the first chunk header."""
+    chunk = head[12:16]
+    if chunk == b"VP8 " and head[23:26] == b"\x9d\x01\x2a":
+        return int.from_bytes(head[26:28], "little") & 0x3FFF, int.from_bytes(head[28:30], "little") & 0x3FFF
+    if chunk == b"VP8L" and head[20:21] == b"\x2f":
+        bits = int.from_bytes(head[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        return int.from_bytes(head[24:27], "little") + 1, int.from_bytes(head[27:30], "little") + 1
+    return None
@@ -0,0 +1,146 @@
+"""Check internal links and asset references of a build against the pages and files it produced."""
+
+from __future__ import annotations
+
+import html
+import posixpath
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import unquote
+
+_ID_RE = re.compile(r"""\bid\s*=\s*(["'])(.*?)\1""", re.IGNORECASE | re.DOTALL)
+_REFERENCE_RE = re.compile(r"""\b(?:href|src)\s*=\s*(["'])(.*?)\1""", re.IGNORECASE | re.DOTALL)
+_SCHEME_RE = re.compile(r"^[a-z][a-z0-9+.-]*:", re.IGNORECASE)
+
+
+@dataclass(frozen=True, slots=True)
+class BrokenLink:
+    """An internal reference of an article that does not resolve."""
+
+    handle: str
+    reference: str
+    reason: str
+
+    def __str__(self) -> str:
+        """Return the link as `handle: reference (reason)`."""
+        return f"{self.handle or '.'}: {self.reference} ({self.reason})"
+
+
+class LinkIndex:
+    """Output paths and anchor ids of a build, and the references to check against them.
+
+    Pages are added from the render pass with the ids of their content (for
+    example the heading anchors) and the `href`/`src` values they contain; copied
+    files are added as they are written. `check()` then resolves every relative or
+    root-relative reference with a set lookup, without reading the output again.
+    External URLs (any scheme or `//host`) are not checked.
+
+    ## Usage examples
+
+    ```python
+    import harrix_pyssg as hsg
+
+    links = hsg.LinkIndex()
+    links.add_page("a", "a/index.html", '<h2 id="intro">Intro</h2><a href="../b/#intro">B</a>')
+    links.add_page("b", "b/index.html", "<p>No anchors</p>")
+    for handle, broken in links.check().items():
+        print(handle, [str(link) for link in broken])
+    ```
+
+    """
+
+    def __init__(self) -> None:
+        """Create an empty index."""
+        self._outputs: set[str] = set()
+        self._anchors: dict[str, set[str]] = {}
+        self._common_anchors: set[str] = set()
+        self._references: dict[str, tuple[str, list[str]]] = {}
+
+    def add_common_anchors(self, html_text: str) -> None:
+        """Record ids present on every page, such as those of the theme chrome.
+
+        Args:
+
+        - `html_text` (`str`): HTML with the ids.
+
+        """
+        self._common_anchors.update(html.unescape(match.group(2)) for match in _ID_RE.finditer(html_text))
+
+    def add_file(self, relative: str) -> None:
+        """Record an output file that is not an article page.
+
+        Args:
+
+        - `relative` (`str`): Path relative to the site root in POSIX form.
+
+        """
+        self._outputs.add(relative)
+
+    def add_page(self, handle: str, page: str, content_html: str) -> None:
+        """Record an article page with its anchors and the references to check.
+
+        Args:
+
+        - `handle` (`str`): Article handle, used to report broken references.
+        - `page` (`str`): Page path relative to the site root, for example `a/index.html`.
+        - `content_html` (`str`): Rendered article content.
+
+        """
+        self._outputs.add(page)
+        self._anchors[page] = {html.unescape(match.group(2)) for match in _ID_RE.finditer(content_html)}
+        self._references[handle] = (page, [match.group(2) for match in _REFERENCE_RE.finditer(content_html)])
+
+    def check(self, site_root: str | Path | None = None) -> dict[str, list[BrokenLink]]:
+        """Resolve the references of all pages.
+
+        Args:
+
+        - `site_root` (`str | Path | None`): Output folder. When set, targets missing from
+          the index are looked up on disk, which covers site-wide files (feeds, search
+          index) that are not added to the index. Defaults to `None`.
+
+        Returns:
+
+        - `dict[str, list[BrokenLink]]`: Broken references by article handle, only for
+          articles that have any.
+
+        """
+        site_root = Path(site_root) if site_root is not None else None
+        broken: dict[str, list[BrokenLink]] = {}
+        for handle in sorted(self._references):
+            page, references = self._references[handle]
+            for reference in references:
+                reason = self._check_reference(page, reference, site_root)
+                if reason is not None:
+                    broken.setdefault(handle, []).append(BrokenLink(handle, reference, reason))
+        return broken
+
+    def _check_reference(self, page: str, reference: str, site_root: Path | None) -> str | None:
+        """Return why a reference from `page` is broken, or `None` when it resolves or is external."""
+        value = html.unescape(reference).strip()
+        if not value or value.startswith("//") or _SCHEME_RE.match(value):
+            return None
+        path, _, fragment = value.partition("#")
+        path = unquote(path.split("?", 1)[0])
+        if not path:
+            target = page
+        else:
+            folder = "" if path.startswith("/") else posixpath.dirname(page)
+            target = posixpath.normpath(posixpath.join(folder, path.lstrip("/")))
+            if target == ".." or target.startswith("../"):
+                return "outside the site"
+            if target == ".":
+                target = "index.html"
+            elif path.endswith("/"):
+                target = f"{target}/index.html"
+            if target not in self._outputs and f"{target}/index.html" in self._outputs:
+                target = f"{target}/index.html"
+        if target not in self._outputs and (site_root is None or not (site_root / target).is_file()):
+            return "missing target"
+        anchors = self._anchors.get(target)
+        if fragment and anchors is not None:
+            fragment = unquote(fragment)
+            if fragment not in anchors and fragment not in self._common_anchors:
+                return "missing anchor"
+        return None
@@ -0,0 +1,207 @@
+"""Peak memory per build phase, top allocation sites and per-article retained memory with `tracemalloc`."""
+
+from __future__ import annotations
+
+import json
+import linecache
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+MEMORY_PROFILE_TOP = 10
+
+
+class MemoryBudgetError(RuntimeError):
+    """A build phase allocated more memory than the budget of its `MemoryProfiler`."""
+
+
+@dataclass
+class PhaseMemory:
+    """Traced memory of one build phase over all its runs.
+
+    `peak` is the highest traced memory while the phase ran, including memory
+    that was already held when it started; `max_increase` is the largest peak
+    above the memory held at the start of one run.
+    """
+
+    name: str
+    calls: int = 0
+    peak: int = 0
+    max_increase: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class AllocationSite:
+    """Source line with the memory still allocated from it at the end of the build."""
+
+    location: str
+    size: int
+    count: int
+    code: str = ""
+
+
+class MemoryProfiler:
+    """Track the memory of a build with `tracemalloc`.
+
+    Only memory allocated through Python is traced, and tracing slows a build down
+    by a factor of two or more, so this is a diagnostic mode. The budget is
+    checked at the end of every phase against the phase peak.
+
+    ## Usage examples
+
+    ```python
+    import harrix_pyssg as hsg
+
+    sg = hsg.StaticSiteGenerator("./tests/data")
+    sg.generate_site("./build_site", memory_profile="./memory.json", memory_budget=200_000_000)
+    profiler = sg.memory_profiler
+    print(profiler.peak, [(phase.name, phase.peak) for phase in profiler.phases.values()])
+    ```
+
+    """
+
+    def __init__(self, *, budget: int | None = None, top: int = MEMORY_PROFILE_TOP) -> None:
+        """Create a profiler; tracing starts with `start()`.
+
+        Args:
+
+        - `budget` (`int | None`): Maximum traced memory in bytes. `MemoryBudgetError` is
+          raised at the end of the first phase that peaks above it. Defaults to `None`.
+        - `top` (`int`): Number of allocation sites and articles in the report. Defaults to `10`.
+
+        """
+        if budget is not None and budget < 1:
+            msg = "memory_budget must be positive"
+            raise ValueError(msg)
+        self.budget = budget
+        self.top = top
+        self.phases: dict[str, PhaseMemory] = {}
+        self.articles: dict[str, int] = {}
+        self.sites: list[AllocationSite] = []
+        self.running = False
+        self._started_tracing = False
+
+    @property
+    def peak(self) -> int:
+        """Highest traced memory over all phases, in bytes."""
+        return max((phase.peak for phase in self.phases.values()), default=0)
+
+    def largest_articles(self) -> list[tuple[str, int]]:
+        """Return `(handle, bytes)` of the articles that retain the most memory once loaded.
+
+        Returns:
+
+        - `list[tuple[str, int]]`: Up to `top` articles, largest first.
+
+        """
+        return sorted(self.articles.items(), key=lambda item: (-item[1], item[0]))[: self.top]
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure the peak traced memory of a block of the build.
+
+        Args:
+
+        - `name` (`str`): Phase name, for example `render`. Runs with the same name are
+          combined.
+
+        Yields:
+
+        - `None`.
+
+        """
+        if not self.running:
+            yield
+            return
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            stats = self.phases.setdefault(name, PhaseMemory(name))
+            stats.calls += 1
+            stats.peak = max(stats.peak, peak)
+            stats.max_increase = max(stats.max_increase, peak - start)
+        if self.budget is not None and peak > self.budget:
+            msg = f"{name} phase peaked at {peak} bytes of traced memory, above the budget of {self.budget}"
+            raise MemoryBudgetError(msg)
+
+    def record_article(self, handle: str, size: int) -> None:
+        """Record the memory retained by a loaded article.
+
+        Args:
+
+        - `handle` (`str`): Article handle.
+        - `size` (`int`): Growth of traced memory while the article was loaded, in bytes.
+
+        """
+        self.articles[handle] = max(size, 0)
+
+    def start(self) -> None:
+        """Start tracing unless `tracemalloc` is already tracing."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self.running = True
+
+    def stop(self) -> None:
+        """Collect the top allocation sites and stop tracing if `start()` started it."""
+        if not self.running:
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__),
+                tracemalloc.Filter(inclusive=False, filename_pattern=__file__),
+                tracemalloc.Filter(inclusive=False, filename_pattern="<frozen importlib._bootstrap*>"),
+                tracemalloc.Filter(inclusive=False, filename_pattern="<unknown>"),
+            )
+        )
+        self.sites = []
+        for statistic in snapshot.statistics("lineno")[: self.top]:
+            frame = statistic.traceback[0]
+            self.sites.append(
+                AllocationSite(
+                    f"{frame.filename}:{frame.lineno}",
+                    statistic.size,
+                    statistic.count,
+                    linecache.getline(frame.filename, frame.lineno).strip(),
+                )
+            )
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self.running = False
+
+    def to_dict(self) -> dict:
+        """Return the report as a JSON-serializable dictionary.
+
+        Returns:
+
+        - `dict`: `peak`, `budget`, `phases`, `top_allocations` and `largest_articles`.
+
+        """
+        return {
+            "peak": self.peak,
+            "budget": self.budget,
+            "phases": [asdict(phase) for phase in self.phases.values()],
+            "top_allocations": [asdict(site) for site in self.sites],
+            "largest_articles": [{"handle": handle, "retained": size} for handle, size in self.largest_articles()],
+        }
+
+    def write_report(self, filename: str | Path) -> None:
+        """Write the report as JSON.
+
+        Args:
+
+        - `filename` (`str | Path`): Report file.
+
+        """
+        filename = Path(filename)
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        filename.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2) + "\n", encoding="utf8")
@@ -5,16 +5,17 @@ from __future__ import annotations
 import json
 import re
 import shutil
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from harrix_pyssg.theme_slicer import (
-    ASSET_DIRS,
-    PLACEHOLDER_CONTENT,
-    PLACEHOLDER_OPTIONAL_HEAD,
-    PLACEHOLDER_OPTIONAL_SCRIPTS,
-    PLACEHOLDER_TITLE,
-)
+from harrix_pyssg.filesystem import LocalFileSystem
+from harrix_pyssg.theme_slicer import ASSET_DIRS, FEATURE_ASSETS, PART_NAMES, read_theme_bundle, split_segments
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from harrix_pyssg.filesystem import FileSystem
 
 _H1_RE = re.compile(r"<h1\b[^>]*>(.*?)</h1>", re.IGNORECASE | re.DOTALL)
 _TAG_RE = re.compile(r"<[^>]+>")
@@ -32,6 +33,11 @@ _MATH_HTML_RE = re.compile(r"""class=["'][^"']*\b(?:tex|math|katex)\b""", re.IGN
 class PageAssembler:
     """Build a full HTML page from theme parts and article body HTML.
 
+    The theme is loaded from the compiled `bundle.json` with one read when it is
+    up to date, otherwise from the part files. The chrome is kept split at the
+    placeholders, with asset paths already rewritten per `asset_prefix`, so a page
+    costs one join and an asset path rewrite of the article content only.
+
     ## Usage examples
 
     ```python
@@ -62,21 +68,25 @@ class PageAssembler:
             msg = f"Theme parts not found: {parts_dir}"
             raise FileNotFoundError(msg)
 
-        self.parts = {
-            "head": (parts_dir / "head.html").read_text(encoding="utf8"),
-            "body_open": (parts_dir / "body_open.html").read_text(encoding="utf8"),
-            "chrome_header": (parts_dir / "chrome_header.html").read_text(encoding="utf8"),
-            "main": (parts_dir / "main.html").read_text(encoding="utf8"),
-            "chrome_footer": (parts_dir / "chrome_footer.html").read_text(encoding="utf8"),
-            "scripts": (parts_dir / "scripts.html").read_text(encoding="utf8"),
-            "document_end": (parts_dir / "document_end.html").read_text(encoding="utf8"),
-        }
+        self._prefixed_segments: dict[str, list[str]] = {}
+        bundle = read_theme_bundle(self.theme_dir)
+        self.from_bundle = bundle is not None
+        if bundle is not None:
+            self.parts: dict[str, str] = bundle["parts"]
+            self.optional: dict[str, str] = bundle["optional"]
+            self.manifest: dict = bundle["manifest"]
+            self._segments: list[str] = bundle["segments"]
+            self._slots: list[str] = bundle["slots"]
+            return
+
+        self.parts = {name: (parts_dir / f"{name}.html").read_text(encoding="utf8") for name in PART_NAMES}
         optional_dir = parts_dir / "optional"
         self.optional = {
             path.stem: path.read_text(encoding="utf8").strip() for path in optional_dir.glob("*.html") if path.is_file()
         }
         manifest_path = self.theme_dir / "manifest.json"
         self.manifest = json.loads(manifest_path.read_text(encoding="utf8")) if manifest_path.is_file() else {}
+        self._segments, self._slots = split_segments("".join(self.parts[name] for name in PART_NAMES))
 
     def assemble(
         self,
@@ -104,48 +114,78 @@ class PageAssembler:
         optional_head_bits: list[str] = []
         optional_script_bits: list[str] = []
 
-        if features.katex:
-            if self.optional.get("katex_css"):
-                optional_head_bits.append(self.optional["katex_css"])
-            if self.optional.get("katex_js"):
-                optional_script_bits.append(self.optional["katex_js"])
-        if features.stl:
-            if self.optional.get("stl_css"):
-                optional_head_bits.append(self.optional["stl_css"])
-            if self.optional.get("stl_js"):
-                optional_script_bits.append(self.optional["stl_js"])
+        names = features.names
+        for feature, locations in self.feature_assets.items():
+            if feature not in names:
+                continue
+            optional_head_bits.extend(
+                self.optional[part] for part in locations.get("head", ()) if self.optional.get(part)
+            )
+            optional_script_bits.extend(
+                self.optional[part] for part in locations.get("scripts", ()) if self.optional.get(part)
+            )
 
         optional_head = ("\n    ".join(optional_head_bits) + "\n") if optional_head_bits else ""
         optional_scripts = ("\n    ".join(optional_script_bits) + "\n") if optional_script_bits else ""
 
-        chunks = [
-            self.parts["head"],
-            self.parts["body_open"],
-            self.parts["chrome_header"],
-            self.parts["main"],
-            self.parts["chrome_footer"],
-            self.parts["scripts"],
-            self.parts["document_end"],
-        ]
-        page = "".join(chunks)
-        page = page.replace(PLACEHOLDER_TITLE, _escape_html(title))
-        page = page.replace(PLACEHOLDER_CONTENT, content_html)
-        page = page.replace(PLACEHOLDER_OPTIONAL_HEAD, optional_head)
-        page = page.replace(PLACEHOLDER_OPTIONAL_SCRIPTS, optional_scripts)
-        return rewrite_asset_paths(page, asset_prefix)
-
-    def copy_assets_to(self, site_root: str | Path) -> None:
+        values = {
+            "title": escape_html(title),
+            "content": rewrite_asset_paths(content_html, asset_prefix),
+            "optional_head": rewrite_asset_paths(optional_head, asset_prefix),
+            "optional_scripts": rewrite_asset_paths(optional_scripts, asset_prefix),
+        }
+        segments = self._prefixed_segments.get(asset_prefix)
+        if segments is None:
+            segments = [rewrite_asset_paths(segment, asset_prefix) for segment in self._segments]
+            self._prefixed_segments[asset_prefix] = segments
+        chunks = [segments[0]]
+        for slot, segment in zip(self._slots, segments[1:], strict=True):
+            chunks.append(values[slot])
+            chunks.append(segment)
+        return "".join(chunks)
+
+    @property
+    def asset_dirs(self) -> list[str]:
+        """Names of the theme asset folders copied to the site root.
+
+        Returns:
+
+        - `list[str]`: Folder names such as `["css", "js"]`.
+
+        """
+        return self.manifest.get("asset_dirs", [name for name in ASSET_DIRS if (self.theme_dir / name).is_dir()])
+
+    @property
+    def feature_assets(self) -> dict[str, dict[str, Sequence[str]]]:
+        """Optional parts of every feature, added to the head or before `</body>`.
+
+        Returns:
+
+        - `dict[str, dict[str, Sequence[str]]]`: For example
+          `{"mermaid": {"head": [], "scripts": ["mermaid_scripts"]}}`.
+
+        """
+        return self.manifest.get("features", FEATURE_ASSETS)
+
+    def copy_assets_to(self, site_root: str | Path, target: FileSystem | None = None) -> None:
         """Copy theme asset directories into the site output root.
 
         Args:
 
         - `site_root` (`str | Path`): Site output folder (HTML root).
+        - `target` (`FileSystem | None`): File system of the output. Defaults to `None` (local disk).
 
         """
         site_root = Path(site_root)
+        if target is not None and not isinstance(target, LocalFileSystem):
+            theme = LocalFileSystem()
+            for name in self.asset_dirs:
+                target.remove(site_root / name)
+                for path in theme.iter_files(self.theme_dir / name):
+                    target.copy_from(theme, path, site_root / path.relative_to(self.theme_dir))
+            return
         site_root.mkdir(parents=True, exist_ok=True)
-        asset_dirs = self.manifest.get("asset_dirs", [name for name in ASSET_DIRS if (self.theme_dir / name).is_dir()])
-        for name in asset_dirs:
+        for name in self.asset_dirs:
             src = self.theme_dir / name
             if not src.is_dir():
                 continue
@@ -157,12 +197,23 @@ class PageAssembler:
 
 @dataclass(frozen=True)
 class PageFeatures:
-    """Optional page features detected from Markdown/HTML/YAML."""
+    """Optional page features detected from Markdown/HTML/YAML.
+
+    `extra` holds other feature names, for example from the `features` list in the
+    front matter, for template features that have no detector.
+    """
 
     katex: bool = False
     stl: bool = False
     mermaid: bool = False
     chart: bool = False
+    extra: frozenset[str] = field(default_factory=frozenset)
+
+    @property
+    def names(self) -> frozenset[str]:
+        """Names of all enabled features, as used in the theme manifest."""
+        flags = {"katex": self.katex, "stl": self.stl, "mermaid": self.mermaid, "chart": self.chart}
+        return frozenset(name for name, enabled in flags.items() if enabled) | self.extra
 
 
 def asset_prefix_for(page_dir: str | Path, site_root: str | Path) -> str:
@@ -197,6 +248,8 @@ def detect_page_features(
 ) -> PageFeatures:
     """Detect optional features from rendered HTML, Markdown, and YAML.
 
+    Names listed in the `features` front matter key are enabled as well.
+
     Args:
 
     - `content_html` (`str`): Rendered article HTML.
@@ -223,7 +276,29 @@ def detect_page_features(
     chart = bool(
         _CHART_FENCE_RE.search(md_content) or "language-chart" in content_html or 'class="chart"' in content_html
     )
-    return PageFeatures(katex=katex, stl=stl, mermaid=mermaid, chart=chart)
+    extra = yaml_dict.get("features") or ()
+    if isinstance(extra, str):
+        extra = [extra]
+    elif not isinstance(extra, (list, tuple, set)):
+        extra = ()  # numbers, booleans and mappings name no features
+    return PageFeatures(
+        katex=katex, stl=stl, mermaid=mermaid, chart=chart, extra=frozenset(str(name).lower() for name in extra)
+    )
+
+
+def escape_html(text: str) -> str:
+    """Escape text for HTML text nodes and double-quoted attribute values.
+
+    Args:
+
+    - `text` (`str`): Plain text.
+
+    Returns:
+
+    - `str`: Text with `&`, `<`, `>` and `"` replaced by entities.
+
+    """
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
 
 
 def extract_title(content_html: str, fallback: str = "Untitled") -> str:
@@ -267,8 +342,3 @@ def rewrite_asset_paths(html: str, asset_prefix: str) -> str:
         return f"{attr}={quote}{asset_prefix}{folder}/"
 
     return _ASSET_ATTR_RE.sub(_replace, html)
-
-
-def _escape_html(text: str) -> str:
-    """Escape text for HTML text nodes and attribute-safe titles."""
-    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
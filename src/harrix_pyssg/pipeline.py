@@ -0,0 +1,219 @@
+"""Asyncio pipeline that overlaps reading, rendering and writing of pages."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+PIPELINE_CONCURRENCY = 8
+PIPELINE_QUEUE_SIZE = 32
+
+S = TypeVar("S")
+L = TypeVar("L")
+R = TypeVar("R")
+T = TypeVar("T")
+
+
+@dataclass
+class QueueStats:
+    """Depth of one bounded pipeline queue, sampled on every `put`."""
+
+    maxsize: int = 0
+    puts: int = 0
+    max_depth: int = 0
+    total_depth: int = 0
+
+    @property
+    def mean_depth(self) -> float:
+        """Average number of waiting items seen by producers."""
+        return self.total_depth / self.puts if self.puts else 0.0
+
+    def sample(self, depth: int) -> None:
+        """Record the queue depth right after a `put`."""
+        self.puts += 1
+        self.total_depth += depth
+        self.max_depth = max(self.max_depth, depth)
+
+
+@dataclass
+class PipelineStats:
+    """Counters and timings collected by one `run_pipeline()` call.
+
+    `load_seconds`, `render_seconds` and `write_seconds` are the summed time spent
+    inside the stage callables; when their sum is above `wall_seconds` the stages
+    overlapped. A `render` queue that is usually full means rendering is the
+    bottleneck; a `write` queue that is usually full means output I/O is.
+    """
+
+    items: int = 0
+    rendered: int = 0
+    concurrency: int = PIPELINE_CONCURRENCY
+    load_seconds: float = 0.0
+    render_seconds: float = 0.0
+    write_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    render_queue: QueueStats = field(default_factory=QueueStats)
+    write_queue: QueueStats = field(default_factory=QueueStats)
+
+
+class _Done:
+    """End-of-stream marker put into pipeline queues."""
+
+
+_DONE = _Done()
+
+
+async def run_pipeline(
+    sources: Iterable[S],
+    *,
+    load: Callable[[S], L],
+    render: Callable[[L], R | None],
+    write: Callable[[R], T],
+    after_write: Callable[[T], object] | None = None,
+    concurrency: int = PIPELINE_CONCURRENCY,
+    queue_size: int = PIPELINE_QUEUE_SIZE,
+) -> PipelineStats:
+    """Run `load` → `render` → `write` for every source with bounded queues.
+
+    `load` and `write` are blocking I/O and run in a thread pool of `concurrency`
+    threads, up to `concurrency` calls of each at a time. `render` runs in one
+    dedicated thread, one item at a time, so it may update shared state without
+    locks. `after_write` runs on the event loop with the result of each `write`, so
+    counters and indexes of written items need no locks either. Items whose
+    `render` returns `None` are not written. Queues between
+    stages hold at most `queue_size` items, which bounds memory while the slowest
+    stage catches up.
+
+    Args:
+
+    - `sources` (`Iterable[S]`): Items to process, for example note paths.
+    - `load` (`Callable[[S], L]`): Blocking read of one source.
+    - `render` (`Callable[[L], R | None]`): CPU-bound transformation.
+    - `write` (`Callable[[R], T]`): Blocking write of one rendered item.
+    - `after_write` (`Callable[[T], object] | None`): Bookkeeping for the result of each
+      `write`, called on the event loop. Defaults to `None`.
+    - `concurrency` (`int`): Number of I/O threads and of parallel loads and writes.
+    - `queue_size` (`int`): Capacity of each queue between stages.
+
+    Returns:
+
+    - `PipelineStats`: Counters, stage timings and queue depth metrics.
+
+    Example:
+
+    ```python
+    import asyncio
+    from pathlib import Path
+
+    import harrix_pyssg as hsg
+
+    stats = asyncio.run(
+        hsg.run_pipeline(
+            Path("./tests/data").rglob("*.md"),
+            load=lambda path: (path, path.read_text(encoding="utf8")),
+            render=lambda item: (item[0].name, len(item[1].split())),
+            write=print,
+        )
+    )
+    print(stats.render_queue.max_depth)
+    ```
+
+    """
+    if concurrency < 1:
+        msg = "concurrency must be at least 1"
+        raise ValueError(msg)
+    stats = PipelineStats(concurrency=concurrency)
+    stats.render_queue.maxsize = stats.write_queue.maxsize = queue_size
+    render_queue: asyncio.Queue[L | _Done] = asyncio.Queue(maxsize=queue_size)
+    write_queue: asyncio.Queue[R | _Done] = asyncio.Queue(maxsize=queue_size)
+    start = time.perf_counter()
+    with (
+        ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="h-ssg-io") as io_pool,
+        ThreadPoolExecutor(max_workers=1, thread_name_prefix="h-ssg-render") as render_pool,
+    ):
+        source_iter = iter(sources)
+        async with asyncio.TaskGroup() as group:
+            loaders = [
+                group.create_task(_load(load, source_iter, render_queue, io_pool, stats)) for _ in range(concurrency)
+            ]
+            group.create_task(_close_after(loaders, render_queue))
+            group.create_task(_render(render, render_queue, write_queue, render_pool, stats, writers=concurrency))
+            for _ in range(concurrency):
+                group.create_task(_write(write, after_write, write_queue, io_pool, stats))
+    stats.wall_seconds = time.perf_counter() - start
+    return stats
+
+
+async def _close_after(tasks: list[asyncio.Task[None]], queue: asyncio.Queue) -> None:
+    """Put the end marker into `queue` once all `tasks` have finished."""
+    await asyncio.gather(*tasks)
+    await queue.put(_DONE)
+
+
+async def _load(
+    load: Callable,
+    source_iter: Iterator,
+    render_queue: asyncio.Queue,
+    io_pool: ThreadPoolExecutor,
+    stats: PipelineStats,
+) -> None:
+    """Load sources from the shared iterator into `render_queue`."""
+    loop = asyncio.get_running_loop()
+    for source in source_iter:
+        stats.items += 1
+        loaded, seconds = await loop.run_in_executor(io_pool, _timed, load, source)
+        stats.load_seconds += seconds
+        await render_queue.put(loaded)
+        stats.render_queue.sample(render_queue.qsize())
+
+
+async def _render(
+    render: Callable,
+    render_queue: asyncio.Queue,
+    write_queue: asyncio.Queue,
+    render_pool: ThreadPoolExecutor,
+    stats: PipelineStats,
+    *,
+    writers: int,
+) -> None:
+    """Render loaded items one by one and pass results to `write_queue`."""
+    loop = asyncio.get_running_loop()
+    while not isinstance(loaded := await render_queue.get(), _Done):
+        rendered, seconds = await loop.run_in_executor(render_pool, _timed, render, loaded)
+        stats.render_seconds += seconds
+        if rendered is None:
+            continue
+        stats.rendered += 1
+        await write_queue.put(rendered)
+        stats.write_queue.sample(write_queue.qsize())
+    for _ in range(writers):
+        await write_queue.put(_DONE)
+
+
+async def _write(
+    write: Callable,
+    after_write: Callable | None,
+    write_queue: asyncio.Queue,
+    io_pool: ThreadPoolExecutor,
+    stats: PipelineStats,
+) -> None:
+    """Write rendered items until the end marker arrives; pass each result to `after_write`."""
+    loop = asyncio.get_running_loop()
+    while not isinstance(rendered := await write_queue.get(), _Done):
+        result, seconds = await loop.run_in_executor(io_pool, _timed, write, rendered)
+        stats.write_seconds += seconds
+        if after_write is not None:
+            after_write(result)
+
+
+def _timed(func: Callable[[S], T], item: S) -> tuple[T, float]:
+    """Call `func(item)` and return its result with the elapsed seconds."""
+    started = time.perf_counter()
+    result = func(item)
+    return result, time.perf_counter() - started
@@ -0,0 +1,214 @@
+"""Write precompressed `.gz` / `.zst` sidecar files next to generated site files."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from types import ModuleType
+
+PRECOMPRESS_SUFFIXES = (".html", ".css", ".js", ".svg", ".json")
+SIDECAR_SUFFIXES = (".gz", ".zst")
+PRECOMPRESS_MIN_SIZE = 1024
+GZIP_LEVEL = 9
+ZSTD_LEVEL = 19
+
+
+@dataclass
+class PrecompressStats:
+    """Counters collected by one `Precompressor.run()` call."""
+
+    files: int = 0
+    compressed: int = 0
+    reused: int = 0
+    skipped_small: int = 0
+    bytes_in: int = 0
+    bytes_gzip: int = 0
+    bytes_zstd: int = 0
+
+
+class Precompressor:
+    """Create `.gz` (and `.zst` when `zstandard` is installed) siblings for site files.
+
+    Sidecars are meant for servers such as nginx with `gzip_static on;`: the
+    server sends `index.html.gz` instead of compressing `index.html` per request.
+
+    When `cache_dir` is set, compressed blobs are stored there by the SHA-256 of
+    the source file, so files whose content did not change since the previous
+    build are not compressed again even if the output folder was wiped.
+
+    ## Usage examples
+
+    ```python
+    import harrix_pyssg as hsg
+
+    stats = hsg.Precompressor("./build_site", cache_dir="./.cache/precompress").run()
+    print(stats.compressed, stats.reused)
+    ```
+
+    """
+
+    def __init__(
+        self,
+        site_root: str | Path,
+        *,
+        min_size: int = PRECOMPRESS_MIN_SIZE,
+        cache_dir: str | Path | None = None,
+        max_workers: int | None = None,
+        zstd: bool = True,
+    ) -> None:
+        """Prepare the precompression stage.
+
+        Args:
+
+        - `site_root` (`str | Path`): Generated site folder.
+        - `min_size` (`int`): Files smaller than this many bytes are left alone.
+        - `cache_dir` (`str | Path | None`): Folder for compressed blobs keyed by content
+          hash. Defaults to `None` (always compress).
+        - `max_workers` (`int | None`): Number of compression threads. Defaults to
+          `os.cpu_count()`.
+        - `zstd` (`bool`): Also write `.zst` files when the `zstandard` module is importable.
+
+        """
+        self.site_root = Path(site_root)
+        self.min_size = min_size
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._zstandard = _load_zstandard() if zstd else None
+
+    @property
+    def encodings(self) -> tuple[str, ...]:
+        """Sidecar suffixes written by this instance.
+
+        Returns:
+
+        - `tuple[str, ...]`: `(".gz",)` or `(".gz", ".zst")`.
+
+        """
+        return (".gz", ".zst") if self._zstandard is not None else (".gz",)
+
+    def run(self, paths: Iterable[str | Path] | None = None) -> PrecompressStats:
+        """Compress all matching files under `site_root`, or only some of them.
+
+        Args:
+
+        - `paths` (`Iterable[str | Path] | None`): Only compress these files, for example
+          the pages rewritten by an incremental update. Sidecars of listed files that no
+          longer exist are deleted, and the cache is not pruned. Defaults to `None` (all
+          files under `site_root`).
+
+        Returns:
+
+        - `PrecompressStats`: Counters for this run.
+
+        """
+        stats = PrecompressStats()
+        if paths is None:
+            files = sorted(
+                path
+                for path in self.site_root.rglob("*")
+                if path.suffix.lower() in PRECOMPRESS_SUFFIXES and path.is_file()
+            )
+        else:
+            files = []
+            for path in sorted({Path(path) for path in paths}):
+                if path.suffix.lower() not in PRECOMPRESS_SUFFIXES:
+                    continue
+                if path.is_file():
+                    files.append(path)
+                else:
+                    _remove_sidecars(path)
+        stats.files = len(files)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(self._process_file, files))
+
+        used_hashes: set[str] = set()
+        for result in results:
+            if result is None:
+                stats.skipped_small += 1
+                continue
+            digest, size_in, sizes, reused = result
+            used_hashes.add(digest)
+            stats.bytes_in += size_in
+            stats.bytes_gzip += sizes.get(".gz", 0)
+            stats.bytes_zstd += sizes.get(".zst", 0)
+            if reused:
+                stats.reused += 1
+            else:
+                stats.compressed += 1
+
+        if paths is None:
+            self._prune_cache(used_hashes)
+        return stats
+
+    def _cache_path(self, digest: str, encoding: str) -> Path | None:
+        """Return the cache blob path for a content hash and encoding."""
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / digest[:2] / f"{digest}{encoding}"
+
+    def _compress(self, data: bytes, encoding: str) -> bytes:
+        """Compress `data` with the codec for `encoding`."""
+        if encoding == ".gz":
+            return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+        if self._zstandard is None:
+            msg = "zstandard is not available"
+            raise RuntimeError(msg)
+        return self._zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+    def _process_file(self, path: Path) -> tuple[str, int, dict[str, int], bool] | None:
+        """Write sidecars for one file; return `(hash, size, sizes, reused)` or `None` if too small."""
+        data = path.read_bytes()
+        if len(data) < self.min_size:
+            _remove_sidecars(path)  # the file may have shrunk since the previous build
+            return None
+        digest = hashlib.sha256(data).hexdigest()
+        sizes: dict[str, int] = {}
+        reused = True
+        for encoding in self.encodings:
+            sidecar = path.with_name(path.name + encoding)
+            cached = self._cache_path(digest, encoding)
+            if cached is not None and cached.is_file():
+                shutil.copyfile(cached, sidecar)
+                sizes[encoding] = cached.stat().st_size
+                continue
+            reused = False
+            compressed = self._compress(data, encoding)
+            if cached is not None:
+                cached.parent.mkdir(parents=True, exist_ok=True)
+                cached.write_bytes(compressed)
+            sidecar.write_bytes(compressed)
+            sizes[encoding] = len(compressed)
+        return digest, len(data), sizes, reused
+
+    def _prune_cache(self, used_hashes: set[str]) -> None:
+        """Delete cached blobs that no file of this run refers to."""
+        if self.cache_dir is None or not self.cache_dir.is_dir():
+            return
+        for blob in self.cache_dir.glob("*/*"):
+            digest = blob.name.split(".", 1)[0]
+            if digest not in used_hashes:
+                blob.unlink()
+
+
+def _load_zstandard() -> ModuleType | None:
+    """Import the optional `zstandard` module."""
+    try:
+        import zstandard  # noqa: PLC0415
+    except ImportError:
+        return None
+    return zstandard
+
+
+def _remove_sidecars(path: Path) -> None:
+    """Delete the `.gz` / `.zst` sidecars of a file."""
+    for suffix in SIDECAR_SUFFIXES:
+        path.with_name(path.name + suffix).unlink(missing_ok=True)
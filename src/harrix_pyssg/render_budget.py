@@ -0,0 +1,161 @@
+"""Limit the input size and render time of single articles with a watched worker process."""
+
+from __future__ import annotations
+
+import multiprocessing
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Self
+
+from harrix_pyssg.article import render_markdown
+from harrix_pyssg.note_meta import resolve_note_title
+from harrix_pyssg.page_assembler import PageFeatures, detect_page_features, escape_html
+
+if TYPE_CHECKING:
+    from multiprocessing.pool import Pool
+    from types import TracebackType
+
+    from harrix_pyssg.article import Article
+
+
+@dataclass(frozen=True, slots=True)
+class RenderBudget:
+    """Per-article limits of a build.
+
+    `max_bytes` is checked before rendering. `max_seconds` makes Markdown
+    rendering and feature detection run in a worker process that is stopped and
+    replaced when an article takes longer, so a pathological note cannot stall the
+    build. With `fallback` an article over budget gets a plain page with its
+    Markdown source instead of no page.
+    """
+
+    max_bytes: int | None = None
+    max_seconds: float | None = None
+    fallback: bool = False
+
+    def __post_init__(self) -> None:
+        """Validate the limits."""
+        if (self.max_bytes is not None and self.max_bytes < 1) or (
+            self.max_seconds is not None and self.max_seconds <= 0
+        ):
+            msg = "render budget limits must be positive"
+            raise ValueError(msg)
+
+
+@dataclass(frozen=True, slots=True)
+class BudgetViolation:
+    """An article that exceeded the render budget or failed to render."""
+
+    handle: str
+    reason: str
+
+    def __str__(self) -> str:
+        """Return the violation as `handle: reason`."""
+        return f"{self.handle or '.'}: {self.reason}"
+
+
+class RenderGuard:
+    """Render article content within a `RenderBudget`.
+
+    Builds render one article at a time, so one worker process is enough; it is
+    started on first use and restarted after a timeout. Without `max_seconds`
+    content is rendered in the calling process and only the size is checked.
+
+    ## Usage examples
+
+    ```python
+    import harrix_pyssg as hsg
+
+    with hsg.RenderGuard(hsg.RenderBudget(max_bytes=1_000_000, max_seconds=10)) as guard:
+        result = guard.render(hsg.Article("./tests/data/test_01/test_01.md"), "test_01")
+    print(result if isinstance(result, hsg.BudgetViolation) else result[0])
+    ```
+
+    """
+
+    def __init__(self, budget: RenderBudget) -> None:
+        """Create a guard; the worker process is started lazily.
+
+        Args:
+
+        - `budget` (`RenderBudget`): Limits to enforce.
+
+        """
+        self.budget = budget
+        self._pool: Pool | None = None
+
+    def __enter__(self) -> Self:
+        """Return the guard."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop the worker process."""
+        self.close()
+
+    def close(self) -> None:
+        """Stop the worker process if it is running."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def fallback_html(self, article: Article) -> str:
+        """Return the plain content used for an article over budget.
+
+        Args:
+
+        - `article` (`Article`): Article over budget.
+
+        Returns:
+
+        - `str`: Title and escaped Markdown source in a `<pre>` block.
+
+        """
+        title = escape_html(resolve_note_title(article.md_content, file_stem=article.md_filename.stem))
+        return f"<h1>{title}</h1>\n<pre>{escape_html(article.md_content_no_yaml)}</pre>\n"
+
+    def render(self, article: Article, handle: str) -> tuple[str, PageFeatures] | BudgetViolation:
+        """Render the content of an article and detect its page features.
+
+        Args:
+
+        - `article` (`Article`): Article to render.
+        - `handle` (`str`): Article handle used in the report.
+
+        Returns:
+
+        - `tuple[str, PageFeatures] | BudgetViolation`: Content HTML with features, or
+          the reason why the article was not rendered.
+
+        """
+        size = len(article.md_content.encode("utf8"))
+        if self.budget.max_bytes is not None and size > self.budget.max_bytes:
+            return BudgetViolation(handle, f"input is {size} bytes, above the limit of {self.budget.max_bytes}")
+        arguments = (article.md_content, article.md_content_no_yaml, article.md_yaml_dict)
+        started = time.perf_counter()
+        try:
+            if self.budget.max_seconds is None:
+                return _render_content(*arguments)
+            if self._pool is None:
+                self._pool = multiprocessing.get_context("spawn").Pool(processes=1)
+                # Import the renderer before the clock of the first article starts.
+                self._pool.apply(_render_content, ("", "", {}))
+                started = time.perf_counter()
+            return self._pool.apply_async(_render_content, arguments).get(timeout=self.budget.max_seconds)
+        except multiprocessing.TimeoutError:
+            self.close()
+            return BudgetViolation(handle, f"render took longer than {self.budget.max_seconds:g} s")
+        except Exception as e:
+            seconds = time.perf_counter() - started
+            return BudgetViolation(handle, f"render failed after {seconds:.2f} s: {type(e).__name__}: {e}")
+
+
+def _render_content(md_content: str, md_content_no_yaml: str, yaml_dict: dict) -> tuple[str, PageFeatures]:
+    """Render Markdown and detect page features; runs in the worker process."""
+    content_html = render_markdown(md_content)
+    return content_html, detect_page_features(content_html, md_content=md_content_no_yaml, yaml_dict=yaml_dict)
@@ -0,0 +1,247 @@
+"""Client-side search index split into lazily loaded JSON shards."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from collections import Counter
+from pathlib import Path
+
+SEARCH_FOLDER = "search"
+SEARCH_MANIFEST = "index.json"
+SEARCH_MAX_SHARD_BYTES = 64_000
+TITLE_WEIGHT = 10
+HEADING_WEIGHT = 5
+BODY_WEIGHT = 1
+
+_SKIP_BLOCK_RE = re.compile(r"<(script|style)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_HEADING_RE = re.compile(r"<h[1-6]\b[^>]*>(.*?)</h[1-6]\s*>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+_ENTITY_RE = re.compile(r"&(?:#\d+|#x[0-9a-f]+|\w+);", re.IGNORECASE)
+_TOKEN_RE = re.compile(r"\w{2,}")
+
+
+class SearchIndex:
+    """Inverted index over article titles, headings and body text.
+
+    Every article contributes a `{term: score}` map; postings of an article are
+    replaced as a whole by `update()`, so a changed article only touches its own
+    terms. `write()` emits `search/index.json` (documents and shard map) and
+    `search/shard-N.json` files. A shard holds all terms that start with its key;
+    a client loads the shard with the longest key that is a prefix of the query term.
+
+    The per-article term maps can be saved to and loaded from a JSON cache keyed
+    by a hash of the rendered HTML, so unchanged articles are not tokenized again.
+
+    ## Usage examples
+
+    ```python
+    import harrix_pyssg as hsg
+
+    index = hsg.SearchIndex()
+    index.update("test_01", "Title", "test_01/", "<h1>Title</h1><p>Hello, world!</p>")
+    index.write("./build_site")
+    ```
+
+    """
+
+    def __init__(self, max_shard_bytes: int = SEARCH_MAX_SHARD_BYTES) -> None:
+        """Create an empty index.
+
+        Args:
+
+        - `max_shard_bytes` (`int`): Approximate upper size of one shard file. Shards
+          above it are split by a longer term prefix.
+
+        """
+        self.max_shard_bytes = max_shard_bytes
+        self._docs: dict[str, tuple[str, str]] = {}
+        self._doc_terms: dict[str, dict[str, int]] = {}
+        self._doc_hashes: dict[str, str] = {}
+        self._postings: dict[str, dict[str, int]] = {}
+        self.tokenized = 0
+        self.reused = 0
+
+    def __len__(self) -> int:
+        """Return the number of indexed documents."""
+        return len(self._docs)
+
+    def load_cache(self, cache_filename: str | Path) -> None:
+        """Load per-article term maps saved by `save_cache()`.
+
+        Cached entries are only used by `update()` when the HTML hash matches.
+
+        Args:
+
+        - `cache_filename` (`str | Path`): JSON cache file. Missing or broken files are ignored.
+
+        """
+        try:
+            data = json.loads(Path(cache_filename).read_text(encoding="utf8"))
+        except (OSError, ValueError):
+            return
+        for handle, item in data.get("articles", {}).items():
+            self._doc_hashes[handle] = item["hash"]
+            self._doc_terms[handle] = item["terms"]
+
+    def remove(self, handle: str) -> None:
+        """Remove an article and its postings.
+
+        Args:
+
+        - `handle` (`str`): Article handle.
+
+        """
+        self._docs.pop(handle, None)
+        self._doc_hashes.pop(handle, None)
+        for term in self._doc_terms.pop(handle, {}):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(handle, None)
+            if not postings:
+                del self._postings[term]
+
+    def save_cache(self, cache_filename: str | Path) -> None:
+        """Save per-article term maps of indexed documents.
+
+        Args:
+
+        - `cache_filename` (`str | Path`): JSON cache file.
+
+        """
+        cache_filename = Path(cache_filename)
+        cache_filename.parent.mkdir(parents=True, exist_ok=True)
+        articles = {
+            handle: {"hash": self._doc_hashes[handle], "terms": self._doc_terms[handle]}
+            for handle in sorted(self._docs)
+        }
+        cache_filename.write_text(json.dumps({"articles": articles}, ensure_ascii=False), encoding="utf8")
+
+    def update(self, handle: str, title: str, url: str, content_html: str) -> None:
+        """Add or replace an article.
+
+        Args:
+
+        - `handle` (`str`): Stable article id (for example the article folder).
+        - `title` (`str`): Article title.
+        - `url` (`str`): Page URL relative to the site root.
+        - `content_html` (`str`): Rendered article body.
+
+        """
+        digest = hashlib.sha1(f"{title}\0{content_html}".encode(), usedforsecurity=False).hexdigest()
+        cached_terms = self._doc_terms.get(handle) if self._doc_hashes.get(handle) == digest else None
+        if cached_terms is not None and handle in self._docs:
+            self._docs[handle] = (url, title)
+            self.reused += 1
+            return
+        self.remove(handle)
+        if cached_terms is not None:
+            terms = cached_terms
+            self.reused += 1
+        else:
+            terms = extract_search_terms(title, content_html)
+            self.tokenized += 1
+        self._docs[handle] = (url, title)
+        self._doc_hashes[handle] = digest
+        self._doc_terms[handle] = terms
+        for term, score in terms.items():
+            self._postings.setdefault(term, {})[handle] = score
+
+    def write(self, html_folder: str | Path) -> Path:
+        """Write the manifest and shard files to `<html_folder>/search/`.
+
+        Args:
+
+        - `html_folder` (`str | Path`): Site output root.
+
+        Returns:
+
+        - `Path`: Path of `search/index.json`.
+
+        """
+        search_dir = Path(html_folder) / SEARCH_FOLDER
+        search_dir.mkdir(parents=True, exist_ok=True)
+        for old_shard in search_dir.glob("shard-*.json*"):  # with precompressed sidecars
+            old_shard.unlink()
+
+        handles = sorted(self._docs)
+        doc_ids = {handle: doc_id for doc_id, handle in enumerate(handles)}
+        encoded = {term: self._encode_postings(postings, doc_ids) for term, postings in self._postings.items()}
+
+        shards: dict[str, str] = {}
+        for shard_number, (key, terms) in enumerate(sorted(self._split_shards(sorted(encoded), encoded, ""))):
+            filename = f"shard-{shard_number}.json"
+            payload = {term: encoded[term] for term in terms}
+            (search_dir / filename).write_text(
+                json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf8"
+            )
+            shards[key] = filename
+
+        manifest = {
+            "version": 1,
+            "docs": [list(self._docs[handle]) for handle in handles],
+            "shards": shards,
+        }
+        manifest_path = search_dir / SEARCH_MANIFEST
+        manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, separators=(",", ":")), encoding="utf8")
+        return manifest_path
+
+    @staticmethod
+    def _encode_postings(postings: dict[str, int], doc_ids: dict[str, int]) -> list[int]:
+        """Encode postings as a flat `[doc_id, score, …]` list, best score first."""
+        ordered = sorted(postings.items(), key=lambda item: (-item[1], doc_ids[item[0]]))
+        return [value for handle, score in ordered for value in (doc_ids[handle], score)]
+
+    def _split_shards(
+        self, terms: list[str], encoded: dict[str, list[int]], prefix: str
+    ) -> list[tuple[str, list[str]]]:
+        """Group sorted `terms` sharing `prefix` into shards below `max_shard_bytes`."""
+        size = sum(len(term) + 4 * len(encoded[term]) + 4 for term in terms)
+        if prefix and size <= self.max_shard_bytes:
+            return [(prefix, terms)]
+        groups: dict[str, list[str]] = {}
+        remaining: list[str] = []
+        for term in terms:
+            if len(term) > len(prefix):
+                groups.setdefault(term[: len(prefix) + 1], []).append(term)
+            else:
+                remaining.append(term)
+        shards = [(prefix, remaining)] if remaining else []
+        for key, group in groups.items():
+            shards.extend(self._split_shards(group, encoded, key))
+        return shards
+
+
+def extract_search_terms(title: str, content_html: str) -> dict[str, int]:
+    """Tokenize a title and rendered HTML into weighted terms.
+
+    Title words weigh `TITLE_WEIGHT`, heading words `HEADING_WEIGHT` and other
+    words `BODY_WEIGHT` per occurrence. `<script>` and `<style>` are skipped.
+
+    Args:
+
+    - `title` (`str`): Article title.
+    - `content_html` (`str`): Rendered article body.
+
+    Returns:
+
+    - `dict[str, int]`: Lowercase terms with scores.
+
+    """
+    html = _SKIP_BLOCK_RE.sub(" ", content_html)
+    scores: Counter[str] = Counter()
+    for token in _tokenize(title):
+        scores[token] += TITLE_WEIGHT
+    for heading in _HEADING_RE.findall(html):
+        for token in _tokenize(_TAG_RE.sub(" ", heading)):
+            scores[token] += HEADING_WEIGHT - BODY_WEIGHT
+    for token in _tokenize(_TAG_RE.sub(" ", html)):
+        scores[token] += BODY_WEIGHT
+    return dict(scores)
+
+
+def _tokenize(text: str) -> list[str]:
+    """Split plain text into lowercase word tokens."""
+    return _TOKEN_RE.findall(_ENTITY_RE.sub(" ", text).casefold())
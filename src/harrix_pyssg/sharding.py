@@ -0,0 +1,229 @@
+"""Split a site build into shards by article and merge shard outputs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+SHARD_MANIFEST = "h-ssg-shard.json"
+SHARD_MANIFEST_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class Shard:
+    """One of `count` parts of a site build, numbered from 1.
+
+    An article belongs to the shard selected by a stable hash of its handle, so
+    every runner computes the same partition without coordination, and adding or
+    changing one note does not move other notes between shards.
+
+    ## Usage examples
+
+    ```python
+    import harrix_pyssg as hsg
+
+    shard = hsg.Shard.parse("2/4")
+    print(shard.contains("en/blog/2013/kbd-style"))
+    ```
+
+    """
+
+    index: int
+    count: int
+
+    def __post_init__(self) -> None:
+        """Validate `index` and `count`."""
+        if self.count < 1 or not 1 <= self.index <= self.count:
+            msg = f"invalid shard {self.index}/{self.count}: expected 1 <= i <= N"
+            raise ValueError(msg)
+
+    def __str__(self) -> str:
+        """Return the shard as `i/N`."""
+        return f"{self.index}/{self.count}"
+
+    def contains(self, handle: str) -> bool:
+        """Return `True` when the article with `handle` belongs to this shard.
+
+        Args:
+
+        - `handle` (`str`): Article folder relative to the Markdown root in POSIX form.
+
+        Returns:
+
+        - `bool`: Whether this shard builds the article.
+
+        """
+        digest = hashlib.sha1(handle.encode(), usedforsecurity=False).digest()
+        return int.from_bytes(digest[:8], "big") % self.count == self.index - 1
+
+    @property
+    def is_primary(self) -> bool:
+        """`True` for shard 1, which also writes site-wide pages such as listings and feeds."""
+        return self.index == 1
+
+    @classmethod
+    def parse(cls, text: str) -> Shard:
+        """Parse a shard written as `i/N`, for example `2/4`.
+
+        Args:
+
+        - `text` (`str`): Shard number and number of shards.
+
+        Returns:
+
+        - `Shard`: Parsed shard.
+
+        """
+        index, separator, count = text.partition("/")
+        try:
+            return cls(int(index), int(count)) if separator else cls(int(index), 0)
+        except ValueError as e:
+            msg = f"invalid shard {text!r}: expected i/N, for example 2/4"
+            raise ValueError(msg) from e
+
+
+def merge_shards(shard_folders: Sequence[str | Path], html_folder: str | Path) -> list[Path]:
+    """Combine the outputs of all shards of a build into `html_folder`.
+
+    Every shard folder must hold the manifest written by a sharded
+    `StaticSiteGenerator.generate_site()`. The merge checks that all shards of one
+    build are present, that no page or file is produced by two shards and that the
+    theme assets of all shards are identical; then it clears `html_folder`, copies
+    the pages of every shard and the theme assets once. Manifests are not copied.
+
+    Args:
+
+    - `shard_folders` (`Sequence[str | Path]`): Output folders of the shards.
+    - `html_folder` (`str | Path`): Folder for the merged site.
+
+    Returns:
+
+    - `list[Path]`: Files written to `html_folder`.
+
+    Example:
+
+    ```python
+    import harrix_pyssg as hsg
+
+    for index in (1, 2):
+        sg = hsg.StaticSiteGenerator("./tests/data")
+        sg.generate_site(f"./build_shards/{index}", shard=f"{index}/2")
+    hsg.merge_shards(["./build_shards/1", "./build_shards/2"], "./build_site")
+    ```
+
+    """
+    manifests = [(Path(folder), read_shard_manifest(folder)) for folder in shard_folders]
+    if not manifests:
+        msg = "no shard folders to merge"
+        raise ValueError(msg)
+    shards = [Shard.parse(manifest["shard"]) for _, manifest in manifests]
+    count = shards[0].count
+    indexes = sorted(shard.index for shard in shards)
+    if any(shard.count != count for shard in shards) or indexes != list(range(1, count + 1)):
+        msg = f"expected shards 1..{count} of one build, got {', '.join(str(shard) for shard in shards)}"
+        raise ValueError(msg)
+
+    owners: dict[str, Path] = {}
+    collisions: list[str] = []
+    for folder, manifest in manifests:
+        for relative in manifest["files"]:
+            if relative in owners:
+                collisions.append(f"{relative} ({owners[relative]}, {folder})")
+            else:
+                owners[relative] = folder
+    assets_folder, assets = manifests[0][0], manifests[0][1]["assets"]
+    for folder, manifest in manifests[1:]:
+        if manifest["assets"] != assets:
+            collisions.append(f"theme assets differ ({assets_folder}, {folder})")
+    if collisions:
+        msg = "shard outputs collide: " + "; ".join(collisions[:10])
+        raise ValueError(msg)
+
+    html_folder = Path(html_folder)
+    if html_folder.exists():
+        shutil.rmtree(html_folder)
+    html_folder.mkdir(parents=True)
+    written: list[Path] = []
+    for relative, folder in [*sorted(owners.items()), *((name, assets_folder) for name in sorted(assets))]:
+        target = html_folder / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(folder / relative, target)
+        written.append(target)
+    return written
+
+
+def read_shard_manifest(shard_folder: str | Path) -> dict:
+    """Read the manifest of one shard output folder.
+
+    Args:
+
+    - `shard_folder` (`str | Path`): Output folder of a sharded build.
+
+    Returns:
+
+    - `dict`: Manifest with `shard`, `handles`, `files` and `assets`.
+
+    """
+    path = Path(shard_folder) / SHARD_MANIFEST
+    try:
+        manifest = json.loads(path.read_text(encoding="utf8"))
+    except (OSError, ValueError) as e:
+        msg = f"{path} is not a shard manifest"
+        raise ValueError(msg) from e
+    if manifest.get("version") != SHARD_MANIFEST_VERSION:
+        msg = f"{path} has unsupported version {manifest.get('version')!r}"
+        raise ValueError(msg)
+    return manifest
+
+
+def write_shard_manifest(
+    shard: Shard, html_folder: str | Path, handles: Iterable[str], asset_dirs: Iterable[str] = ()
+) -> Path:
+    """Write the manifest of a finished shard build to `<html_folder>/h-ssg-shard.json`.
+
+    Files below `asset_dirs` are recorded as theme assets with their SHA-256;
+    every other output file is recorded as owned by this shard.
+
+    Args:
+
+    - `shard` (`Shard`): Built shard.
+    - `html_folder` (`str | Path`): Output folder of the shard.
+    - `handles` (`Iterable[str]`): Handles of the articles built by this shard.
+    - `asset_dirs` (`Iterable[str]`): Top-level theme asset folders. Defaults to `()`.
+
+    Returns:
+
+    - `Path`: Manifest path.
+
+    """
+    html_folder = Path(html_folder)
+    asset_dirs = set(asset_dirs)
+    files: list[str] = []
+    assets: dict[str, str] = {}
+    for path in sorted(html_folder.rglob("*")):
+        if not path.is_file():
+            continue
+        relative = path.relative_to(html_folder).as_posix()
+        if relative == SHARD_MANIFEST:
+            continue
+        if relative.split("/", 1)[0] in asset_dirs:
+            assets[relative] = hashlib.sha256(path.read_bytes()).hexdigest()
+        else:
+            files.append(relative)
+    manifest = {
+        "version": SHARD_MANIFEST_VERSION,
+        "shard": str(shard),
+        "handles": sorted(handles),
+        "files": files,
+        "assets": assets,
+    }
+    path = html_folder / SHARD_MANIFEST
+    path.write_text(json.dumps(manifest, ensure_ascii=False, indent=1), encoding="utf8")
+    return path
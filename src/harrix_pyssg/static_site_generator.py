@@ -2,11 +2,36 @@
 
 from __future__ import annotations
 
-import shutil
+import asyncio
+import time
+import tracemalloc
+from contextlib import AbstractContextManager, contextmanager, nullcontext
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import harrix_pyssg as hsg
-from harrix_pyssg.page_assembler import PageAssembler
+from harrix_pyssg.archive import ArchiveFileSystem
+from harrix_pyssg.article_meta import ArticleMeta
+from harrix_pyssg.build_events import BuildEvents, JsonLinesSink
+from harrix_pyssg.build_plan import BuildPlan
+from harrix_pyssg.discovery import DEFAULT_INCLUDE, DiscoveryCache, iter_markdown_files
+from harrix_pyssg.feeds import FeedEntry, write_atom_feeds, write_sitemap
+from harrix_pyssg.filesystem import FileSystem, LocalFileSystem
+from harrix_pyssg.html_minifier import HtmlMinifier
+from harrix_pyssg.image_sizes import ImageSizeCache
+from harrix_pyssg.link_index import BrokenLink, LinkIndex
+from harrix_pyssg.memory_profile import MemoryProfiler
+from harrix_pyssg.note_meta import resolve_note_title
+from harrix_pyssg.page_assembler import PageAssembler, PageFeatures
+from harrix_pyssg.pipeline import PIPELINE_CONCURRENCY, PIPELINE_QUEUE_SIZE, PipelineStats, run_pipeline
+from harrix_pyssg.precompress import Precompressor
+from harrix_pyssg.render_budget import BudgetViolation, RenderBudget, RenderGuard
+from harrix_pyssg.search_index import SearchIndex
+from harrix_pyssg.sharding import Shard, write_shard_manifest
+from harrix_pyssg.taxonomy import LISTING_KINDS, TaxonomyEntry, TaxonomyIndex
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
 
 
 class StaticSiteGenerator:
@@ -68,7 +93,18 @@ class StaticSiteGenerator:
 
     """
 
-    def __init__(self, md_folder: str | Path, theme_dir: str | Path | None = None) -> None:
+    def __init__(
+        self,
+        md_folder: str | Path,
+        theme_dir: str | Path | None = None,
+        *,
+        cache_dir: str | Path | None = None,
+        exclude: Sequence[str] = (),
+        events: BuildEvents | None = None,
+        include: Sequence[str] = DEFAULT_INCLUDE,
+        source: FileSystem | None = None,
+        streaming: bool = False,
+    ) -> None:
         """Collect Markdown files from folder and sub-folders.
 
         Constructor `__init__` does not generate new files and folders.
@@ -78,6 +114,22 @@ class StaticSiteGenerator:
         - `md_folder` (`str | Path`): Folder with Markdown files. Example: `./tests/data`.
         - `theme_dir` (`str | Path | None`): Optional sliced theme directory. When set,
           generated pages are full HTML documents using theme chrome and assets.
+        - `cache_dir` (`str | Path | None`): Optional folder that keeps build caches
+          between runs (for example compressed blobs and folder listings used to skip
+          unchanged folders during discovery). Must be outside `html_folder`.
+        - `exclude` (`Sequence[str]`): Glob patterns of files and folders to skip, matched
+          against names and paths relative to `md_folder` (for example `node_modules`).
+          Hidden entries are always skipped. Defaults to `()`.
+        - `events` (`BuildEvents | None`): Dispatcher of discovery, per-article, error and
+          throughput events. Listeners can also be added later through `events`.
+          Defaults to `None` (a dispatcher without listeners).
+        - `include` (`Sequence[str]`): Glob patterns of note files. Defaults to `("*.md",)`.
+        - `source` (`FileSystem | None`): File system of the notes and the files they own,
+          for example a `MemoryFileSystem`. Not supported together with `cache_dir`.
+          Defaults to `None` (local disk).
+        - `streaming` (`bool`): Memory-bounded mode. Articles are not kept in `articles`:
+          discovery and `generate_site()` load one article at a time and release it,
+          and only `article_metas` records are retained. Defaults to `False`.
 
         Example:
 
@@ -88,10 +140,44 @@ class StaticSiteGenerator:
         ```
 
         """
+        self._source = source if source is not None else LocalFileSystem()
+        if cache_dir is not None and not isinstance(self._source, LocalFileSystem):
+            msg = "cache_dir requires a local source"
+            raise ValueError(msg)
+        self._target: FileSystem = LocalFileSystem()
         self._md_folder = Path(md_folder)
         self._articles: list[hsg.Article] = []
+        self._streaming = streaming
+        self._include = tuple(include)
+        self._exclude = tuple(exclude)
         self._html_folder = None
         self._theme_dir = Path(theme_dir) if theme_dir is not None else None
+        self._cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._html_minifier: HtmlMinifier | None = None
+        self._image_sizes: ImageSizeCache | None = None
+        self._link_index: LinkIndex | None = None
+        self._render_guard: RenderGuard | None = None
+        self._budget_violations: list[BudgetViolation] = []
+        self._broken_links: dict[str, list[BrokenLink]] = {}
+        self._page_assembler: PageAssembler | None = None
+        self._taxonomy = TaxonomyIndex()
+        self._taxonomy_pages = False
+        self._search_index: SearchIndex | None = None
+        self._base_url: str | None = None
+        self._sitemap = False
+        self._atom_feeds = False
+        self._precompress = False
+        self._metas: dict[str, ArticleMeta] = {}
+        self._build_plan = BuildPlan(self._md_folder, filesystem=self._source)
+        self._pipeline_stats: PipelineStats | None = None
+        self._shard: Shard | None = None
+        self._discovery_cache = DiscoveryCache(self._cache_dir / "discovery.json") if self._cache_dir else None
+        self._events = events if events is not None else BuildEvents()
+        self._build_started = 0.0
+        self._pages_written = 0
+        self._bytes_written = 0
+        self._article_started: dict[str, tuple[float, int]] = {}
+        self._memory_profiler: MemoryProfiler | None = None
 
         self._get_info_about_articles()
 
@@ -99,6 +185,8 @@ class StaticSiteGenerator:
     def articles(self) -> list[hsg.Article]:
         r"""List of all articles that are generated in the `__init__()`.
 
+        Empty in streaming mode; use `iter_articles()` instead.
+
         Returns:
 
         - `list[hsg.Article]`: List of all articles.
@@ -118,10 +206,178 @@ class StaticSiteGenerator:
         """
         return self._articles
 
+    @property
+    def article_metas(self) -> list[ArticleMeta]:
+        """Compact metadata records of all articles, sorted by date, title and handle.
+
+        Records are kept in both modes and are what feeds and taxonomies are built from.
+
+        Returns:
+
+        - `list[ArticleMeta]`: One record per Markdown file, drafts included.
+
+        Example:
+
+        ```python
+        import harrix_pyssg as hsg
+
+        sg = hsg.StaticSiteGenerator("./tests/data", streaming=True)
+        for meta in sg.article_metas:
+            print(meta.date, meta.title, meta.size)
+        ```
+
+        """
+        return sorted(self._metas.values(), key=lambda meta: meta.sort_key)
+
+    @property
+    def broken_links(self) -> dict[str, list[BrokenLink]]:
+        """Broken internal references found by the last `generate_site(check_links=True)`.
+
+        Returns:
+
+        - `dict[str, list[BrokenLink]]`: Broken references by article handle.
+
+        Example:
+
+        ```python
+        import harrix_pyssg as hsg
+
+        sg = hsg.StaticSiteGenerator("./tests/data")
+        sg.generate_site("./build_site", check_links=True)
+        for handle, links in sg.broken_links.items():
+            print(handle, [str(link) for link in links])
+        ```
+
+        """
+        return self._broken_links
+
+    @property
+    def budget_violations(self) -> list[BudgetViolation]:
+        """Articles of the last build that exceeded the render budget or failed to render.
+
+        Returns:
+
+        - `list[BudgetViolation]`: Violations in build order.
+
+        Example:
+
+        ```python
+        import harrix_pyssg as hsg
+
+        sg = hsg.StaticSiteGenerator("./tests/data")
+        sg.generate_site("./build_site", render_budget=hsg.RenderBudget(max_bytes=100_000, max_seconds=10))
+        print([str(violation) for violation in sg.budget_violations])
+        ```
+
+        """
+        return self._budget_violations
+
+    @property
+    def build_plan(self) -> BuildPlan:
+        """Ownership of output folders and files by articles.
+
+        Returns:
+
+        - `BuildPlan`: Plan filled during discovery and used by `generate_site()`.
+
+        Example:
+
+        ```python
+        import harrix_pyssg as hsg
+
+        sg = hsg.StaticSiteGenerator("./tests/data")
+        print(sg.build_plan.handles)  # ['test_01', 'test_02', 'test_03']
+        print(sg.build_plan.conflicts)  # []
+        ```
+
+        """
+        return self._build_plan
+
+    @property
+    def cache_dir(self) -> Path | None:
+        """Folder with build caches kept between runs.
+
+        Returns:
+
+        - `Path | None`: Cache folder, or `None` when caching is disabled.
+
+        """
+        return self._cache_dir.absolute() if self._cache_dir is not None else None
+
+    def changed_notes(self, paths: Iterable[str | Path]) -> list[Path]:
+        """Return the notes to rebuild after some files changed.
+
+        A changed file belongs to the nearest article folder above it, so a changed
+        image rebuilds the article that owns it. Notes that are no longer in the
+        source, even if an earlier build planned them, are not returned; a full
+        `generate_site()` removes their pages.
+
+        Args:
+
+        - `paths` (`Iterable[str | Path]`): Added, changed or deleted files, for example
+          from `GitFileSystem.diff()`.
+
+        Returns:
+
+        - `list[Path]`: Sorted notes to pass to `update_article()`.
+
+        Example:
+
+        ```python
+        import harrix_pyssg as hsg
+
+        sg = hsg.StaticSiteGenerator("./tests/data")
+        sg.generate_site("./build_site")
+        for md_filename in sg.changed_notes(["./tests/data/test_01/img/test-image.png"]):
+            sg.update_article(md_filename)
+        ```
+
+        """
+        notes = {self._build_plan.owner_of_path(path) for path in paths}
+        return sorted(note for note in notes if note is not None and self._source.is_file(note))
+
+    @property
+    def events(self) -> BuildEvents:
+        """Dispatcher of the build events of this generator.
+
+        Returns:
+
+        - `BuildEvents`: Dispatcher; add listeners to receive `BuildEvent` records.
+
+        Example:
+
+        ```python
+        import harrix_pyssg as hsg
+
+        sg = hsg.StaticSiteGenerator("./tests/data")
+        sg.events.add_listener(lambda event: print(event.kind, event.data))
+        sg.generate_site("./build_site")
+        ```
+
+        """
+        return self._events
+
     def generate_site(
         self,
         html_folder: str | Path | None = None,
         theme_dir: str | Path | None = None,
+        *,
+        archive: str | Path | None = None,
+        atom_feeds: bool = False,
+        base_url: str | None = None,
+        check_links: bool = False,
+        event_log: str | Path | None = None,
+        image_sizes: bool = False,
+        memory_budget: int | None = None,
+        memory_profile: str | Path | None = None,
+        minify: bool = False,
+        precompress: bool = False,
+        render_budget: RenderBudget | None = None,
+        search_index: bool = False,
+        shard: Shard | str | None = None,
+        sitemap: bool = False,
+        target: FileSystem | None = None,
+        taxonomy_pages: bool = False,
     ) -> StaticSiteGenerator:
         """Generate HTML files with folders from Markdown files.
 
@@ -130,6 +386,59 @@ class StaticSiteGenerator:
         - `html_folder` (`str | Path | None`): Output folder of the HTML files. Defaults to `None`.
         - `theme_dir` (`str | Path | None`): Optional sliced theme directory. Overrides the
           theme passed to the constructor when set.
+        - `archive` (`str | Path | None`): Write pages, owned files and theme assets
+          straight into this `.zip`, `.tar.gz` or `.tgz` file instead of `html_folder`,
+          with entries in build order and fixed timestamps (see `ArchiveFileSystem`).
+          `html_folder` only names the archive root then. Same restrictions as a
+          non-local `target`. Defaults to `None`.
+        - `atom_feeds` (`bool`): Write per-language Atom feeds `atom/<lang>.xml`.
+          Requires `base_url`. Defaults to `False`.
+        - `base_url` (`str | None`): Absolute site URL, for example `https://harrix.dev/`.
+          Used for sitemap and feed URLs of articles without `permalink`.
+        - `check_links` (`bool`): Check internal links and asset references of every
+          article against the pages, anchors and files of the build; results are in
+          `broken_links`. Not available for shard builds. Defaults to `False`.
+        - `event_log` (`str | Path | None`): File that receives the events of this build
+          as JSON lines, in addition to the listeners of `events`. Defaults to `None`.
+        - `image_sizes` (`bool`): Add `width`/`height` read from the image headers, and
+          `loading="lazy"` with `decoding="async"` except for featured images, to local
+          `<img>` tags. Defaults to `False`.
+        - `memory_budget` (`int | None`): Maximum traced memory in bytes. The build stops
+          with `MemoryBudgetError` after the first phase that peaks above it. Enables
+          memory profiling. Defaults to `None`.
+        - `memory_profile` (`str | Path | None`): Trace the build with `tracemalloc` and
+          write a JSON report with the peak memory of the discovery, load, render,
+          assemble, write and finish phases, the top allocation sites and the largest
+          articles by retained memory. Notes are discovered again inside the build so
+          that discovery is measured. The load phase is reported in streaming mode
+          only; otherwise articles are loaded during discovery. The profiler is
+          available from `memory_profiler`.
+          Defaults to `None`.
+        - `minify` (`bool`): Minify written pages with `HtmlMinifier`. Bytes saved are
+          available from `html_minifier` after the build. Defaults to `False`.
+        - `precompress` (`bool`): Write `.gz` (and `.zst`) sidecar files for text outputs
+          after the build. Defaults to `False`.
+        - `render_budget` (`RenderBudget | None`): Limits of input size and render time
+          per article. Articles over budget are reported in `budget_violations` and get
+          no page, or a plain fallback page with `RenderBudget.fallback`. Defaults to
+          `None` (no limits).
+        - `sitemap` (`bool`): Write `sitemap.xml` (a sitemap index with child sitemaps
+          above 50 000 URLs). Requires `base_url`. Defaults to `False`.
+        - `search_index` (`bool`): Write a sharded client-side search index to
+          `search/` from the render pass. With `cache_dir`, term maps of unchanged
+          articles are reused. Not available for shard builds. Defaults to `False`.
+        - `shard` (`Shard | str | None`): Build only one part of the site, for example
+          `"2/4"`, selected by a stable hash of the article folder. Listings and feeds
+          are written by shard 1, and a manifest for `merge_shards()` is written to the
+          output folder. Defaults to `None` (build everything).
+        - `target` (`FileSystem | None`): File system that pages, owned files and theme
+          assets are written to, for example a `MemoryFileSystem`. Listing pages are
+          written there too; other site-wide outputs (search index, feeds, sidecars and
+          shard manifests) are only supported on the local disk. Defaults to `None`
+          (local disk).
+        - `taxonomy_pages` (`bool`): Write listing pages `categories/<name>/index.html` and
+          `tags/<name>/index.html` from `taxonomy`. Defaults to `False`. The `related-id`
+          series block is added to articles regardless of this flag.
 
         Returns:
 
@@ -147,30 +456,130 @@ class StaticSiteGenerator:
         ```
 
         """
-        if html_folder is not None:
-            self.html_folder = html_folder
-        if theme_dir is not None:
-            self._theme_dir = Path(theme_dir)
-        if self.html_folder is None:
-            return self
+        with (
+            self._build_events(event_log),
+            self._profile_memory(memory_profile, memory_budget),
+            self._open_archive(archive, html_folder, target) as build_target,
+        ):
+            if not self._start_build(
+                html_folder,
+                theme_dir,
+                atom_feeds=atom_feeds,
+                base_url=base_url,
+                check_links=check_links,
+                image_sizes=image_sizes,
+                minify=minify,
+                precompress=precompress,
+                render_budget=render_budget,
+                search_index=search_index,
+                shard=shard,
+                sitemap=sitemap,
+                target=build_target,
+                taxonomy_pages=taxonomy_pages,
+            ):
+                return self
+            try:
+                for source in self._build_sources():
+                    # Outside streaming mode every article was loaded during discovery
+                    with self._memory_phase("load") if self._streaming else nullcontext():
+                        article = self._load_source(source)
+                    self._generate_article(article)
+            finally:
+                self._stop_render_guard()
+            with self._memory_phase("finish"):
+                self._finish_build()
+        return self
 
-        self._clear_html_folder_directory()
+    async def generate_site_async(
+        self,
+        html_folder: str | Path | None = None,
+        theme_dir: str | Path | None = None,
+        *,
+        atom_feeds: bool = False,
+        base_url: str | None = None,
+        check_links: bool = False,
+        concurrency: int = PIPELINE_CONCURRENCY,
+        event_log: str | Path | None = None,
+        image_sizes: bool = False,
+        minify: bool = False,
+        precompress: bool = False,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        render_budget: RenderBudget | None = None,
+        search_index: bool = False,
+        shard: Shard | str | None = None,
+        sitemap: bool = False,
+        target: FileSystem | None = None,
+        taxonomy_pages: bool = False,
+    ) -> StaticSiteGenerator:
+        """Generate the site like `generate_site()` with reads, renders and writes overlapped.
 
-        assembler = None
-        if self._theme_dir is not None:
-            assembler = PageAssembler(self._theme_dir)
-            assembler.copy_assets_to(self.html_folder)
-
-        for article in self.articles:
-            parts = list(article.md_filename.parts[len(self.md_folder.parts) : -1])
-            html_folder_article = self.html_folder / "/".join(parts)
-            html_folder_article.mkdir(parents=True, exist_ok=True)
-            article.generate_html(
-                html_folder_article,
-                page_assembler=assembler,
-                site_root=self.html_folder if assembler is not None else None,
-            )
+        Notes are read and pages (with the files they own) are written in a thread
+        pool, while rendering runs in one more thread, so slow storage does not leave
+        the renderer idle. The output is the same as from `generate_site()`.
+        Counters and queue depths are available from `pipeline_stats` afterwards.
+
+        Args:
+
+        - `concurrency` (`int`): Number of I/O threads, that is, of notes read and
+          pages written at the same time. Defaults to `8`.
+        - `queue_size` (`int`): Capacity of the queues between stages; bounds the
+          number of loaded articles and rendered pages held in memory. Defaults to `32`.
+
+        Other arguments are the same as for `generate_site()`.
+
+        Returns:
+
+        - `StaticSiteGenerator`: Returns itself.
+
+        Example:
+
+        ```python
+        import asyncio
+
+        import harrix_pyssg as hsg
 
+        sg = hsg.StaticSiteGenerator("./tests/data", streaming=True)
+        asyncio.run(sg.generate_site_async("./build_site", concurrency=4))
+        print(sg.pipeline_stats.render_queue.max_depth)
+        ```
+
+        """
+        if isinstance(target, ArchiveFileSystem):
+            msg = "archive targets are written in build order and need generate_site()"
+            raise TypeError(msg)
+        with self._build_events(event_log):
+            started = await asyncio.to_thread(
+                self._start_build,
+                html_folder,
+                theme_dir,
+                atom_feeds=atom_feeds,
+                base_url=base_url,
+                check_links=check_links,
+                image_sizes=image_sizes,
+                minify=minify,
+                precompress=precompress,
+                render_budget=render_budget,
+                search_index=search_index,
+                shard=shard,
+                sitemap=sitemap,
+                target=target,
+                taxonomy_pages=taxonomy_pages,
+            )
+            if not started:
+                return self
+            try:
+                self._pipeline_stats = await run_pipeline(
+                    self._build_sources(),
+                    load=self._load_source,
+                    render=self._render_article,
+                    write=self._write_article,
+                    after_write=self._record_article,
+                    concurrency=concurrency,
+                    queue_size=queue_size,
+                )
+            finally:
+                self._stop_render_guard()
+            await asyncio.to_thread(self._finish_build)
         return self
 
     @property
@@ -214,6 +623,54 @@ class StaticSiteGenerator:
     def html_folder(self, new_value: str | Path) -> None:
         self._html_folder = Path(new_value)
 
+    @property
+    def html_minifier(self) -> HtmlMinifier | None:
+        """Minifier used by the last `generate_site(minify=True)` call.
+
+        Returns:
+
+        - `HtmlMinifier | None`: Minifier with `pages` and `bytes_saved` counters, or `None`.
+
+        Example:
+
+        ```python
+        import harrix_pyssg as hsg
+
+        sg = hsg.StaticSiteGenerator("./tests/data")
+        sg.generate_site("./build_site", minify=True)
+        print(sg.html_minifier.bytes_saved)
+        ```
+
+        """
+        return self._html_minifier
+
+    def iter_articles(self) -> Iterator[hsg.Article]:
+        """Iterate over all articles.
+
+        In streaming mode each article is loaded from disk on demand and is not
+        kept by the generator, so memory stays flat for large sites.
+
+        Yields:
+
+        - `hsg.Article`: Loaded article.
+
+        Example:
+
+        ```python
+        import harrix_pyssg as hsg
+
+        sg = hsg.StaticSiteGenerator("./tests/data", streaming=True)
+        for article in sg.iter_articles():
+            print(article.md_filename)
+        ```
+
+        """
+        if not self._streaming:
+            yield from self._articles
+            return
+        for md_filename in self._iter_md_filenames():
+            yield hsg.Article(md_filename, events=self._events, filesystem=self._source)
+
     @property
     def md_folder(self) -> Path:
         r"""Folder with Markdown files (only getter).
@@ -236,6 +693,86 @@ class StaticSiteGenerator:
         """
         return self._md_folder.absolute()
 
+    @property
+    def memory_profiler(self) -> MemoryProfiler | None:
+        """Memory profiler of the last build with `memory_profile` or `memory_budget`.
+
+        Returns:
+
+        - `MemoryProfiler | None`: Phase peaks, allocation sites and article sizes, or
+          `None` when no build was profiled.
+
+        Example:
+
+        ```python
+        import harrix_pyssg as hsg
+
+        sg = hsg.StaticSiteGenerator("./tests/data")
+        sg.generate_site("./build_site", memory_profile="./memory.json")
+        print(sg.memory_profiler.largest_articles())
+        ```
+
+        """
+        return self._memory_profiler
+
+    @property
+    def pipeline_stats(self) -> PipelineStats | None:
+        """Counters, stage timings and queue depths of the last `generate_site_async()`.
+
+        Returns:
+
+        - `PipelineStats | None`: Statistics, or `None` before the first async build.
+
+        Example:
+
+        ```python
+        import asyncio
+
+        import harrix_pyssg as hsg
+
+        sg = hsg.StaticSiteGenerator("./tests/data")
+        asyncio.run(sg.generate_site_async("./build_site"))
+        stats = sg.pipeline_stats
+        print(stats.items, stats.render_queue.mean_depth, stats.write_queue.max_depth)
+        ```
+
+        """
+        return self._pipeline_stats
+
+    @property
+    def search_index(self) -> SearchIndex | None:
+        """Search index of the last `generate_site(search_index=True)` call.
+
+        Returns:
+
+        - `SearchIndex | None`: Index with `tokenized`/`reused` counters, or `None`.
+
+        """
+        return self._search_index
+
+    @property
+    def taxonomy(self) -> TaxonomyIndex:
+        """Index of categories, tags and `related-id` series built during discovery.
+
+        Articles with `published: false` are not indexed.
+
+        Returns:
+
+        - `TaxonomyIndex`: Site-wide taxonomy index.
+
+        Example:
+
+        ```python
+        import harrix_pyssg as hsg
+
+        sg = hsg.StaticSiteGenerator("./tests/data")
+        for tag in sg.taxonomy.terms("tags"):
+            print(tag, sg.taxonomy.handles("tags", tag))
+        ```
+
+        """
+        return self._taxonomy
+
     @property
     def theme_dir(self) -> Path | None:
         """Sliced theme directory used for full-page generation.
@@ -247,19 +784,524 @@ class StaticSiteGenerator:
         """
         return self._theme_dir.resolve() if self._theme_dir is not None else None
 
+    def update_article(self, md_filename: str | Path) -> set[tuple[str, str]]:
+        """Reload one changed Markdown file and regenerate only the affected pages.
+
+        The article page is rebuilt, and so are the pages of other articles in the
+        same `related-id` series and the listing pages of the categories and tags
+        whose contents changed. Call after `generate_site()`. After a build with
+        `precompress=True`, the sidecars of every rewritten file are refreshed. A
+        site built into an `archive` cannot be updated; build it again instead.
+
+        Args:
+
+        - `md_filename` (`str | Path`): Markdown file that was added or changed.
+
+        Returns:
+
+        - `set[tuple[str, str]]`: `(kind, term)` taxonomy keys that were affected.
+
+        Example:
+
+        ```python
+        import harrix_pyssg as hsg
+
+        sg = hsg.StaticSiteGenerator("./tests/data")
+        sg.generate_site("./build_site", taxonomy_pages=True)
+        sg.update_article("./tests/data/test_01/test_01.md")
+        ```
+
+        """
+        if isinstance(self._target, ArchiveFileSystem):
+            msg = "a site built into an archive cannot be updated; call generate_site() again"
+            raise TypeError(msg)
+        md_filename = Path(md_filename).absolute()
+        self._build_plan.add(md_filename)
+        article = next((item for item in self._articles if item.md_filename == md_filename), None)
+        if article is None:
+            article = hsg.Article(md_filename, events=self._events, filesystem=self._source)
+            if not self._streaming:
+                self._articles.append(article)
+        else:
+            article.load(md_filename)
+
+        meta = ArticleMeta.from_article(article, self.md_folder)
+        self._metas[meta.path] = meta
+        if meta.published:
+            affected = self._taxonomy.update(TaxonomyEntry.from_meta(meta))
+        else:
+            affected = self._taxonomy.remove(meta.handle)
+
+        if self.html_folder is None:
+            return affected
+
+        to_generate = {meta.handle}
+        for kind, term in affected:
+            if kind == "series":
+                to_generate.update(self._taxonomy.handles(kind, term))
+        rewritten: list[Path] = []
+        for item in self._articles_for_handles(to_generate):
+            rewritten.extend(self._generate_article(item, prune=True))
+        if self._taxonomy_pages:
+            self._write_listings(affected)
+            # Listings of terms that lost their last article are deleted, so their sidecars must go too
+            rewritten.extend(
+                self.html_folder / self._taxonomy.listing_path(kind, term) / "index.html"
+                for kind, term in affected
+                if kind in LISTING_KINDS
+            )
+        if self._search_index is not None and not meta.published:
+            self._search_index.remove(meta.handle)
+        rewritten.extend(self._write_search_index())
+        rewritten.extend(self._write_feeds())
+        if self._precompress:
+            self._precompressor().run(rewritten)
+        return affected
+
+    def _add_image_attributes(self, article: hsg.Article, content_html: str) -> str:
+        """Content filter that adds intrinsic sizes and lazy loading to the images of the article."""
+        if self._image_sizes is None:
+            return content_html
+        return self._image_sizes.add_attributes(content_html, article.md_filename.parent)
+
+    def _articles_for_handles(self, handles: Iterable[str]) -> Iterator[hsg.Article]:
+        """Yield articles whose folder handle is in `handles`."""
+        handles = set(handles)
+        if not self._streaming:
+            yield from (article for article in self._articles if self._handle_for(article) in handles)
+            return
+        for handle in sorted(handles):
+            md_filename = self._build_plan.owner(handle)
+            if md_filename is not None:
+                yield hsg.Article(md_filename, events=self._events, filesystem=self._source)
+
+    @contextmanager
+    def _build_events(self, event_log: str | Path | None) -> Iterator[None]:
+        """Attach a JSON-lines sink for one build and report an exception that ends it."""
+        sink = JsonLinesSink(event_log) if event_log is not None else None
+        if sink is not None:
+            self._events.add_listener(sink)
+        try:
+            yield
+        except Exception as e:
+            self._events.emit_error(e, operation="build", path=self.html_folder)
+            raise
+        finally:
+            if sink is not None:
+                self._events.remove_listener(sink)
+                sink.close()
+
+    def _build_sources(self) -> Iterator[hsg.Article | Path]:
+        """Yield loaded articles, or note paths in streaming mode, of the current build."""
+        if not self._streaming:
+            yield from self._articles
+            return
+        for handle in self._build_plan.handles:
+            if self._shard is not None and not self._shard.contains(handle):
+                continue
+            md_filename = self._build_plan.owner(handle)
+            if md_filename is not None:
+                yield md_filename
+
     def _clear_html_folder_directory(self) -> None:
         """Clear `self.html_folder` with sub-directories."""
         if self.html_folder is None:
             return
-        if self.html_folder.exists() and self.html_folder.is_dir():
-            shutil.rmtree(self.html_folder)
-        self.html_folder.mkdir(parents=True, exist_ok=True)
+        self._target.remove(self.html_folder)
+        self._target.make_folder(self.html_folder)
+
+    def _finish_build(self) -> None:
+        """Write site-wide outputs after all articles and optionally precompress the site."""
+        if self.html_folder is None:
+            return
+        if self._shard is None or self._shard.is_primary:
+            if self._taxonomy_pages:
+                self._write_listings()
+            self._write_search_index()
+            self._write_feeds()
+        if self._link_index is not None:
+            site_root = self.html_folder if isinstance(self._target, LocalFileSystem) else None
+            self._broken_links = self._link_index.check(site_root)
+
+        if self._precompress:
+            self._precompressor().run()
+
+        if self._shard is not None:
+            write_shard_manifest(
+                self._shard,
+                self.html_folder,
+                [handle for handle in self._build_plan.handles if self._shard.contains(handle)],
+                self._page_assembler.asset_dirs if self._page_assembler is not None else (),
+            )
+
+        if self._events:
+            seconds = time.perf_counter() - self._build_started
+            self._events.emit(
+                "build_finish",
+                pages=self._pages_written,
+                bytes_out=self._bytes_written,
+                seconds=seconds,
+                pages_per_second=self._pages_written / seconds if seconds > 0 else 0.0,
+            )
+
+    def _generate_article(self, article: hsg.Article, *, prune: bool = False) -> list[Path]:
+        """Generate the page of one article inside `self.html_folder`.
+
+        With `prune`, files the article no longer owns are deleted first. Returns the
+        page and the owned files that were written.
+        """
+        rendered = self._render_article(article)
+        if rendered is None or self.html_folder is None:
+            return []
+        if prune:
+            self._build_plan.remove_stale_files(rendered[0], self.html_folder, self._target)
+        with self._memory_phase("write"):
+            written = self._write_article(rendered)
+            self._record_article(written)
+        return [rendered[1], *written[1]] if written is not None else []
 
     def _get_info_about_articles(self) -> None:
-        """Get info from all Markdown files and fill the list `self.articles`."""
-        for item in filter(
-            lambda path: not any(part for part in path.parts if part.startswith(".")),
-            Path(self.md_folder).rglob("*"),
-        ):
-            if item.is_file() and item.suffix.lower() == ".md":
-                self.articles.append(hsg.Article(item))
+        """Get info from all Markdown files and fill the list `self.articles` and `self.taxonomy`.
+
+        Compact records go to `self.article_metas`; in streaming mode articles are not kept.
+        """
+        started = time.perf_counter()
+        for md_filename in self._iter_md_filenames():
+            self._build_plan.add(md_filename)
+            article = self._new_article(md_filename)
+            if not self._streaming:
+                self._articles.append(article)
+            meta = ArticleMeta.from_article(article, self.md_folder)
+            self._metas[meta.path] = meta
+            if meta.published:
+                self._taxonomy.update(TaxonomyEntry.from_meta(meta))
+        if self._events:
+            self._events.emit(
+                "discovery",
+                notes=len(self._metas),
+                published=sum(meta.published for meta in self._metas.values()),
+                seconds=time.perf_counter() - started,
+            )
+
+    def _handle_for(self, article: hsg.Article) -> str:
+        """Return the article folder relative to `self.md_folder` in POSIX form."""
+        return "/".join(article.md_filename.parts[len(self.md_folder.parts) : -1])
+
+    def _index_for_search(self, article: hsg.Article, content_html: str) -> str:
+        """Content filter that adds the rendered article to `self._search_index`."""
+        if self._search_index is not None:
+            handle = self._handle_for(article)
+            title = resolve_note_title(article.md_content, file_stem=article.md_filename.stem)
+            self._search_index.update(handle, title, f"{handle}/" if handle else "", content_html)
+        return content_html
+
+    @staticmethod
+    def _is_published(article: hsg.Article) -> bool:
+        """Return `False` for drafts with `published: false` in YAML."""
+        return article.md_yaml_dict.get("published", True) is not False
+
+    def _iter_md_filenames(self) -> Iterator[Path]:
+        """Lazily yield note files under `self.md_folder`, skipping hidden and excluded paths."""
+        if self._discovery_cache is None:
+            yield from iter_markdown_files(
+                self.md_folder, include=self._include, exclude=self._exclude, filesystem=self._source
+            )
+            return
+        yield from self._discovery_cache.iter_markdown_files(
+            self.md_folder, include=self._include, exclude=self._exclude
+        )
+        self._discovery_cache.save()
+
+    def _load_source(self, source: hsg.Article | Path) -> hsg.Article:
+        """Load a source yielded by `_build_sources()`."""
+        return source if isinstance(source, hsg.Article) else self._new_article(source)
+
+    def _memory_phase(self, name: str) -> AbstractContextManager[None]:
+        """Return the memory profiler phase `name`, or a no-op context without profiling."""
+        if self._memory_profiler is None or not self._memory_profiler.running:
+            return nullcontext()
+        return self._memory_profiler.phase(name)
+
+    def _new_article(self, md_filename: Path) -> hsg.Article:
+        """Load an article, recording its retained memory while profiling."""
+        if self._memory_profiler is None or not self._memory_profiler.running:
+            return hsg.Article(md_filename, events=self._events, filesystem=self._source)
+        before, _ = tracemalloc.get_traced_memory()
+        article = hsg.Article(md_filename, events=self._events, filesystem=self._source)
+        after, _ = tracemalloc.get_traced_memory()
+        self._memory_profiler.record_article(self._handle_for(article), after - before)
+        return article
+
+    @contextmanager
+    def _open_archive(
+        self, archive: str | Path | None, html_folder: str | Path | None, target: FileSystem | None
+    ) -> Iterator[FileSystem | None]:
+        """Yield an `ArchiveFileSystem` for `archive` that is finished after the build, or `target` as is."""
+        if archive is None:
+            yield target
+            return
+        root = html_folder if html_folder is not None else self.html_folder
+        if root is None or target is not None:
+            msg = "archive needs html_folder and cannot be combined with target"
+            raise ValueError(msg)
+        with ArchiveFileSystem(archive, root) as archive_target:
+            yield archive_target
+
+    def _precompressor(self) -> Precompressor:
+        """Return a `Precompressor` for the output folder that uses the build cache."""
+        return Precompressor(
+            self.html_folder or ".",
+            cache_dir=self.cache_dir / "precompress" if self.cache_dir is not None else None,
+        )
+
+    @contextmanager
+    def _profile_memory(self, memory_profile: str | Path | None, memory_budget: int | None) -> Iterator[None]:
+        """Trace one build with a new `MemoryProfiler`, including a fresh discovery, and write its report."""
+        if memory_profile is None and memory_budget is None:
+            yield
+            return
+        self._memory_profiler = MemoryProfiler(budget=memory_budget)
+        self._memory_profiler.start()
+        try:
+            with self._memory_profiler.phase("discovery"):
+                self._articles = []
+                self._metas = {}
+                self._build_plan = BuildPlan(self._md_folder, filesystem=self._source)
+                self._taxonomy = TaxonomyIndex()
+                self._get_info_about_articles()
+            yield
+        finally:
+            self._memory_profiler.stop()
+            if memory_profile is not None:
+                self._memory_profiler.write_report(memory_profile)
+
+    def _record_article(self, written: tuple[str, list[Path], int, str | None] | None) -> None:
+        """Update counters, the link index and events after `_write_article()`; not thread-safe."""
+        if written is None or self.html_folder is None:
+            return
+        handle, copied, bytes_out, content_html = written
+        if self._link_index is not None:
+            if content_html is not None:
+                self._link_index.add_page(handle, f"{handle}/index.html" if handle else "index.html", content_html)
+            for path in copied:
+                self._link_index.add_file(path.relative_to(self.html_folder).as_posix())
+        self._pages_written += 1
+        if self._events:
+            started, bytes_in = self._article_started.pop(handle, (time.perf_counter(), 0))
+            self._bytes_written += bytes_out
+            self._events.emit(
+                "article_finish",
+                handle=handle,
+                seconds=time.perf_counter() - started,
+                bytes_in=bytes_in,
+                bytes_out=bytes_out,
+            )
+
+    def _render_article(self, article: hsg.Article) -> tuple[str, Path, str, str | None] | None:
+        """Render the page of one article; return `(handle, html_filename, html, content_html)`.
+
+        `content_html` is the filtered article content for the link index, or `None`
+        when links are not checked; it is added by `_record_article()`, so the index
+        is only changed on one thread. Returns `None` when there is no output folder
+        or the note does not own its folder in `self.build_plan`.
+        """
+        if self.html_folder is None:
+            return None
+        handle = self._handle_for(article)
+        if self._build_plan.owner(handle) != article.md_filename:
+            return None
+        if self._shard is not None and not self._shard.contains(handle):
+            return None
+        article.html_folder = self.html_folder / handle
+        if self._events:
+            self._article_started[handle] = (time.perf_counter(), len(article.md_content.encode("utf8")))
+            self._events.emit("article_start", handle=handle, path=str(article.md_filename))
+        content_html = features = None
+        with self._memory_phase("render"):
+            if self._render_guard is not None:
+                rendered = self._render_guard.render(article, handle)
+                if isinstance(rendered, BudgetViolation):
+                    self._budget_violations.append(rendered)
+                    if not self._render_guard.budget.fallback:
+                        if self._events:
+                            self._article_started.pop(handle, None)
+                            self._events.emit("article_skipped", handle=handle, reason=rendered.reason)
+                        return None
+                    content_html, features = self._render_guard.fallback_html(article), PageFeatures()
+                else:
+                    content_html, features = rendered
+            elif self._memory_profiler is not None and self._memory_profiler.running:
+                content_html = article.get_html_code()
+        content_filters = []
+        if self._image_sizes is not None:
+            content_filters.append(self._add_image_attributes)
+        if self._search_index is not None and self._is_published(article):
+            content_filters.append(self._index_for_search)
+        linked_content: list[str] = []
+        if self._link_index is not None:
+
+            def keep_for_links(_: hsg.Article, content_html: str) -> str:
+                linked_content.append(content_html)
+                return content_html
+
+            content_filters.append(keep_for_links)
+        with self._memory_phase("assemble"):
+            html = article.render_html(
+                page_assembler=self._page_assembler,
+                site_root=self.html_folder if self._page_assembler is not None else None,
+                html_minifier=self._html_minifier,
+                append_html=self._taxonomy.series_html(handle),
+                content_filters=content_filters,
+                content_html=content_html,
+                features=features,
+            )
+        return handle, self.html_folder / handle / "index.html", html, linked_content[0] if linked_content else None
+
+    def _start_build(
+        self,
+        html_folder: str | Path | None,
+        theme_dir: str | Path | None,
+        *,
+        atom_feeds: bool,
+        base_url: str | None,
+        check_links: bool,
+        image_sizes: bool,
+        minify: bool,
+        precompress: bool,
+        render_budget: RenderBudget | None,
+        search_index: bool,
+        shard: Shard | str | None,
+        sitemap: bool,
+        target: FileSystem | None,
+        taxonomy_pages: bool,
+    ) -> bool:
+        """Apply build options, clear the output folder and copy theme assets.
+
+        Returns `False` when there is no output folder.
+        """
+        if (sitemap or atom_feeds) and base_url is None:
+            msg = "base_url is required for sitemap and Atom feeds"
+            raise ValueError(msg)
+        if isinstance(shard, str):
+            shard = Shard.parse(shard)
+        if shard is not None and search_index:
+            msg = "search_index is not supported for shard builds"
+            raise ValueError(msg)
+        if shard is not None and check_links:
+            msg = "check_links is not supported for shard builds"
+            raise ValueError(msg)
+        site_wide = search_index or sitemap or atom_feeds or precompress or shard is not None
+        if site_wide and target is not None and not isinstance(target, LocalFileSystem):
+            msg = "search index, feeds, precompression and shards need a local target"
+            raise ValueError(msg)
+        if image_sizes and not isinstance(self._source, LocalFileSystem):
+            msg = "image_sizes requires a local source"
+            raise ValueError(msg)
+        if html_folder is not None:
+            self.html_folder = html_folder
+        if theme_dir is not None:
+            self._theme_dir = Path(theme_dir)
+        if self.html_folder is None:
+            return False
+
+        self._build_started = time.perf_counter()
+        self._pages_written = 0
+        self._bytes_written = 0
+        self._article_started = {}
+        if self._events:
+            self._events.emit("build_start", html_folder=str(self.html_folder), notes=len(self._build_plan.handles))
+
+        self._target = target if target is not None else LocalFileSystem()
+        self._clear_html_folder_directory()
+        self._shard = shard
+        self._html_minifier = HtmlMinifier() if minify else None
+        self._image_sizes = ImageSizeCache() if image_sizes else None
+        self._taxonomy_pages = taxonomy_pages
+        self._base_url = base_url
+        self._sitemap = sitemap
+        self._atom_feeds = atom_feeds
+        self._precompress = precompress
+        self._search_index = None
+        if search_index:
+            self._search_index = SearchIndex()
+            if self.cache_dir is not None:
+                self._search_index.load_cache(self.cache_dir / "search-terms.json")
+
+        self._page_assembler = None
+        if self._theme_dir is not None:
+            self._page_assembler = PageAssembler(self._theme_dir)
+            self._page_assembler.copy_assets_to(self.html_folder, self._target)
+
+        self._budget_violations = []
+        self._render_guard = RenderGuard(render_budget) if render_budget is not None else None
+
+        self._link_index = None
+        self._broken_links = {}
+        if check_links:
+            self._link_index = LinkIndex()
+            for path in self._target.iter_files(self.html_folder):
+                self._link_index.add_file(path.relative_to(self.html_folder).as_posix())
+            if self._page_assembler is not None:
+                self._link_index.add_common_anchors("".join(self._page_assembler.parts.values()))
+        return True
+
+    def _stop_render_guard(self) -> None:
+        """Stop the worker process of the render budget, if any."""
+        if self._render_guard is not None:
+            self._render_guard.close()
+
+    def _write_article(
+        self, rendered: tuple[str, Path, str, str | None]
+    ) -> tuple[str, list[Path], int, str | None] | None:
+        """Copy the files owned by an article and write its rendered page.
+
+        Only writes files, so `generate_site_async()` runs it in several threads at
+        once; the result goes to `_record_article()`. Returns `(handle, copied files,
+        page bytes, content_html)`, with `0` bytes when nobody listens to events.
+        """
+        handle, html_filename, html, content_html = rendered
+        if self.html_folder is None:
+            return None
+        written = self._build_plan.copy_files(handle, self.html_folder, self._target)
+        self._target.write_text(html_filename, html)
+        return handle, written, len(html.encode("utf8")) if self._events else 0, content_html
+
+    def _write_feeds(self) -> list[Path]:
+        """Write `sitemap.xml` and Atom feeds when enabled; unchanged outputs are skipped.
+
+        Returns the written files.
+        """
+        if self.html_folder is None or self._base_url is None or not (self._sitemap or self._atom_feeds):
+            return []
+        entries = [FeedEntry.from_meta(meta, self._base_url) for meta in self.article_metas if meta.published]
+        cache_filename = self.cache_dir / "feeds.json" if self.cache_dir is not None else None
+        written: list[Path] = []
+        if self._sitemap:
+            written += write_sitemap(entries, self.html_folder, self._base_url, cache_filename=cache_filename)
+        if self._atom_feeds:
+            written += write_atom_feeds(entries, self.html_folder, self._base_url, cache_filename=cache_filename)
+        return written
+
+    def _write_listings(self, keys: set[tuple[str, str]] | None = None) -> None:
+        """Write taxonomy listing pages, all or only `keys`, like article pages."""
+        if self.html_folder is None:
+            return
+        self._taxonomy.write_listings(
+            self.html_folder,
+            keys=keys,
+            page_assembler=self._page_assembler,
+            html_minifier=self._html_minifier,
+            target=self._target,
+        )
+
+    def _write_search_index(self) -> list[Path]:
+        """Write `search/` files and the term cache when search indexing is enabled.
+
+        Returns the files of the `search/` folder.
+        """
+        if self._search_index is None or self.html_folder is None:
+            return []
+        manifest_path = self._search_index.write(self.html_folder)
+        if self.cache_dir is not None:
+            self._search_index.save_cache(self.cache_dir / "search-terms.json")
+        return sorted(manifest_path.parent.glob("*.json"))
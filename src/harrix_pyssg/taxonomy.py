@@ -0,0 +1,401 @@
+"""Site-wide index of categories, tags and `related-id` series."""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import posixpath
+import re
+from bisect import insort
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from harrix_pyssg.article_meta import ArticleMeta
+from harrix_pyssg.filesystem import FileSystem, LocalFileSystem
+from harrix_pyssg.page_assembler import asset_prefix_for, escape_html
+
+if TYPE_CHECKING:
+    from harrix_pyssg.article import Article
+    from harrix_pyssg.html_minifier import HtmlMinifier
+    from harrix_pyssg.page_assembler import PageAssembler
+
+TAXONOMY_KINDS = ("categories", "tags", "series")
+LISTING_KINDS = ("categories", "tags")
+LISTING_TITLES = {"categories": "Category", "tags": "Tag"}
+SERIES_TITLE = "Series"
+
+_SLUG_UNSAFE_RE = re.compile(r"[^\w.-]+")
+_SLUG_HASH_LENGTH = 8
+
+
+@dataclass(frozen=True, slots=True)
+class TaxonomyEntry:
+    """Compact taxonomy record of one article.
+
+    `handle` is the article folder relative to the Markdown root in POSIX form
+    (for example `en/blog/2013/kbd-style`); the page lives at `<handle>/index.html`.
+    """
+
+    handle: str
+    title: str
+    date: dt.date | None = None
+    categories: tuple[str, ...] = ()
+    tags: tuple[str, ...] = ()
+    series: str | None = None
+
+    @classmethod
+    def from_article(cls, article: Article, md_folder: str | Path) -> TaxonomyEntry:
+        """Build an entry from a loaded article.
+
+        Args:
+
+        - `article` (`Article`): Loaded article.
+        - `md_folder` (`str | Path`): Markdown root used to compute the handle.
+
+        Returns:
+
+        - `TaxonomyEntry`: Entry with title, date and terms from front matter.
+
+        """
+        return cls.from_meta(ArticleMeta.from_article(article, md_folder))
+
+    @classmethod
+    def from_meta(cls, meta: ArticleMeta) -> TaxonomyEntry:
+        """Build an entry from an article metadata record.
+
+        Args:
+
+        - `meta` (`ArticleMeta`): Metadata record of the article.
+
+        Returns:
+
+        - `TaxonomyEntry`: Entry with title, date and terms of `meta`.
+
+        """
+        return cls(
+            handle=meta.handle,
+            title=meta.title,
+            date=meta.date,
+            categories=meta.categories,
+            tags=meta.tags,
+            series=meta.series,
+        )
+
+    def terms(self, kind: str) -> tuple[str, ...]:
+        """Return the terms of this entry for a taxonomy kind.
+
+        Args:
+
+        - `kind` (`str`): One of `TAXONOMY_KINDS`.
+
+        Returns:
+
+        - `tuple[str, ...]`: Terms (the series is returned as a one-item tuple).
+
+        """
+        if kind == "series":
+            return (self.series,) if self.series is not None else ()
+        return getattr(self, kind)
+
+
+class TaxonomyIndex:
+    """Maps from category, tag and series to sorted article handles.
+
+    Handles of one term are kept sorted by `(date, title, handle)`, so listings
+    never need to scan or re-sort all articles. `update()` and `remove()` return
+    the `(kind, term)` keys whose listings changed, which is what an incremental
+    rebuild has to regenerate.
+
+    ## Usage examples
+
+    ```python
+    import harrix_pyssg as hsg
+
+    sg = hsg.StaticSiteGenerator("./tests/data")
+    print(sg.taxonomy.terms("tags"))  # ['CSS']
+    print(sg.taxonomy.handles("tags", "CSS"))  # ['test_01']
+    ```
+
+    """
+
+    def __init__(self) -> None:
+        """Create an empty index."""
+        self._entries: dict[str, TaxonomyEntry] = {}
+        self._terms: dict[str, dict[str, list[str]]] = {kind: {} for kind in TAXONOMY_KINDS}
+        self._folded: dict[str, dict[str, set[str]]] = {kind: {} for kind in LISTING_KINDS}
+
+    def __len__(self) -> int:
+        """Return the number of indexed articles."""
+        return len(self._entries)
+
+    def entry(self, handle: str) -> TaxonomyEntry | None:
+        """Return the entry for `handle`, or `None` when it is not indexed."""
+        return self._entries.get(handle)
+
+    def handles(self, kind: str, term: str) -> list[str]:
+        """Return handles of articles with `term`, oldest first.
+
+        Args:
+
+        - `kind` (`str`): One of `TAXONOMY_KINDS`.
+        - `term` (`str`): Category, tag or series id.
+
+        Returns:
+
+        - `list[str]`: Sorted article handles (a copy).
+
+        """
+        return list(self._terms[kind].get(term, ()))
+
+    def listing_path(self, kind: str, term: str) -> str:
+        """Return the folder of a listing page relative to the site root.
+
+        Args:
+
+        - `kind` (`str`): One of `LISTING_KINDS`.
+        - `term` (`str`): Category or tag.
+
+        Returns:
+
+        - `str`: POSIX path such as `tags/css`, in lower case so that case-insensitive
+          file systems see the same folders. Terms that are not safe folder names, and
+          terms that differ from another indexed term only by case, get a hash suffix,
+          so different terms never share a folder (`tags/c-1a2b3c4d` for `C++`) and `.`
+          or `..` cannot leave `tags/`.
+
+        """
+        shared = len(self._folded.get(kind, {}).get(term.casefold(), set()) - {term}) > 0
+        return f"{kind}/{_slugify(term, shared=shared)}"
+
+    def remove(self, handle: str) -> set[tuple[str, str]]:
+        """Remove an article from the index.
+
+        Args:
+
+        - `handle` (`str`): Article handle.
+
+        Returns:
+
+        - `set[tuple[str, str]]`: `(kind, term)` keys that lost the article.
+
+        """
+        entry = self._entries.pop(handle, None)
+        if entry is None:
+            return set()
+        return _keys_of(entry) | self._unindex(entry)
+
+    def series_html(self, handle: str) -> str:
+        """Render the list of articles that share the `related-id` of `handle`.
+
+        Links are relative to the page folder of `handle`; the current article is
+        shown without a link.
+
+        Args:
+
+        - `handle` (`str`): Article handle.
+
+        Returns:
+
+        - `str`: HTML block, or `""` when the article is not part of a series.
+
+        """
+        entry = self._entries.get(handle)
+        if entry is None or entry.series is None:
+            return ""
+        members = self._terms["series"].get(entry.series, [])
+        if len(members) < 2:  # noqa: PLR2004
+            return ""
+        items = []
+        for member in members:
+            title = escape_html(self._entries[member].title)
+            if member == handle:
+                items.append(f"<li><strong>{title}</strong></li>")
+            else:
+                items.append(f'<li><a href="{_relative_url(handle, member)}">{title}</a></li>')
+        return (
+            f'<section class="h-ssg-series">\n<h2>{SERIES_TITLE}</h2>\n<ol>\n'
+            + "\n".join(items)
+            + "\n</ol>\n</section>\n"
+        )
+
+    def terms(self, kind: str) -> list[str]:
+        """Return all terms of a kind in alphabetical order.
+
+        Args:
+
+        - `kind` (`str`): One of `TAXONOMY_KINDS`.
+
+        Returns:
+
+        - `list[str]`: Sorted terms.
+
+        """
+        return sorted(self._terms[kind])
+
+    def update(self, entry: TaxonomyEntry) -> set[tuple[str, str]]:
+        """Add or replace the entry of one article.
+
+        Args:
+
+        - `entry` (`TaxonomyEntry`): New entry.
+
+        Returns:
+
+        - `set[tuple[str, str]]`: `(kind, term)` keys whose listings changed. When the
+          title or date changed, every key of the article is affected; otherwise only
+          the terms that were added or removed. Listings that move because a term
+          with the same letters in another case appeared or disappeared are included.
+
+        """
+        old = self._entries.get(entry.handle)
+        if old == entry:
+            return set()
+        old_keys: set[tuple[str, str]] = set()
+        moved: set[tuple[str, str]] = set()
+        if old is not None:
+            del self._entries[entry.handle]
+            old_keys = _keys_of(old)
+            moved = self._unindex(old)
+        self._entries[entry.handle] = entry
+        new_keys = _keys_of(entry)
+        for kind, term in new_keys:
+            handles = self._terms[kind].get(term)
+            if handles is None:
+                handles = self._terms[kind][term] = []
+                moved |= self._fold(kind, term)
+            insort(handles, entry.handle, key=lambda handle: _sort_key(self._entries[handle]))
+        if old is not None and (old.title, old.date) == (entry.title, entry.date):
+            return (old_keys ^ new_keys) | moved
+        return old_keys | new_keys | moved
+
+    def write_listings(
+        self,
+        html_folder: str | Path,
+        *,
+        keys: set[tuple[str, str]] | None = None,
+        page_assembler: PageAssembler | None = None,
+        html_minifier: HtmlMinifier | None = None,
+        target: FileSystem | None = None,
+    ) -> list[Path]:
+        """Write listing pages for categories and tags.
+
+        Each listing is `<html_folder>/<kind>/<term>/index.html` with the newest
+        articles first. Listings of terms that no longer exist are deleted.
+
+        Args:
+
+        - `html_folder` (`str | Path`): Site output root.
+        - `keys` (`set[tuple[str, str]] | None`): Only write these `(kind, term)` keys.
+          Defaults to `None` (all listings).
+        - `page_assembler` (`PageAssembler | None`): Theme assembler for full pages.
+          Defaults to `None` (HTML fragments).
+        - `html_minifier` (`HtmlMinifier | None`): Minifier applied to the written HTML.
+          Defaults to `None`.
+        - `target` (`FileSystem | None`): File system of the output. Defaults to `None` (local disk).
+
+        Returns:
+
+        - `list[Path]`: Written `index.html` files.
+
+        """
+        html_folder = Path(html_folder)
+        target = target if target is not None else LocalFileSystem()
+        if keys is None:
+            keys = {(kind, term) for kind in LISTING_KINDS for term in self._terms[kind]}
+        written: list[Path] = []
+        for kind, term in sorted(keys):
+            if kind not in LISTING_KINDS:
+                continue
+            listing_handle = self.listing_path(kind, term)
+            listing_dir = html_folder / listing_handle
+            html_filename = listing_dir / "index.html"
+            handles = self._terms[kind].get(term)
+            if not handles:
+                target.remove(html_filename)
+                continue
+            # The listing moves between `css` and `css-<hash>` when `CSS` appears or disappears
+            for folder in {_slugify(term), _slugify(term, shared=True)}:
+                if f"{kind}/{folder}" != listing_handle:
+                    target.remove(html_folder / kind / folder / "index.html")
+            title = f"{LISTING_TITLES[kind]}: {term}"
+            items = []
+            for handle in reversed(handles):
+                entry = self._entries[handle]
+                date_html = (
+                    f' <time datetime="{entry.date.isoformat()}">{entry.date.isoformat()}</time>' if entry.date else ""
+                )
+                url = _relative_url(listing_handle, handle)
+                items.append(f'<li><a href="{url}">{escape_html(entry.title)}</a>{date_html}</li>')
+            content_html = f"<h1>{escape_html(title)}</h1>\n<ul>\n" + "\n".join(items) + "\n</ul>\n"
+            if page_assembler is not None:
+                html = page_assembler.assemble(
+                    content_html=content_html,
+                    title=title,
+                    asset_prefix=asset_prefix_for(listing_dir, html_folder),
+                )
+            else:
+                html = content_html
+            if html_minifier is not None:
+                html = html_minifier.minify(html)
+            target.write_text(html_filename, html)
+            written.append(html_filename)
+        return written
+
+    def _fold(self, kind: str, term: str) -> set[tuple[str, str]]:
+        """Register a new listing term; return keys of terms whose folder gets a hash suffix now."""
+        if kind not in self._folded:
+            return set()
+        group = self._folded[kind].setdefault(term.casefold(), set())
+        group.add(term)
+        return {(kind, other) for other in group if other != term} if len(group) == 2 else set()  # noqa: PLR2004
+
+    def _unindex(self, entry: TaxonomyEntry) -> set[tuple[str, str]]:
+        """Remove the handle of `entry` from its terms; return keys of listings that moved."""
+        moved: set[tuple[str, str]] = set()
+        for kind, term in _keys_of(entry):
+            handles = self._terms[kind][term]
+            handles.remove(entry.handle)
+            if handles:
+                continue
+            del self._terms[kind][term]
+            if kind not in self._folded:
+                continue
+            group = self._folded[kind][term.casefold()]
+            group.discard(term)
+            if not group:
+                del self._folded[kind][term.casefold()]
+            elif len(group) == 1:
+                moved |= {(kind, other) for other in group}
+        return moved
+
+
+def _keys_of(entry: TaxonomyEntry) -> set[tuple[str, str]]:
+    """Return all `(kind, term)` keys of an entry."""
+    return {(kind, term) for kind in TAXONOMY_KINDS for term in entry.terms(kind)}
+
+
+def _relative_url(from_handle: str, to_handle: str) -> str:
+    """Build a relative folder URL between two page handles."""
+    relative = posixpath.relpath(to_handle or ".", from_handle or ".")
+    return "./" if relative == "." else f"{relative}/"
+
+
+def _slugify(term: str, *, shared: bool = False) -> str:
+    """Turn a term into a lower-case safe folder name.
+
+    Changed, dot-only and `shared` terms (another term folds to the same name) get a
+    hash suffix of the original term, so different terms never share a folder.
+    """
+    folded = term.casefold()
+    slug = _SLUG_UNSAFE_RE.sub("-", folded).strip("-")
+    if slug == folded and slug.strip(".") and not shared:
+        return slug
+    digest = hashlib.sha256(term.encode("utf8")).hexdigest()[:_SLUG_HASH_LENGTH]
+    slug = slug.strip(".-")
+    return f"{slug}-{digest}" if slug else digest
+
+
+def _sort_key(entry: TaxonomyEntry | ArticleMeta) -> tuple[dt.date, str, str]:
+    """Sort key: oldest first, undated entries first, then title and handle."""
+    return (entry.date or dt.date.min, entry.title.casefold(), entry.handle)
@@ -2,15 +2,28 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 import re
 import shutil
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
 
 PLACEHOLDER_TITLE = "{{H_SSG_TITLE}}"
 PLACEHOLDER_CONTENT = "{{H_SSG_CONTENT}}"
 PLACEHOLDER_OPTIONAL_HEAD = "{{H_SSG_OPTIONAL_HEAD}}"
 PLACEHOLDER_OPTIONAL_SCRIPTS = "{{H_SSG_OPTIONAL_SCRIPTS}}"
+PLACEHOLDERS = {
+    "title": PLACEHOLDER_TITLE,
+    "content": PLACEHOLDER_CONTENT,
+    "optional_head": PLACEHOLDER_OPTIONAL_HEAD,
+    "optional_scripts": PLACEHOLDER_OPTIONAL_SCRIPTS,
+}
 
 MARKER_OPTIONAL_HEAD = "<!-- h-ssg:optional-head -->"
 MARKER_OPTIONAL_SCRIPTS = "<!-- h-ssg:optional-scripts -->"
@@ -20,6 +33,7 @@ MARKER_CONTENT_START = "<!-- h-ssg:content-start -->"
 MARKER_CONTENT_END = "<!-- h-ssg:content-end -->"
 MARKER_CHROME_FOOTER_START = "<!-- h-ssg:chrome-footer-start -->"
 MARKER_CHROME_FOOTER_END = "<!-- h-ssg:chrome-footer-end -->"
+MARKER_FEATURE = "<!-- h-ssg:feature {name} -->"
 
 OPTIONAL_ASSET_PATTERNS: dict[str, re.Pattern[str]] = {
     "katex_css": re.compile(r"""<link\b[^>]*href=["'][^"']*katex/katex\.css["'][^>]*/?>""", re.IGNORECASE),
@@ -31,16 +45,84 @@ OPTIONAL_ASSET_PATTERNS: dict[str, re.Pattern[str]] = {
     ),
 }
 
+FEATURE_ASSETS: dict[str, dict[str, tuple[str, ...]]] = {
+    "katex": {"head": ("katex_css",), "scripts": ("katex_js",)},
+    "stl": {"head": ("stl_css",), "scripts": ("stl_js",)},
+}
+
 ASSET_DIRS = ("css", "js", "fonts", "favicon", "img", "images", "katex", "charts")
+FINGERPRINT_SUFFIXES = (".css", ".js")
+FINGERPRINT_LENGTH = 8
+PART_NAMES = ("head", "body_open", "chrome_header", "main", "chrome_footer", "scripts", "document_end")
+
+THEME_BUNDLE = "bundle.json"
+THEME_BUNDLE_VERSION = 1
 
 _TITLE_RE = re.compile(r"(<title>)(.*?)(</title>)", re.IGNORECASE | re.DOTALL)
 _BODY_OPEN_RE = re.compile(r"<body\b[^>]*>", re.IGNORECASE)
 _MAIN_RE = re.compile(r"<main\b[^>]*>.*?</main>", re.IGNORECASE | re.DOTALL)
+_FEATURE_TAG_RE = re.compile(
+    r"<!--\s*h-ssg:feature\s+([\w-]+)\s*-->\s*(<link\b[^>]*>|<(script|style)\b[^>]*>.*?</\3>)",
+    re.IGNORECASE | re.DOTALL,
+)
+_STYLESHEET_RE = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+_SCRIPT_SRC_RE = re.compile(r"<script\b([^>]*)>\s*</script>", re.IGNORECASE)
+_CSS_URL_RE = re.compile(r"""url\(\s*["']?(?!data:|https?:|/|#)""", re.IGNORECASE)
+_REFERENCE_RE = re.compile(r"""\b(href|src)=(["'])(\.?/)?([^"'?#]+)""", re.IGNORECASE)
+_PLACEHOLDER_RE = re.compile("|".join(re.escape(placeholder) for placeholder in PLACEHOLDERS.values()))
+_PLACEHOLDER_SLOTS = {placeholder: slot for slot, placeholder in PLACEHOLDERS.items()}
+
+
+@dataclass
+class SliceStats:
+    """What one `ThemeSlicer.slice()` call did."""
+
+    parts_sliced: bool = False
+    assets_copied: int = 0
+    assets_removed: int = 0
+    assets_unchanged: int = 0
+
+    @property
+    def changed(self) -> bool:
+        """`True` when the theme folder was modified."""
+        return self.parts_sliced or bool(self.assets_copied or self.assets_removed)
 
 
 class ThemeSlicer:
     """Cut a built HTML template page into reusable theme parts and assets.
 
+    The SHA-256 of the source HTML and of every asset file is stored in
+    `manifest.json`. Slicing again with unchanged inputs does not touch the theme
+    folder; otherwise parts are re-sliced only when the HTML changed and only the
+    changed or removed asset files are synced. `stats` reports what was done.
+
+    With `fingerprint=True` CSS and JS files get the start of their content hash
+    in the name (`css/app.css` → `css/app.1a2b3c4d.css`) and the parts reference
+    the new names, so the site can serve them with immutable cache headers. The
+    mapping is stored in `manifest.json` under `fingerprints`.
+
+    With `inline_max_size` stylesheets and classic (not `defer`, `async` or
+    module) scripts of the theme up to that many bytes are inlined into the parts
+    as `<style>` and `<script>` elements, saving a request per file on the first
+    page view. Stylesheets with relative `url(…)` references stay external, since
+    those URLs are relative to the stylesheet. Inlined files are listed in
+    `manifest.json` under `inlined`.
+
+    ## Optional feature assets
+
+    Tags that only some pages need are cut out of the chrome into optional parts,
+    and `manifest.json` maps each feature to them under `features`. Mark such a tag
+    in the template with a comment right before it; tags in `<head>` are added to
+    the head of pages with the feature, the others before `</body>`:
+
+    ```html
+    <!-- h-ssg:feature mermaid -->
+    <script defer src="./js/mermaid/mermaid.js"></script>
+    ```
+
+    KaTeX and STL viewer tags are also recognised without markers
+    (`OPTIONAL_ASSET_PATTERNS`, `FEATURE_ASSETS`).
+
     ## Usage examples
 
     ```python
@@ -52,12 +134,14 @@ class ThemeSlicer:
         source_html="article.html",
     )
     slicer.slice()
+    print(slicer.stats)
     ```
 
     ## Output layout
 
     ```text
     theme/
+    ├─ bundle.json
     ├─ manifest.json
     ├─ parts/
     │  ├─ head.html
@@ -71,7 +155,8 @@ class ThemeSlicer:
     │     ├─ katex_css.html
     │     ├─ katex_js.html
     │     ├─ stl_css.html
-    │     └─ stl_js.html
+    │     ├─ stl_js.html
+    │     └─ <feature>_head.html, <feature>_scripts.html
     ├─ css/
     ├─ js/
     └─ …
@@ -84,6 +169,9 @@ class ThemeSlicer:
         dist_dir: str | Path,
         theme_dir: str | Path,
         source_html: str = "article.html",
+        *,
+        fingerprint: bool = False,
+        inline_max_size: int = 0,
     ) -> None:
         """Prepare paths for slicing a built template.
 
@@ -94,15 +182,30 @@ class ThemeSlicer:
         - `theme_dir` (`str | Path`): Output folder for sliced theme parts and assets.
         - `source_html` (`str`): HTML page used as the article shell. Defaults to
           `article.html`.
+        - `fingerprint` (`bool`): Put content hashes into CSS and JS file names.
+          Defaults to `False`.
+        - `inline_max_size` (`int`): Inline CSS and JS files up to this many bytes
+          into the parts. Defaults to `0` (no inlining).
 
         """
         self.dist_dir = Path(dist_dir)
         self.theme_dir = Path(theme_dir)
         self.source_html = source_html
+        self.fingerprint = fingerprint
+        self.inline_max_size = inline_max_size
+        self.stats = SliceStats()
 
-    def slice(self) -> Path:
+    def slice(self, *, force: bool = False) -> Path:
         """Slice the built template into theme parts and copy assets.
 
+        The parts, optional parts and manifest are also compiled into
+        `bundle.json` (see `compile_theme_bundle()`).
+
+        Args:
+
+        - `force` (`bool`): Clear `theme_dir` and slice from scratch even when the
+          inputs are unchanged. Defaults to `False`.
+
         Returns:
 
         - `Path`: Absolute path to the created theme directory.
@@ -114,52 +217,68 @@ class ThemeSlicer:
             raise FileNotFoundError(msg)
 
         html = source_path.read_text(encoding="utf8")
-        if MARKER_CONTENT_START not in html or MARKER_CONTENT_END not in html:
-            msg = f"{source_path} has no h-ssg content markers. Rebuild Harrix-HTML-Template after adding SSG markers."
-            raise ValueError(msg)
-
-        optional_tags = self._extract_optional_tags(html)
-        html_without_optional = html
-        for tag_html in optional_tags.values():
-            if tag_html:
-                html_without_optional = html_without_optional.replace(tag_html, "", 1)
-
-        parts = self._split_parts(html_without_optional)
-
-        if self.theme_dir.exists():
+        inputs = {
+            "source_html": hashlib.sha256(html.encode("utf8")).hexdigest(),
+            "assets": self._hash_assets(),
+            "options": {"fingerprint": self.fingerprint, "inline_max_size": self.inline_max_size},
+        }
+        fingerprints = {
+            relative: target
+            for relative, digest in inputs["assets"].items()
+            if (target := self._asset_target(relative, digest)) != relative
+        }
+        previous = {} if force else self._read_manifest()
+        old_inputs = previous.get("inputs", {})
+        if previous.get("source_html") != self.source_html or old_inputs.get("options") != inputs["options"]:
+            old_inputs = {}
+        if not old_inputs and self.theme_dir.exists():
             shutil.rmtree(self.theme_dir)
-        parts_dir = self.theme_dir / "parts"
-        optional_dir = parts_dir / "optional"
-        optional_dir.mkdir(parents=True, exist_ok=True)
-
-        for name, content in parts.items():
-            (parts_dir / f"{name}.html").write_text(content, encoding="utf8")
-
-        for name, tag_html in optional_tags.items():
-            (optional_dir / f"{name}.html").write_text(
-                tag_html.strip() + ("\n" if tag_html.strip() else ""), encoding="utf8"
-            )
 
-        self._copy_assets()
-
-        manifest = {
-            "source_html": self.source_html,
-            "parts": list(parts.keys()),
-            "optional": list(OPTIONAL_ASSET_PATTERNS.keys()),
-            "asset_dirs": [name for name in ASSET_DIRS if (self.dist_dir / name).exists()],
-            "placeholders": {
-                "title": PLACEHOLDER_TITLE,
-                "content": PLACEHOLDER_CONTENT,
-                "optional_head": PLACEHOLDER_OPTIONAL_HEAD,
-                "optional_scripts": PLACEHOLDER_OPTIONAL_SCRIPTS,
-            },
-        }
-        (self.theme_dir / "manifest.json").write_text(
-            json.dumps(manifest, ensure_ascii=False, indent=2) + "\n",
-            encoding="utf8",
-        )
+        stats = SliceStats()
+        parts_dir = self.theme_dir / "parts"
+        if (
+            old_inputs.get("source_html") != inputs["source_html"]
+            or previous.get("fingerprints", {}) != fingerprints
+            or (self.inline_max_size > 0 and old_inputs.get("assets") != inputs["assets"])
+            or "features" not in previous
+            or not parts_dir.is_dir()
+        ):
+            layout = self._write_parts(html, source_path, fingerprints)
+            stats.parts_sliced = True
+        else:
+            layout = {key: previous.get(key, []) for key in ("optional", "features", "inlined")}
+        self._sync_assets(old_inputs.get("assets", {}), inputs["assets"], stats)
+        self.stats = stats
+
+        manifest_path = self.theme_dir / "manifest.json"
+        if stats.changed or not manifest_path.is_file():
+            manifest = {
+                "source_html": self.source_html,
+                "parts": list(PART_NAMES),
+                "optional": layout["optional"],
+                "features": layout["features"],
+                "asset_dirs": [name for name in ASSET_DIRS if (self.dist_dir / name).exists()],
+                "placeholders": PLACEHOLDERS,
+                "fingerprints": fingerprints,
+                "inlined": layout["inlined"],
+                "inputs": inputs,
+            }
+            manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf8")
+        if stats.changed or read_theme_bundle(self.theme_dir) is None:
+            compile_theme_bundle(self.theme_dir)
         return self.theme_dir.resolve()
 
+    def _asset_target(self, relative: str, digest: str) -> str:
+        """Return the theme path of a dist asset, fingerprinted when enabled."""
+        if not self.fingerprint:
+            return relative
+        folder, _, name = relative.rpartition("/")
+        stem, dot, suffix = name.rpartition(".")
+        if not dot or not stem or f".{suffix.lower()}" not in FINGERPRINT_SUFFIXES:
+            return relative
+        name = f"{stem}.{digest[:FINGERPRINT_LENGTH]}.{suffix}"
+        return f"{folder}/{name}" if folder else name
+
     @staticmethod
     def _between(text: str, start: str, end: str, *, include_markers: bool) -> str:
         """Return the substring between two markers."""
@@ -172,12 +291,28 @@ class ThemeSlicer:
             return f"{start}{inner}{end}"
         return inner
 
-    def _copy_assets(self) -> None:
-        """Copy static asset directories from dist into the theme folder."""
-        for name in ASSET_DIRS:
-            src = self.dist_dir / name
-            if src.is_dir():
-                shutil.copytree(src, self.theme_dir / name)
+    def _extract_feature_tags(self, html: str) -> tuple[str, dict[str, str], dict[str, dict[str, list[str]]]]:
+        """Cut tags marked with `<!-- h-ssg:feature name -->` out of the page HTML.
+
+        Returns the HTML without them, the optional parts by name and the parts of
+        every marked feature in the head and before `</body>`.
+        """
+        head_end = html.lower().find("</head>")
+        tags: dict[str, list[str]] = {}
+        features: dict[str, dict[str, list[str]]] = {}
+
+        def _take(match: re.Match[str]) -> str:
+            feature = match.group(1).lower()
+            location = "head" if match.start() < head_end else "scripts"
+            part = f"{feature}_{location}"
+            tags.setdefault(part, []).append(match.group(2))
+            parts = features.setdefault(feature, {"head": [], "scripts": []})[location]
+            if part not in parts:
+                parts.append(part)
+            return ""
+
+        html = _FEATURE_TAG_RE.sub(_take, html)
+        return html, {part: "\n    ".join(part_tags) for part, part_tags in tags.items()}, features
 
     def _extract_optional_tags(self, html: str) -> dict[str, str]:
         """Find optional CSS/JS tags in the page HTML."""
@@ -187,6 +322,71 @@ class ThemeSlicer:
             found[name] = match.group(0) if match else ""
         return found
 
+    def _hash_assets(self) -> dict[str, str]:
+        """Return the SHA-256 of every file in the asset directories of dist by POSIX path."""
+        hashes: dict[str, str] = {}
+        for name in ASSET_DIRS:
+            src = self.dist_dir / name
+            if not src.is_dir():
+                continue
+            for path in sorted(src.rglob("*")):
+                if path.is_file():
+                    hashes[path.relative_to(self.dist_dir).as_posix()] = hashlib.sha256(path.read_bytes()).hexdigest()
+        return hashes
+
+    def _inline_assets(self, html: str, inlined: list[str]) -> str:
+        """Replace references to small local stylesheets and scripts with their content."""
+        if self.inline_max_size <= 0:
+            return html
+
+        def _content(reference: str | None, suffix: str) -> str | None:
+            if not reference or "://" in reference or reference.startswith("//"):
+                return None
+            relative = reference.split("?", 1)[0].split("#", 1)[0].removeprefix("./").lstrip("/")
+            path = self.dist_dir / relative
+            if relative.split("/", 1)[0] not in ASSET_DIRS or not relative.lower().endswith(suffix):
+                return None
+            try:
+                if path.stat().st_size > self.inline_max_size:
+                    return None
+                content = path.read_text(encoding="utf8")
+            except (OSError, UnicodeDecodeError):
+                return None
+            if relative not in inlined:
+                inlined.append(relative)
+            return content.strip()
+
+        def _style(match: re.Match[str]) -> str:
+            tag = match.group(0)
+            if (_attribute(tag, "rel") or "").lower() != "stylesheet":
+                return tag
+            content = _content(_attribute(tag, "href"), ".css")
+            if content is None or _CSS_URL_RE.search(content):
+                return tag
+            media = _attribute(tag, "media")
+            media_attr = f' media="{media}"' if media else ""
+            return f"<style{media_attr}>{_escape_end_tag(content, 'style')}</style>"
+
+        def _script(match: re.Match[str]) -> str:
+            attrs = match.group(1)
+            if re.search(r"\b(?:defer|async)\b", attrs, re.IGNORECASE) or (_attribute(attrs, "type") or "") == "module":
+                return match.group(0)
+            content = _content(_attribute(attrs, "src"), ".js")
+            if content is None:
+                return match.group(0)
+            return f"<script>{_escape_end_tag(content, 'script')}</script>"
+
+        html = _STYLESHEET_RE.sub(_style, html)
+        return _SCRIPT_SRC_RE.sub(_script, html)
+
+    def _read_manifest(self) -> dict:
+        """Return the manifest of the previous slice, or `{}` when there is none."""
+        try:
+            manifest = json.loads((self.theme_dir / "manifest.json").read_text(encoding="utf8"))
+        except (OSError, ValueError):
+            return {}
+        return manifest if isinstance(manifest, dict) else {}
+
     def _split_parts(self, html: str) -> dict[str, str]:
         """Split page HTML into named theme parts with placeholders."""
         head_end = re.search(r"</head>", html, re.IGNORECASE)
@@ -262,3 +462,216 @@ class ThemeSlicer:
             "scripts": scripts.strip() + "\n",
             "document_end": document_end,
         }
+
+    def _sync_assets(self, old_assets: dict[str, str], assets: dict[str, str], stats: SliceStats) -> None:
+        """Copy new and changed asset files into the theme folder and delete removed ones."""
+        targets: set[str] = set()
+        for relative, digest in assets.items():
+            target_relative = self._asset_target(relative, digest)
+            targets.add(target_relative)
+            target = self.theme_dir / target_relative
+            if old_assets.get(relative) == digest and target.is_file():
+                stats.assets_unchanged += 1
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(self.dist_dir / relative, target)
+            stats.assets_copied += 1
+        old_targets = {self._asset_target(relative, digest) for relative, digest in old_assets.items()}
+        for target_relative in sorted(old_targets - targets):
+            target = self.theme_dir / target_relative
+            target.unlink(missing_ok=True)
+            stats.assets_removed += 1
+            folder = target.parent
+            while folder != self.theme_dir and folder.is_dir() and not any(folder.iterdir()):
+                folder.rmdir()
+                folder = folder.parent
+
+    def _write_parts(self, html: str, source_path: Path, fingerprints: dict[str, str]) -> dict:
+        """Slice `html` and replace the `parts` folder of the theme, pointing references to `fingerprints`.
+
+        Returns the `optional`, `features` and `inlined` entries of the manifest.
+        """
+        if MARKER_CONTENT_START not in html or MARKER_CONTENT_END not in html:
+            msg = f"{source_path} has no h-ssg content markers. Rebuild Harrix-HTML-Template after adding SSG markers."
+            raise ValueError(msg)
+
+        html_without_optional, feature_tags, marked_features = self._extract_feature_tags(html)
+        optional_tags = self._extract_optional_tags(html_without_optional)
+        for tag_html in optional_tags.values():
+            if tag_html:
+                html_without_optional = html_without_optional.replace(tag_html, "", 1)
+        optional_tags.update(feature_tags)
+        features = {
+            name: {location: list(parts) for location, parts in entry.items()} for name, entry in FEATURE_ASSETS.items()
+        }
+        for name, entry in marked_features.items():
+            merged = features.setdefault(name, {"head": [], "scripts": []})
+            for location, parts in entry.items():
+                merged[location].extend(parts)
+
+        parts = self._split_parts(html_without_optional)
+        inlined: list[str] = []
+        parts = {name: self._inline_assets(content, inlined) for name, content in parts.items()}
+        optional_tags = {name: self._inline_assets(tag, inlined) for name, tag in optional_tags.items()}
+        if fingerprints:
+            parts = {name: _rewrite_references(content, fingerprints) for name, content in parts.items()}
+            optional_tags = {name: _rewrite_references(tag, fingerprints) for name, tag in optional_tags.items()}
+
+        parts_dir = self.theme_dir / "parts"
+        if parts_dir.exists():
+            shutil.rmtree(parts_dir)
+        optional_dir = parts_dir / "optional"
+        optional_dir.mkdir(parents=True, exist_ok=True)
+
+        for name, content in parts.items():
+            (parts_dir / f"{name}.html").write_text(content, encoding="utf8")
+
+        for name, tag_html in optional_tags.items():
+            (optional_dir / f"{name}.html").write_text(
+                tag_html.strip() + ("\n" if tag_html.strip() else ""), encoding="utf8"
+            )
+        return {"optional": list(optional_tags), "features": features, "inlined": sorted(inlined)}
+
+
+def compile_theme_bundle(theme_dir: str | Path) -> Path:
+    """Compile the parts, optional parts and manifest of a sliced theme into `bundle.json`.
+
+    `PageAssembler` loads the bundle with a single read instead of reading every
+    part file. The bundle also holds the page chrome pre-split at the placeholders
+    and the mtime and size of every source file, so a bundle that is older than
+    the parts is detected with a few `stat` calls and ignored. Run this again after
+    editing the parts by hand.
+
+    Args:
+
+    - `theme_dir` (`str | Path`): Folder created by `ThemeSlicer.slice()`.
+
+    Returns:
+
+    - `Path`: Path to the written bundle.
+
+    Example:
+
+    ```python
+    import harrix_pyssg as hsg
+
+    hsg.compile_theme_bundle("./theme")
+    ```
+
+    """
+    theme_dir = Path(theme_dir)
+    parts_dir = theme_dir / "parts"
+    optional_names = sorted(path.stem for path in (parts_dir / "optional").glob("*.html") if path.is_file())
+    sources = [
+        *(f"parts/{name}.html" for name in PART_NAMES),
+        "parts/optional",
+        *(f"parts/optional/{name}.html" for name in optional_names),
+        "manifest.json",
+    ]
+    # Stamp before reading, so an edit made while compiling marks the bundle stale.
+    stamps = _source_stamps(theme_dir, sources)
+    parts = {name: (parts_dir / f"{name}.html").read_text(encoding="utf8") for name in PART_NAMES}
+    optional = {
+        name: (parts_dir / "optional" / f"{name}.html").read_text(encoding="utf8").strip() for name in optional_names
+    }
+    manifest_path = theme_dir / "manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf8")) if manifest_path.is_file() else {}
+    segments, slots = split_segments("".join(parts[name] for name in PART_NAMES))
+    bundle = {
+        "version": THEME_BUNDLE_VERSION,
+        "sources": stamps,
+        "manifest": manifest,
+        "parts": parts,
+        "optional": optional,
+        "segments": segments,
+        "slots": slots,
+    }
+    path = theme_dir / THEME_BUNDLE
+    path.write_text(json.dumps(bundle, ensure_ascii=False, separators=(",", ":")), encoding="utf8")
+    return path
+
+
+def read_theme_bundle(theme_dir: str | Path) -> dict | None:
+    """Read the compiled bundle of a theme if it is up to date.
+
+    Args:
+
+    - `theme_dir` (`str | Path`): Folder created by `ThemeSlicer.slice()`.
+
+    Returns:
+
+    - `dict | None`: Bundle, or `None` when it is missing, broken, of another
+      version or older than one of its source files.
+
+    """
+    theme_dir = Path(theme_dir)
+    try:
+        bundle = json.loads((theme_dir / THEME_BUNDLE).read_text(encoding="utf8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(bundle, dict) or bundle.get("version") != THEME_BUNDLE_VERSION:
+        return None
+    sources = bundle.get("sources")
+    if not isinstance(sources, dict) or _source_stamps(theme_dir, sources) != sources:
+        return None
+    return bundle
+
+
+def split_segments(chrome: str) -> tuple[list[str], list[str]]:
+    """Split page chrome at the placeholders.
+
+    Args:
+
+    - `chrome` (`str`): Concatenated theme parts with placeholders.
+
+    Returns:
+
+    - `tuple[list[str], list[str]]`: Literal segments and the slot names between them
+      (`title`, `content`, `optional_head`, `optional_scripts`); there is always one
+      segment more than slots.
+
+    """
+    segments: list[str] = []
+    slots: list[str] = []
+    position = 0
+    for match in _PLACEHOLDER_RE.finditer(chrome):
+        segments.append(chrome[position : match.start()])
+        slots.append(_PLACEHOLDER_SLOTS[match.group(0)])
+        position = match.end()
+    segments.append(chrome[position:])
+    return segments, slots
+
+
+def _source_stamps(theme_dir: Path, sources: Iterable[str]) -> dict[str, list[int] | None]:
+    """Return `[mtime_ns, size]` of theme files relative to `theme_dir`, `None` for missing ones."""
+    theme_str = os.fspath(theme_dir)
+    stamps: dict[str, list[int] | None] = {}
+    for relative in sources:
+        try:
+            stat = os.stat(os.path.join(theme_str, relative))  # noqa: PTH116, PTH118
+        except OSError:
+            stamps[relative] = None
+        else:
+            stamps[relative] = [stat.st_mtime_ns, stat.st_size]
+    return stamps
+
+
+def _attribute(tag: str, name: str) -> str | None:
+    """Return the value of a quoted attribute in a tag, or `None` when it is missing."""
+    match = re.search(rf"""\b{name}\s*=\s*(["'])(.*?)\1""", tag, re.IGNORECASE | re.DOTALL)
+    return match.group(2) if match else None
+
+
+def _escape_end_tag(content: str, tag: str) -> str:
+    """Escape `</tag` in inlined content so that it cannot close the element early."""
+    return re.sub(rf"</({tag})", r"<\\/\1", content, flags=re.IGNORECASE)
+
+
+def _rewrite_references(html: str, targets: dict[str, str]) -> str:
+    """Replace `href`/`src` values that point to a key of `targets` with its value."""
+
+    def _replace(match: re.Match[str]) -> str:
+        attr, quote, prefix, path = match.groups()
+        return f"{attr}={quote}{prefix or ''}{targets.get(path, path)}"
+
+    return _REFERENCE_RE.sub(_replace, html)
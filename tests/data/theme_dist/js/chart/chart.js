@@ -0,0 +1 @@
+/* chart */
@@ -0,0 +1 @@
+/* mermaid */
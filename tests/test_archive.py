@@ -0,0 +1,55 @@
+"""Tests for building straight into deploy archives."""
+
+import tarfile
+import zipfile
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+import harrix_pyssg as hsg
+
+
+def test_generate_site_archive() -> None:
+    """Zip and tar.gz archives hold the same files as a build on disk and are reproducible."""
+    md_folder = Path(__file__).parent / "data"
+    local = hsg.LocalFileSystem()
+    with TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        hsg.StaticSiteGenerator(md_folder).generate_site(tmp_path / "site")
+        expected = {
+            path.relative_to(tmp_path / "site").as_posix(): local.read_bytes(path)
+            for path in local.iter_files(tmp_path / "site")
+        }
+        for name in ("a.zip", "b.zip", "a.tar.gz", "b.tar.gz"):
+            hsg.StaticSiteGenerator(md_folder).generate_site(tmp_path / "unused", archive=tmp_path / name)
+        assert not (tmp_path / "unused").exists()
+        assert (tmp_path / "a.zip").read_bytes() == (tmp_path / "b.zip").read_bytes()
+        assert (tmp_path / "a.tar.gz").read_bytes() == (tmp_path / "b.tar.gz").read_bytes()
+        with zipfile.ZipFile(tmp_path / "a.zip") as archive:
+            zipped = {info.filename: archive.read(info) for info in archive.infolist()}
+            assert {info.date_time for info in archive.infolist()} == {(1980, 1, 1, 0, 0, 0)}
+            assert archive.getinfo("test_01/img/test-image.png").compress_type == zipfile.ZIP_STORED
+        with tarfile.open(tmp_path / "a.tar.gz") as archive:
+            names = archive.getnames()
+            tarred = {name: archive.extractfile(name).read() for name in names}
+    assert zipped == tarred == expected
+    assert names[-1] == "test_03/index.html"
+
+
+def test_update_article_after_archive_build() -> None:
+    """An archive build cannot be updated in place, and a later build on disk can be."""
+    md_folder = Path(__file__).parent / "data"
+    with TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        sg = hsg.StaticSiteGenerator(md_folder)
+        sg.generate_site(tmp_path / "site", archive=tmp_path / "site.zip")
+        with pytest.raises(TypeError, match="archive cannot be updated"):
+            sg.update_article(md_folder / "test_03" / "test_03.md")
+        assert not (tmp_path / "site").exists()
+
+        # Test: a build on disk replaces the closed archive target
+        sg.generate_site(tmp_path / "site")
+        (tmp_path / "site" / "test_03" / "index.html").unlink()
+        sg.update_article(md_folder / "test_03" / "test_03.md")
+        assert (tmp_path / "site" / "test_03" / "index.html").is_file()
@@ -0,0 +1,54 @@
+"""Tests for ArticleMeta and the metadata records of StaticSiteGenerator."""
+
+import datetime as dt
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import harrix_pyssg as hsg
+
+
+def test_article_meta() -> None:
+    """Build compact records from articles and use them for site-wide outputs."""
+    md_folder = "./tests/data"
+    md_filename = Path(md_folder) / "test_01" / "test_01.md"
+
+    # Test: from_article fills file facts and front matter values
+    article = hsg.Article(md_filename)
+    meta = hsg.ArticleMeta.from_article(article, md_folder)
+    assert meta.handle == "test_01"
+    assert meta.path == str(md_filename.absolute())
+    assert meta.size == md_filename.stat().st_size
+    assert meta.date == dt.date(2022, 9, 18)
+    assert meta.categories == ("it", "web")
+    assert meta.tags == ("CSS",)
+    assert meta.lang == "en"
+    assert meta.published is True
+    assert len(meta.content_hash) == 40  # noqa: PLR2004
+
+    # Test: the record is slotted and frozen
+    assert not hasattr(meta, "__dict__")
+    assert meta == hsg.ArticleMeta.from_article(hsg.Article(md_filename), md_folder)
+
+    # Test: generator keeps records in both modes, sorted oldest first
+    sg = hsg.StaticSiteGenerator(md_folder, streaming=True)
+    metas = sg.article_metas
+    assert [item.handle for item in metas] == [item.handle for item in hsg.StaticSiteGenerator(md_folder).article_metas]
+    expected_article_count = 3
+    assert len(metas) == expected_article_count
+    assert metas == sorted(metas, key=lambda item: item.sort_key)
+
+    # Test: drafts keep a record but stay out of taxonomies and feeds
+    with TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        for name, yaml_text in (("post", "date: 2024-01-02\ntags: [a]"), ("draft", "tags: [a]\npublished: false")):
+            note_dir = temp_path / "md" / name
+            note_dir.mkdir(parents=True)
+            (note_dir / f"{name}.md").write_text(f"---\n{yaml_text}\n---\n\n# {name}\n", encoding="utf8")
+        sg = hsg.StaticSiteGenerator(temp_path / "md")
+        assert {item.handle: item.published for item in sg.article_metas} == {"post": True, "draft": False}
+        assert sg.taxonomy.handles("tags", "a") == ["post"]
+        assert hsg.TaxonomyEntry.from_meta(sg.article_metas[-1]).tags == ("a",)
+        sg.generate_site(temp_path / "html", base_url="https://example.com/", sitemap=True)
+        sitemap = (temp_path / "html" / "sitemap.xml").read_text(encoding="utf8")
+        assert "https://example.com/post/" in sitemap
+        assert "draft" not in sitemap
@@ -0,0 +1,35 @@
+"""Tests for structured build events."""
+
+import io
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import harrix_pyssg as hsg
+
+
+def test_build_events() -> None:
+    """A build reports discovery, every article and the throughput."""
+    events: list[hsg.BuildEvent] = []
+    sg = hsg.StaticSiteGenerator(Path(__file__).parent / "data", events=hsg.BuildEvents([events.append]))
+    with TemporaryDirectory() as tmp:
+        sg.generate_site(Path(tmp) / "site", event_log=Path(tmp) / "events.jsonl")
+        lines = (Path(tmp) / "events.jsonl").read_text(encoding="utf8").splitlines()
+    kinds = [event.kind for event in events]
+    assert (kinds[0], events[0].data["notes"], kinds[1]) == ("discovery", 3, "build_start")
+    assert (kinds.count("article_start"), kinds.count("article_finish")) == (3, 3)
+    assert (kinds[-1], events[-1].data["pages"]) == ("build_finish", 3)
+    assert events[-1].data["pages_per_second"] > 0
+    finish = next(event for event in events if event.kind == "article_finish" and event.data["handle"] == "test_03")
+    assert (finish.data["bytes_in"], finish.data["bytes_out"] > 0) == (873, True)
+    assert [json.loads(line)["event"] for line in lines] == kinds[1:]
+
+
+def test_article_error_event() -> None:
+    """Unreadable notes are reported as error events instead of printed."""
+    stream = io.StringIO()
+    with hsg.JsonLinesSink(stream) as sink:
+        hsg.Article(Path(__file__).parent / "data" / "missing.md", events=hsg.BuildEvents([sink]))
+    event = json.loads(stream.getvalue())
+    assert (event["event"], event["operation"], event["error"]) == ("error", "load", "FileNotFoundError")
+    assert "Traceback" in event["traceback"]
@@ -0,0 +1,62 @@
+"""Tests for BuildPlan and nested articles in StaticSiteGenerator."""
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import harrix_pyssg as hsg
+
+
+def _write(path: Path, text: str = "x") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf8")
+    return path
+
+
+def test_build_plan() -> None:
+    """Give every file one owner and keep nested outputs intact."""
+    with TemporaryDirectory() as temp_dir:
+        md_folder = Path(temp_dir) / "md"
+        _write(md_folder / "parent" / "parent.md", "# Parent\n")
+        _write(md_folder / "parent" / "featured-image.png")
+        _write(md_folder / "parent" / "img" / "a.png")
+        _write(md_folder / "parent" / "files" / "child" / "child.md", "# Child\n")
+        _write(md_folder / "parent" / "files" / "child" / "img" / "b.png")
+        _write(md_folder / "parent" / "files" / "doc.txt")
+        _write(md_folder / "solo" / "b.md", "# B\n")
+        _write(md_folder / "solo" / "a.md", "# A\n")
+
+        plan = hsg.BuildPlan(md_folder, md_folder.rglob("*.md"))
+        assert plan.handles == ["parent", "parent/files/child", "solo"]
+        assert [target.as_posix() for _, target in plan.owned_files("parent")] == [
+            "featured-image.png",
+            "files/doc.txt",
+            "img/a.png",
+        ]
+        assert [target.as_posix() for _, target in plan.owned_files("parent/files/child")] == ["img/b.png"]
+
+        # Test: one note owns a shared folder, the other is a conflict
+        assert plan.owner("solo") == (md_folder / "solo" / "a.md").absolute()
+        assert plan.conflicts == [(md_folder / "solo" / "b.md").absolute()]
+
+        # Test: output does not depend on render order and keeps nested pages
+        html_folder = Path(temp_dir) / "html"
+        sg = hsg.StaticSiteGenerator(md_folder)
+        sg.generate_site(html_folder)
+        files = sorted(path.relative_to(html_folder).as_posix() for path in html_folder.rglob("*") if path.is_file())
+        assert files == [
+            "parent/featured-image.png",
+            "parent/files/child/img/b.png",
+            "parent/files/child/index.html",
+            "parent/files/doc.txt",
+            "parent/img/a.png",
+            "parent/index.html",
+            "solo/index.html",
+        ]
+        assert "A" in (html_folder / "solo" / "index.html").read_text(encoding="utf8")
+
+        # Test: updating the parent keeps the child and removes stale files
+        (md_folder / "parent" / "img" / "a.png").unlink()
+        sg.update_article(md_folder / "parent" / "parent.md")
+        assert not (html_folder / "parent" / "img" / "a.png").exists()
+        assert (html_folder / "parent" / "files" / "child" / "index.html").exists()
+        assert (html_folder / "parent" / "files" / "child" / "img" / "b.png").exists()
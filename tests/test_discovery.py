@@ -0,0 +1,101 @@
+"""Tests for scandir-based note discovery."""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import harrix_pyssg as hsg
+
+
+def test_iter_markdown_files() -> None:
+    """Yield notes in a stable order and prune hidden and excluded folders."""
+    with TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        for relative in (
+            "b/b.md",
+            "a/a.MD",
+            "a/z/deep.md",
+            "a/img/picture.png",
+            "root.md",
+            ".git/objects/x.md",
+            "a/.hidden.md",
+            "node_modules/pkg/readme.md",
+            "drafts/one/one.md",
+        ):
+            path = root / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("# Note\n", encoding="utf8")
+
+        found = [path.relative_to(root).as_posix() for path in hsg.iter_markdown_files(root)]
+        assert found == [
+            "root.md",
+            "a/a.MD",
+            "a/z/deep.md",
+            "b/b.md",
+            "drafts/one/one.md",
+            "node_modules/pkg/readme.md",
+        ]
+
+        # Test: exclude patterns match names and relative paths
+        found = [
+            path.relative_to(root).as_posix()
+            for path in hsg.iter_markdown_files(root, exclude=["node_modules", "drafts/*"])
+        ]
+        assert found == ["root.md", "a/a.MD", "a/z/deep.md", "b/b.md"]
+
+        # Test: include patterns
+        found = [path.name for path in hsg.iter_markdown_files(root, include=["*.png", "b/*"])]
+        assert found == ["picture.png", "b.md"]
+
+        # Test: generator uses the same filters
+        sg = hsg.StaticSiteGenerator(root, exclude=["node_modules", "drafts"])
+        expected_article_count = 4
+        assert len(sg.articles) == expected_article_count
+
+
+def test_discovery_cache() -> None:
+    """Reuse listings of unchanged folders and fall back to a full walk."""
+    with TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir) / "md"
+        cache_filename = Path(temp_dir) / "cache" / "discovery.json"
+        for name in ("a", "b", "c"):
+            (root / name).mkdir(parents=True)
+            (root / name / f"{name}.md").write_text("# Note\n", encoding="utf8")
+        expected = list(hsg.iter_markdown_files(root))
+
+        cache = hsg.DiscoveryCache(cache_filename)
+        assert list(cache.iter_markdown_files(root)) == expected
+        expected_folder_count = 4
+        assert (cache.listed, cache.reused) == (expected_folder_count, 0)
+        cache.save()
+
+        # Test: fresh folders are racy and listed again; stable ones are reused
+        data = json.loads(cache_filename.read_text(encoding="utf8"))
+        for folder in data["folders"].values():
+            folder["mtime_ns"] = folder["mtime_ns"] or 0
+        data["folders"]["b"]["mtime_ns"] = (root / "b").stat().st_mtime_ns
+        cache_filename.write_text(json.dumps(data), encoding="utf8")
+        cache = hsg.DiscoveryCache(cache_filename)
+        assert list(cache.iter_markdown_files(root)) == expected
+        assert (cache.listed, cache.reused) == (expected_folder_count - 1, 1)
+
+        # Test: a cached folder that vanished forces a full walk
+        data["folders"][""]["mtime_ns"] = root.stat().st_mtime_ns
+        cache_filename.write_text(json.dumps(data), encoding="utf8")
+        shutil.rmtree(root / "b")
+        os.utime(root, ns=(data["folders"][""]["mtime_ns"], data["folders"][""]["mtime_ns"]))
+        cache = hsg.DiscoveryCache(cache_filename)
+        assert [path.name for path in cache.iter_markdown_files(root)] == ["a.md", "c.md"]
+
+        # Test: other patterns ignore the cache
+        cache = hsg.DiscoveryCache(cache_filename)
+        assert list(cache.iter_markdown_files(root, exclude=["a"])) == [root / "c" / "c.md"]
+        assert cache.reused == 0
+
+        # Test: generator uses the cache from cache_dir
+        sg = hsg.StaticSiteGenerator(root, cache_dir=cache_filename.parent)
+        expected_article_count = 2
+        assert len(sg.articles) == expected_article_count
+        assert cache_filename.exists()
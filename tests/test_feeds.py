@@ -0,0 +1,87 @@
+"""Tests for sitemap and Atom feed generation."""
+
+import datetime as dt
+import json
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+import harrix_pyssg as hsg
+from harrix_pyssg.feeds import ATOM_NS, SITEMAP_NS
+
+NS = {"sm": SITEMAP_NS, "atom": ATOM_NS}
+
+
+def _parse(path: Path) -> ET.Element:
+    return ET.parse(path).getroot()  # noqa: S314 (output written by the test itself)
+
+
+def test_write_sitemap_split() -> None:
+    """Split sitemaps above `max_urls` and skip unchanged output."""
+    entries = [
+        hsg.FeedEntry(f"https://example.com/note-{number}/", f"Note {number}", date=dt.date(2022, 1, number + 1))
+        for number in range(5)
+    ]
+    with TemporaryDirectory() as tmp:
+        site = Path(tmp) / "site"
+        cache = Path(tmp) / "cache" / "feeds.json"
+        written = hsg.write_sitemap(entries, site, "https://example.com", max_urls=2, cache_filename=cache)
+        assert len(written) == 4  # noqa: PLR2004
+        index = _parse(site / "sitemap.xml")
+        locs = [loc.text for loc in index.findall("sm:sitemap/sm:loc", NS)]
+        assert locs == [f"https://example.com/sitemap-{number}.xml" for number in (1, 2, 3)]
+        child = _parse(site / "sitemap-1.xml")
+        assert [loc.text for loc in child.findall("sm:url/sm:loc", NS)] == [
+            "https://example.com/note-0/",
+            "https://example.com/note-1/",
+        ]
+
+        # Test: unchanged entries are not written again
+        assert hsg.write_sitemap(entries, site, "https://example.com", max_urls=2, cache_filename=cache) == []
+        changed = [*entries[:4], hsg.FeedEntry("https://example.com/other/", "Other")]
+        assert hsg.write_sitemap(changed, site, "https://example.com", max_urls=2, cache_filename=cache)
+
+
+def test_write_atom_feeds_removes_stale_languages() -> None:
+    """A language without entries loses its feed file and its cached hash."""
+    entries = [
+        hsg.FeedEntry("https://example.com/a/", "A", date=dt.date(2022, 1, 1), lang="en"),
+        hsg.FeedEntry("https://example.com/b/", "B", date=dt.date(2022, 1, 2), lang="ru"),
+    ]
+    with TemporaryDirectory() as tmp:
+        site = Path(tmp) / "site"
+        cache = Path(tmp) / "cache" / "feeds.json"
+        assert len(hsg.write_atom_feeds(entries, site, "https://example.com", cache_filename=cache)) == 2  # noqa: PLR2004
+        assert hsg.write_atom_feeds(entries[:1], site, "https://example.com", cache_filename=cache) == []
+        assert sorted(path.name for path in (site / "atom").iterdir()) == ["en.xml"]
+        assert sorted(json.loads(cache.read_text(encoding="utf8"))) == ["atom/en"]
+
+
+def test_generate_site_sitemap_and_feeds() -> None:
+    """StaticSiteGenerator writes sitemap.xml and per-language feeds."""
+    with TemporaryDirectory() as tmp:
+        md_folder = Path(tmp) / "content"
+        for name, yaml_text in (
+            ("first", "date: 2022-01-01\nlang: en"),
+            ("second", "date: 2022-02-01\nlang: ru\npermalink: https://example.com/ru/second/"),
+            ("draft", "date: 2022-03-01\npublished: false"),
+        ):
+            (md_folder / name).mkdir(parents=True)
+            (md_folder / name / f"{name}.md").write_text(f"---\n{yaml_text}\n---\n\n# {name}\n", encoding="utf8")
+        html_folder = Path(tmp) / "site"
+
+        sg = hsg.StaticSiteGenerator(md_folder)
+        with pytest.raises(ValueError, match="base_url"):
+            sg.generate_site(html_folder, sitemap=True)
+        sg.generate_site(html_folder, sitemap=True, atom_feeds=True, base_url="https://example.com/")
+
+        urlset = _parse(html_folder / "sitemap.xml")
+        locs = [loc.text for loc in urlset.findall("sm:url/sm:loc", NS)]
+        assert locs == ["https://example.com/first/", "https://example.com/ru/second/"]
+
+        feed_en = _parse(html_folder / "atom" / "en.xml")
+        assert [title.text for title in feed_en.findall("atom:entry/atom:title", NS)] == ["first"]
+        feed_ru = _parse(html_folder / "atom" / "ru.xml")
+        assert feed_ru.find("atom:entry/atom:id", NS).text == "https://example.com/ru/second/"
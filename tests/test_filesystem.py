@@ -0,0 +1,60 @@
+"""Tests for the local and in-memory file systems of a build."""
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+import harrix_pyssg as hsg
+
+
+def test_memory_file_system() -> None:
+    """Files and folders are listed, read and removed like on disk."""
+    fs = hsg.MemoryFileSystem({"a/b/c.txt": "c", Path("a/d.bin").absolute(): b"\0"})
+    assert fs.list_folder("a") == [("b", True), ("d.bin", False)]
+    assert [path.as_posix() for path in fs.iter_files("a")] == ["a/d.bin", "a/b/c.txt"]
+    assert (fs.read_text("a/b/c.txt"), fs.stat("a/d.bin"), fs.is_file("a/b")) == ("c", (1, 0.0), False)
+    fs.remove("a/b")
+    assert (fs.list_folder("a"), len(fs)) == ([("d.bin", False)], 1)
+    with pytest.raises(FileNotFoundError):
+        fs.read_bytes("a/b/c.txt")
+
+
+def test_static_site_generator_in_memory() -> None:
+    """A site renders from a dictionary of sources into memory with the same pages as on disk."""
+    data = Path(__file__).parent / "data"
+    local = hsg.LocalFileSystem()
+    files = {
+        Path("notes") / path.relative_to(data): local.read_bytes(path)
+        for path in local.iter_files(data)
+        if "theme_dist" not in path.parts
+    }
+    source = hsg.MemoryFileSystem(files)
+    target = hsg.MemoryFileSystem()
+    sg = hsg.StaticSiteGenerator("notes", source=source)
+    with TemporaryDirectory() as tmp:
+        theme_dir = Path(tmp) / "theme"
+        hsg.ThemeSlicer(data / "theme_dist", theme_dir).slice()
+        sg.generate_site("site", theme_dir, target=target, check_links=True)
+        hsg.StaticSiteGenerator(data).generate_site(Path(tmp) / "site", theme_dir)
+        expected = {
+            path.relative_to(Path(tmp) / "site").as_posix(): local.read_bytes(path)
+            for path in local.iter_files(Path(tmp) / "site")
+        }
+    written = {path.relative_to("site").as_posix(): target.read_bytes(path) for path in target.iter_files("site")}
+    assert written == expected
+    assert sg.broken_links == {}
+    assert not Path("site").exists()
+
+    with pytest.raises(ValueError, match="local target"):
+        sg.generate_site("site", target=target, search_index=True)
+
+    # Test: listing pages go to the target and through the minifier like article pages
+    target = hsg.MemoryFileSystem()
+    sg = hsg.StaticSiteGenerator("notes", source=source)
+    sg.generate_site("site", target=target, taxonomy_pages=True, minify=True)
+    listing = target.read_text(Path("site") / sg.taxonomy.listing_path("tags", "CSS") / "index.html")
+    assert listing.startswith("<h1>Tag: CSS</h1><ul><li>")
+    assert sg.html_minifier is not None
+    assert sg.html_minifier.bytes_saved > 0
+    assert not Path("site").exists()
@@ -0,0 +1,82 @@
+"""Tests for reading notes from a git commit without a checkout."""
+
+import io
+import shutil
+import subprocess
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+import harrix_pyssg as hsg
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def _git(repository: Path, *args: str) -> str:
+    """Run git in a test repository and return its output."""
+    return subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", "-c", "commit.gpgsign=false", *args],  # noqa: S607
+        cwd=repository,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+
+
+def _make_repository(folder: Path) -> Path:
+    """Create a repository with the test notes under `content` and commit them."""
+    data = Path(__file__).parent / "data"
+    shutil.copytree(data, folder / "content", ignore=shutil.ignore_patterns("theme_dist"))
+    _git(folder, "init", "-q")
+    _git(folder, "add", "-A")
+    _git(folder, "commit", "-q", "-m", "Notes")
+    return folder / "content"
+
+
+def test_static_site_generator_from_git_commit() -> None:
+    """A site builds from a commit with the same pages as from disk, ignoring uncommitted changes."""
+    with TemporaryDirectory() as tmp:
+        content = _make_repository(Path(tmp) / "repo")
+        local = hsg.LocalFileSystem()
+        hsg.StaticSiteGenerator(content).generate_site(Path(tmp) / "site")
+        expected = {
+            path.relative_to(Path(tmp) / "site").as_posix(): local.read_bytes(path)
+            for path in local.iter_files(Path(tmp) / "site")
+        }
+        shutil.rmtree(content / "test_02")
+
+        target = hsg.MemoryFileSystem()
+        with hsg.GitFileSystem(content, "HEAD") as source:
+            assert source.root == content.parent
+            sg = hsg.StaticSiteGenerator(content, source=source)
+            sg.generate_site("site", target=target)
+            with pytest.raises(io.UnsupportedOperation):
+                source.write_bytes(content / "new.md", b"# New")
+        written = {path.relative_to("site").as_posix(): target.read_bytes(path) for path in target.iter_files("site")}
+        assert written == expected
+
+        with pytest.raises(ValueError, match="rev-parse"):
+            hsg.GitFileSystem(content, "missing-branch")
+
+
+def test_changed_notes_between_commits() -> None:
+    """Changed notes and files map to the notes that own them."""
+    with TemporaryDirectory() as tmp:
+        repository = Path(tmp) / "repo"
+        content = _make_repository(repository)
+        (content / "test_01" / "img" / "test-image.png").write_bytes(b"changed")
+        (content / "test_02" / "test_02.md").write_text("# Changed\n", encoding="utf8")
+        (content / "test_03" / "test_03.md").unlink()
+        _git(repository, "commit", "-q", "-a", "-m", "Changes")
+
+        with hsg.GitFileSystem(repository) as source:
+            changed = source.diff("HEAD~1")
+            assert [path.relative_to(content).as_posix() for path in changed] == [
+                "test_01/img/test-image.png",
+                "test_02/test_02.md",
+                "test_03/test_03.md",
+            ]
+            sg = hsg.StaticSiteGenerator(content, source=source)
+            assert sg.changed_notes(changed) == [content / "test_01" / "test_01.md", content / "test_02" / "test_02.md"]
+            assert source.read_text(content / "test_02" / "test_02.md") == "# Changed\n"
@@ -0,0 +1,80 @@
+"""Tests for the HtmlMinifier class and minify_html function."""
+
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import harrix_pyssg as hsg
+
+THEME_DIST = Path(__file__).parent / "data" / "theme_dist"
+
+
+def test_minify_html() -> None:
+    """Strip comments and whitespace but keep preformatted and math blocks."""
+    html = """<!doctype html>
+<html>
+  <head>
+    <title>T</title>
+    <!-- h-ssg:optional-head -->
+  </head>
+  <body>
+    <p>Inline <span class="math inline">x  +  y</span> and <em>b</em>   <strong>c</strong></p>
+    <pre><code class="language-py">x  =  1
+  y
+</code></pre>
+    <p>a<!-- note --> b</p>
+    <script>if (a < b)  { x(); }</script>
+    <textarea>  keep
+  this</textarea>
+    <!--[if IE]><p>Old</p><![endif]-->
+  </body>
+</html>
+"""
+    result = hsg.minify_html(html)
+    assert result.startswith("<!doctype html><html><head><title>T</title></head><body>")
+    assert "h-ssg" not in result
+    assert '<span class="math inline">x  +  y</span> and <em>b</em> <strong>c</strong>' in result
+    assert '<pre><code class="language-py">x  =  1\n  y\n</code></pre>' in result
+    assert "<p>a b</p>" in result
+    assert "<script>if (a < b)  { x(); }</script>" in result
+    assert "<textarea>  keep\n  this</textarea>" in result
+    assert "<!--[if IE]><p>Old</p><![endif]-->" in result
+    assert result.endswith("</body></html>")
+
+    # Test: nested elements with a math class are kept as is
+    nested = '<div class="katex"><span> a  </span><div>  x </div></div>\n<p> y </p>'
+    assert hsg.minify_html(nested) == '<div class="katex"><span> a  </span><div>  x </div></div><p>y</p>'
+
+    # Test: unterminated markup does not break the output
+    assert hsg.minify_html("a  <  b") == "a < b"
+
+
+def test_minify_html_unclosed_preserve_tags() -> None:
+    """Many unclosed preserved tags are minified in linear time, not by rescanning the page for each."""
+    count = 50_000
+    html = "<pre> x  y " * count + '<div class="math"> z ' * count + "</div>"
+    started = time.perf_counter()
+    result = hsg.minify_html(html)
+    assert time.perf_counter() - started < 5  # noqa: PLR2004
+    assert result == "<pre>x y" * count + '<div class="math">z' * (count - 1) + '<div class="math"> z </div>'
+
+
+def test_generate_site_minify() -> None:
+    """StaticSiteGenerator minifies themed pages and reports bytes saved."""
+    md_folder = Path(__file__).parent / "data"
+    with TemporaryDirectory() as tmp:
+        theme_dir = Path(tmp) / "theme"
+        html_folder = Path(tmp) / "site"
+        hsg.ThemeSlicer(THEME_DIST, theme_dir).slice()
+
+        sg = hsg.StaticSiteGenerator(md_folder, theme_dir=theme_dir)
+        sg.generate_site(html_folder, minify=True)
+
+        minifier = sg.html_minifier
+        assert minifier is not None
+        expected_page_count = 3
+        assert minifier.pages == expected_page_count
+        assert minifier.bytes_saved > 0
+        html = (html_folder / "test_01" / "index.html").read_text(encoding="utf8")
+        assert "\n    " not in html
+        assert "Hello, world!" in html
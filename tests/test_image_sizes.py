@@ -0,0 +1,58 @@
+"""Tests for image header sniffing and `<img>` attributes."""
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import harrix_pyssg as hsg
+
+
+def test_read_image_size() -> None:
+    """Sizes come from PNG, GIF, JPEG, WebP and SVG headers."""
+    assert hsg.read_image_size(Path(__file__).parent / "data" / "test_01" / "img" / "test-image.png") == (200, 150)
+    exif = b"\xff\xe1" + (2 + 100).to_bytes(2, "big") + b"\0" * 100
+    sof = b"\xff\xc0" + (17).to_bytes(2, "big") + b"\x08" + (480).to_bytes(2, "big") + (640).to_bytes(2, "big")
+    images = {
+        "a.gif": b"GIF89a" + (31).to_bytes(2, "little") + (17).to_bytes(2, "little") + b"\0" * 20,
+        "a.jpg": b"\xff\xd8" + exif + sof + b"\0" * 12 + b"\xff\xd9",
+        "a.webp": b"RIFF\0\0\0\0WEBPVP8X" + b"\0" * 8 + (299).to_bytes(3, "little") + (99).to_bytes(3, "little"),
+        "a.svg": b'<?xml version="1.0"?>\n<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 120.4 60"></svg>',
+        "b.svg": b'<svg width="32px" height="24" viewBox="0 0 16 12"></svg>',
+        "a.txt": b"not an image",
+    }
+    with TemporaryDirectory() as tmp:
+        for name, data in images.items():
+            (Path(tmp) / name).write_bytes(data)
+        sizes = {name: hsg.read_image_size(Path(tmp) / name) for name in images}
+    assert sizes == {
+        "a.gif": (31, 17),
+        "a.jpg": (640, 480),
+        "a.webp": (300, 100),
+        "a.svg": (120, 60),
+        "b.svg": (32, 24),
+        "a.txt": None,
+    }
+
+
+def test_image_attributes() -> None:
+    """Local images get sizes and lazy loading; featured images are not lazy."""
+    md_folder = Path(__file__).parent / "data"
+    cache = hsg.ImageSizeCache()
+    html = cache.add_attributes(
+        '<img src="featured-image.png" alt="F" /><img src="img/test-image.png" alt="A">'
+        '<img src="img/test-image.png" loading="eager" /><img src="img/test-image.png" width="10" />'
+        '<img src="https://example.com/a.png" />',
+        md_folder / "test_01",
+    )
+    assert html == (
+        '<img src="featured-image.png" alt="F" width="1920" height="673" />'
+        '<img src="img/test-image.png" alt="A" width="200" height="150" loading="lazy" decoding="async">'
+        '<img src="img/test-image.png" loading="eager" width="200" height="150" decoding="async" />'
+        '<img src="img/test-image.png" width="10" loading="lazy" decoding="async" />'
+        '<img src="https://example.com/a.png" />'
+    )
+    assert (cache.misses, cache.hits) == (2, 1)
+
+    with TemporaryDirectory() as tmp:
+        hsg.StaticSiteGenerator(md_folder).generate_site(tmp, image_sizes=True)
+        page = (Path(tmp) / "test_01" / "index.html").read_text(encoding="utf8")
+    assert 'width="200" height="150" loading="lazy" decoding="async"' in page
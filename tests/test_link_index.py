@@ -0,0 +1,50 @@
+"""Tests for build-time link validation."""
+
+import shutil
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import harrix_pyssg as hsg
+
+
+def test_link_index() -> None:
+    """References resolve against recorded pages, files and anchors."""
+    links = hsg.LinkIndex()
+    links.add_file("img/logo.png")
+    links.add_common_anchors('<body id="top">')
+    links.add_page("", "index.html", '<a href="a/">A</a><a href="/a#intro">A</a><img src="img/logo.png" />')
+    links.add_page(
+        "a",
+        "a/index.html",
+        '<h2 id="intro">Intro</h2><a href="#top">Top</a><a href="../index.html#nope">Home</a>'
+        '<a href="../../x/">Out</a><a href="https://example.com/">Ext</a><a href="mailto:a@b.c">Mail</a>'
+        '<img src="img/missing%20file.png" />',
+    )
+    assert links.check() == {
+        "a": [
+            hsg.BrokenLink("a", "../index.html#nope", "missing anchor"),
+            hsg.BrokenLink("a", "../../x/", "outside the site"),
+            hsg.BrokenLink("a", "img/missing%20file.png", "missing target"),
+        ]
+    }
+
+
+def test_static_site_generator_check_links() -> None:
+    """The render pass reports broken links per article."""
+    with TemporaryDirectory() as tmp:
+        md_folder = Path(tmp) / "md"
+        shutil.copytree(Path(__file__).parent / "data", md_folder, ignore=shutil.ignore_patterns("theme_dist"))
+        note = md_folder / "test_04" / "test_04.md"
+        note.parent.mkdir()
+        note.write_text(
+            "# Links\n\n## Intro part\n\n[ok](#intro-part) [bad](#nope) [page](../test_01/) "
+            "[image](../test_01/img/test-image.png) [gone](../test_05/)\n",
+            encoding="utf8",
+        )
+        sg = hsg.StaticSiteGenerator(md_folder)
+        sg.generate_site(Path(tmp) / "site", check_links=True)
+        assert [str(link) for link in sg.broken_links["test_04"]] == [
+            "test_04: #nope (missing anchor)",
+            "test_04: ../test_05/ (missing target)",
+        ]
+        assert set(sg.broken_links) == {"test_04"}
@@ -0,0 +1,41 @@
+"""Tests for memory profiling of builds."""
+
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+import harrix_pyssg as hsg
+
+
+def test_memory_profile() -> None:
+    """A profiled build reports every phase, allocation sites and articles."""
+    sg = hsg.StaticSiteGenerator(Path(__file__).parent / "data")
+    with TemporaryDirectory() as tmp:
+        sg.generate_site(Path(tmp) / "site", memory_profile=Path(tmp) / "memory.json")
+        report = json.loads((Path(tmp) / "memory.json").read_text(encoding="utf8"))
+        assert (Path(tmp) / "site" / "test_01" / "index.html").exists()
+    assert [phase["name"] for phase in report["phases"]] == ["discovery", "render", "assemble", "write", "finish"]
+    assert report["peak"] == max(phase["peak"] for phase in report["phases"])
+    assert report["top_allocations"]
+    assert {article["handle"] for article in report["largest_articles"]} == {"test_01", "test_02", "test_03"}
+    assert len(sg.articles) == len(report["largest_articles"])
+    assert sg.memory_profiler is not None
+    assert not sg.memory_profiler.running
+
+    # Test: streaming mode loads articles during the build and reports the load phase
+    streaming = hsg.StaticSiteGenerator(Path(__file__).parent / "data", streaming=True)
+    with TemporaryDirectory() as tmp:
+        streaming.generate_site(Path(tmp) / "site", memory_budget=10**9)
+    assert streaming.memory_profiler is not None
+    assert list(streaming.memory_profiler.phases)[:2] == ["discovery", "load"]
+
+
+def test_memory_budget() -> None:
+    """A build over the memory budget fails and still writes the report."""
+    sg = hsg.StaticSiteGenerator(Path(__file__).parent / "data")
+    with TemporaryDirectory() as tmp:
+        with pytest.raises(hsg.MemoryBudgetError, match="discovery phase"):
+            sg.generate_site(Path(tmp) / "site", memory_profile=Path(tmp) / "memory.json", memory_budget=1)
+        assert json.loads((Path(tmp) / "memory.json").read_text(encoding="utf8"))["budget"] == 1
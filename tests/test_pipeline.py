@@ -0,0 +1,87 @@
+"""Tests for the asyncio build pipeline."""
+
+import asyncio
+import threading
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+import harrix_pyssg as hsg
+
+
+def test_run_pipeline() -> None:
+    """Pass every item through all stages and record queue depths."""
+    written: list[int] = []
+    stats = asyncio.run(
+        hsg.run_pipeline(
+            range(50),
+            load=lambda item: item * 2,
+            render=lambda item: None if item % 10 == 0 else item + 1,
+            write=written.append,
+            concurrency=3,
+            queue_size=4,
+        )
+    )
+    assert sorted(written) == [item * 2 + 1 for item in range(50) if item * 2 % 10 != 0]
+    expected_items = 50
+    assert stats.items == expected_items
+    assert stats.rendered == len(written)
+    assert stats.render_queue.puts == expected_items
+    assert 0 < stats.render_queue.max_depth <= stats.render_queue.maxsize
+    assert stats.write_queue.max_depth <= stats.write_queue.maxsize
+
+    # Test: invalid concurrency
+    with pytest.raises(ValueError, match="concurrency"):
+        asyncio.run(hsg.run_pipeline([], load=str, render=str, write=print, concurrency=0))
+
+
+def test_generate_site_async() -> None:
+    """Produce the same files as the synchronous build."""
+    md_folder = "./tests/data"
+    with TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        hsg.StaticSiteGenerator(md_folder).generate_site(temp_path / "sync", taxonomy_pages=True)
+        for streaming in (False, True):
+            sg = hsg.StaticSiteGenerator(md_folder, streaming=streaming)
+            asyncio.run(sg.generate_site_async(temp_path / "async", concurrency=2, taxonomy_pages=True))
+            stats = sg.pipeline_stats
+            assert stats is not None
+            expected_article_count = 3
+            assert stats.rendered == expected_article_count
+            for path in (temp_path / "sync").rglob("*"):
+                other = temp_path / "async" / path.relative_to(temp_path / "sync")
+                assert other.exists()
+                if path.is_file():
+                    assert path.read_bytes() == other.read_bytes()
+
+
+def test_generate_site_async_records_writes_on_event_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Counters, events and the link index of parallel writes are updated on the event loop thread."""
+    threads: set[int] = set()
+    finished: list[hsg.BuildEvent] = []
+    add_page, add_file = hsg.LinkIndex.add_page, hsg.LinkIndex.add_file
+
+    def record_page(index: hsg.LinkIndex, handle: str, page: str, content_html: str) -> None:
+        threads.add(threading.get_ident())
+        add_page(index, handle, page, content_html)
+
+    def record_file(index: hsg.LinkIndex, relative: str) -> None:
+        threads.add(threading.get_ident())
+        add_file(index, relative)
+
+    monkeypatch.setattr(hsg.LinkIndex, "add_page", record_page)
+    monkeypatch.setattr(hsg.LinkIndex, "add_file", record_file)
+
+    def listener(event: hsg.BuildEvent) -> None:
+        if event.kind == "article_finish":
+            threads.add(threading.get_ident())
+        if event.kind == "build_finish":
+            finished.append(event)
+
+    sg = hsg.StaticSiteGenerator("./tests/data", events=hsg.BuildEvents([listener]))
+    with TemporaryDirectory() as temp_dir:
+        asyncio.run(sg.generate_site_async(Path(temp_dir) / "site", concurrency=8, check_links=True))
+    assert threads == {threading.get_ident()}
+    assert finished[0].data["pages"] == len(sg.build_plan.handles)
+    assert sg.broken_links == {}
@@ -0,0 +1,76 @@
+"""Tests for the Precompressor class."""
+
+import gzip
+import shutil
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import harrix_pyssg as hsg
+
+
+def test_precompressor() -> None:
+    """Write `.gz` sidecars for large text files and reuse cached blobs."""
+    with TemporaryDirectory() as tmp:
+        site = Path(tmp) / "site"
+        cache = Path(tmp) / "cache"
+        (site / "css").mkdir(parents=True)
+        page = "<p>Hello, world!</p>\n" * 200
+        (site / "index.html").write_text(page, encoding="utf8")
+        (site / "css" / "small.css").write_text("a{}", encoding="utf8")
+        (site / "image.png").write_bytes(b"\x89PNG" * 1000)
+
+        stats = hsg.Precompressor(site, cache_dir=cache, zstd=False).run()
+        assert stats.compressed == 1
+        assert stats.skipped_small == 1
+        assert stats.reused == 0
+        assert stats.bytes_gzip < stats.bytes_in
+        assert gzip.decompress((site / "index.html.gz").read_bytes()).decode("utf8") == page
+        assert not (site / "css" / "small.css.gz").exists()
+        assert not (site / "image.png.gz").exists()
+
+        # Test: unchanged files are taken from the cache
+        (site / "index.html.gz").unlink()
+        stats = hsg.Precompressor(site, cache_dir=cache, zstd=False).run()
+        assert stats.compressed == 0
+        assert stats.reused == 1
+        assert (site / "index.html.gz").is_file()
+
+        # Test: changed content is compressed again and old blobs are pruned
+        (site / "index.html").write_text(page + "<p>New</p>\n", encoding="utf8")
+        stats = hsg.Precompressor(site, cache_dir=cache, zstd=False).run()
+        assert stats.compressed == 1
+        assert len(list(cache.glob("*/*"))) == 1
+
+
+def test_generate_site_precompress() -> None:
+    """StaticSiteGenerator writes sidecars when `precompress=True`."""
+    md_folder = Path(__file__).parent / "data"
+    with TemporaryDirectory() as tmp:
+        html_folder = Path(tmp) / "site"
+        sg = hsg.StaticSiteGenerator(md_folder)
+        sg.generate_site(html_folder, precompress=True)
+        assert (html_folder / "test_03" / "index.html.gz").is_file()
+
+
+def test_update_article_refreshes_sidecars() -> None:
+    """`update_article()` after a precompressed build rewrites the sidecars of the changed page."""
+    with TemporaryDirectory() as tmp:
+        md_folder = Path(tmp) / "md"
+        shutil.copytree(Path(__file__).parent / "data", md_folder, ignore=shutil.ignore_patterns("theme_dist"))
+        html_folder = Path(tmp) / "site"
+        sg = hsg.StaticSiteGenerator(md_folder)
+        sg.generate_site(html_folder, precompress=True)
+        page = html_folder / "test_03" / "index.html"
+        old_html = page.read_text(encoding="utf8")
+
+        md_filename = md_folder / "test_03" / "test_03.md"
+        md_filename.write_text(md_filename.read_text(encoding="utf8") + "\nA new paragraph.\n", encoding="utf8")
+        sg.update_article(md_filename)
+        new_html = page.read_text(encoding="utf8")
+        assert new_html != old_html
+        assert gzip.decompress((html_folder / "test_03" / "index.html.gz").read_bytes()).decode("utf8") == new_html
+
+        # Test: a page that shrinks below the minimum size loses its old sidecars
+        md_filename.write_text("# Short\n", encoding="utf8")
+        sg.update_article(md_filename)
+        assert not (html_folder / "test_03" / "index.html.gz").exists()
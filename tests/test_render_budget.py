@@ -0,0 +1,38 @@
+"""Tests for the per-article render budget."""
+
+import shutil
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import harrix_pyssg as hsg
+
+
+def test_render_guard() -> None:
+    """Guarded rendering matches the article, and slow renders are stopped."""
+    article = hsg.Article(Path(__file__).parent / "data" / "test_01" / "test_01.md")
+    with hsg.RenderGuard(hsg.RenderBudget(max_seconds=60)) as guard:
+        content_html, _ = guard.render(article, "test_01")
+    assert content_html == article.get_html_code()
+
+    with hsg.RenderGuard(hsg.RenderBudget(max_seconds=1e-6)) as guard:
+        violation = guard.render(article, "test_01")
+    assert violation == hsg.BudgetViolation("test_01", "render took longer than 1e-06 s")
+
+
+def test_static_site_generator_render_budget() -> None:
+    """Notes above the size limit are reported and get no page or a fallback page."""
+    with TemporaryDirectory() as tmp:
+        md_folder = Path(tmp) / "md"
+        shutil.copytree(Path(__file__).parent / "data", md_folder, ignore=shutil.ignore_patterns("theme_dist"))
+        sg = hsg.StaticSiteGenerator(md_folder)
+        sg.generate_site(Path(tmp) / "site", render_budget=hsg.RenderBudget(max_bytes=500))
+        assert [str(violation) for violation in sg.budget_violations] == [
+            "test_03: input is 873 bytes, above the limit of 500",
+        ]
+        assert (Path(tmp) / "site" / "test_01" / "index.html").exists()
+        assert not (Path(tmp) / "site" / "test_03" / "index.html").exists()
+
+        sg.generate_site(Path(tmp) / "fallback", render_budget=hsg.RenderBudget(max_bytes=500, fallback=True))
+        page = (Path(tmp) / "fallback" / "test_03" / "index.html").read_text(encoding="utf8")
+        assert "<pre>" in page
+        assert len(sg.budget_violations) == 1
@@ -0,0 +1,76 @@
+"""Tests for the SearchIndex class and search output of StaticSiteGenerator."""
+
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import harrix_pyssg as hsg
+
+
+def _load_term(search_dir: Path, term: str) -> list[int]:
+    manifest = json.loads((search_dir / "index.json").read_text(encoding="utf8"))
+    key = max((key for key in manifest["shards"] if term.startswith(key)), key=len)
+    shard = json.loads((search_dir / manifest["shards"][key]).read_text(encoding="utf8"))
+    return shard.get(term, [])
+
+
+def test_extract_search_terms() -> None:
+    """Weight title, heading and body words and skip scripts."""
+    terms = hsg.extract_search_terms(
+        "Grid layout",
+        "<h1>Grid layout</h1><h2>Columns</h2><p>Use columns &amp; rows.</p><script>var hidden;</script>",
+    )
+    assert terms["grid"] > terms["columns"] > terms["rows"]
+    assert "hidden" not in terms
+    assert "amp" not in terms
+
+
+def test_search_index_shards() -> None:
+    """Split shards by prefix and reuse cached term maps."""
+    with TemporaryDirectory() as tmp:
+        site = Path(tmp) / "site"
+        cache = Path(tmp) / "cache" / "terms.json"
+        index = hsg.SearchIndex(max_shard_bytes=40)
+        index.update("a", "Alpha", "a/", "<p>apple apricot avocado banana</p>")
+        index.update("b", "Beta", "b/", "<p>apple berry</p>")
+        index.write(site)
+        index.save_cache(cache)
+
+        search_dir = site / "search"
+        manifest = json.loads((search_dir / "index.json").read_text(encoding="utf8"))
+        assert manifest["docs"] == [["a/", "Alpha"], ["b/", "Beta"]]
+        assert len(manifest["shards"]) > 2  # noqa: PLR2004
+        assert any(len(key) > 1 for key in manifest["shards"])
+        assert _load_term(search_dir, "apple")[::2] == [0, 1]
+        assert _load_term(search_dir, "berry")[::2] == [1]
+
+        # Test: only the changed article is tokenized again
+        index = hsg.SearchIndex(max_shard_bytes=40)
+        index.load_cache(cache)
+        index.update("a", "Alpha", "a/", "<p>apple apricot avocado banana</p>")
+        index.update("b", "Beta", "b/", "<p>berry cherry</p>")
+        assert index.reused == 1
+        assert index.tokenized == 1
+        index.write(site)
+        assert _load_term(search_dir, "apple")[::2] == [0]
+        assert _load_term(search_dir, "cherry")[::2] == [1]
+
+
+def test_generate_site_search_index() -> None:
+    """StaticSiteGenerator writes the index from the render pass."""
+    md_folder = Path(__file__).parent / "data"
+    with TemporaryDirectory() as tmp:
+        html_folder = Path(tmp) / "site"
+        cache_dir = Path(tmp) / "cache"
+        sg = hsg.StaticSiteGenerator(md_folder, cache_dir=cache_dir)
+        sg.generate_site(html_folder, search_index=True)
+        search_dir = html_folder / "search"
+        manifest = json.loads((search_dir / "index.json").read_text(encoding="utf8"))
+        assert ["test_01/", "Title"] in manifest["docs"]
+        assert _load_term(search_dir, "world")
+
+        sg = hsg.StaticSiteGenerator(md_folder, cache_dir=cache_dir)
+        sg.generate_site(html_folder, search_index=True)
+        assert sg.search_index is not None
+        assert sg.search_index.tokenized == 0
+        assert sg.search_index.reused == len(sg.articles)
@@ -0,0 +1,61 @@
+"""Tests for sharded builds, merge_shards and the command-line interface."""
+
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+import harrix_pyssg as hsg
+
+
+def _files(folder: Path) -> dict[str, bytes]:
+    return {path.relative_to(folder).as_posix(): path.read_bytes() for path in folder.rglob("*") if path.is_file()}
+
+
+def test_shard() -> None:
+    """Partition handles deterministically into exactly one shard."""
+    handles = [f"notes/{number}" for number in range(200)]
+    shards = [hsg.Shard(index, 3) for index in range(1, 4)]
+    for handle in handles:
+        assert sum(shard.contains(handle) for shard in shards) == 1
+    assert all(any(shard.contains(handle) for handle in handles) for shard in shards)
+    assert hsg.Shard.parse("2/3") == shards[1]
+    assert str(shards[1]) == "2/3"
+
+    # Test: invalid shards
+    for text in ("0/3", "4/3", "3", "a/b"):
+        with pytest.raises(ValueError, match="shard"):
+            hsg.Shard.parse(text)
+
+
+def test_merge_shards() -> None:
+    """Merged shard outputs equal a full build and collisions are rejected."""
+    md_folder = "./tests/data"
+    with TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        hsg.StaticSiteGenerator(md_folder).generate_site(temp_path / "full", taxonomy_pages=True)
+        shard_folders = [temp_path / "shards" / str(index) for index in (1, 2)]
+        for index, folder in enumerate(shard_folders, start=1):
+            assert hsg.main(["build", md_folder, str(folder), "--shard", f"{index}/2", "--taxonomy-pages"]) == 0
+        manifest = hsg.sharding.read_shard_manifest(shard_folders[0])
+        assert manifest["shard"] == "1/2"
+
+        assert hsg.main(["merge", str(temp_path / "merged"), *map(str, shard_folders)]) == 0
+        assert _files(temp_path / "merged") == _files(temp_path / "full")
+
+        # Test: missing shard
+        with pytest.raises(ValueError, match="expected shards"):
+            hsg.merge_shards(shard_folders[:1], temp_path / "merged")
+
+        # Test: the same file from two shards
+        manifest_path = shard_folders[1] / hsg.sharding.SHARD_MANIFEST
+        manifest = json.loads(manifest_path.read_text(encoding="utf8"))
+        manifest["files"].append("tags/css/index.html")
+        manifest_path.write_text(json.dumps(manifest), encoding="utf8")
+        with pytest.raises(ValueError, match=r"collide: tags/css/index\.html"):
+            hsg.merge_shards(shard_folders, temp_path / "merged")
+
+        # Test: search index is not available for shards
+        with pytest.raises(ValueError, match="search_index"):
+            hsg.StaticSiteGenerator(md_folder).generate_site(temp_path / "x", shard="1/2", search_index=True)
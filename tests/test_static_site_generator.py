@@ -1,5 +1,7 @@
 """Tests for the StaticSiteGenerator class."""
 
+import gc
+import shutil
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
@@ -102,3 +104,40 @@ def test_static_site_generator() -> None:
 
         assert (test_html_folder / "test_01/img/test-image.png").exists()
         assert (test_html_folder / "test_02/img/test-image.png").exists()
+
+
+def test_static_site_generator_streaming() -> None:
+    """Streaming mode keeps no articles and builds the same files as the default mode."""
+    md_folder = Path(__file__).parent / "data"
+    with TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        sg = hsg.StaticSiteGenerator(md_folder, streaming=True)
+        assert sg.articles == []
+        assert sorted(meta.handle for meta in sg.article_metas) == ["test_01", "test_02", "test_03"]
+        assert sg.taxonomy.handles("tags", "CSS") == ["test_01"]
+        sg.generate_site(temp_path / "streaming")
+        gc.collect()
+        assert not any(isinstance(item, hsg.Article) for item in gc.get_objects())
+
+        hsg.StaticSiteGenerator(md_folder).generate_site(temp_path / "default")
+        local = hsg.LocalFileSystem()
+        for path in local.iter_files(temp_path / "default"):
+            streamed = temp_path / "streaming" / path.relative_to(temp_path / "default")
+            assert local.read_bytes(streamed) == local.read_bytes(path)
+
+        sg.update_article(md_folder / "test_01" / "test_01.md")
+        assert sg.articles == []
+
+
+def test_changed_notes_skips_deleted_notes() -> None:
+    """A note deleted after a build is not returned for an update."""
+    with TemporaryDirectory() as tmp:
+        md_folder = Path(tmp) / "md"
+        shutil.copytree(Path(__file__).parent / "data", md_folder, ignore=shutil.ignore_patterns("theme_dist"))
+        sg = hsg.StaticSiteGenerator(md_folder)
+        sg.generate_site(Path(tmp) / "site")
+        deleted = md_folder / "test_02" / "test_02.md"
+        deleted.unlink()
+        changed = md_folder / "test_03" / "test_03.md"
+        assert sg.changed_notes([deleted, changed]) == [changed]
+        assert "test_02" in sg.build_plan.handles
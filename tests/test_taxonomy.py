@@ -0,0 +1,123 @@
+"""Tests for TaxonomyIndex and taxonomy pages of StaticSiteGenerator."""
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import harrix_pyssg as hsg
+
+
+def _write_note(folder: Path, name: str, yaml_text: str, title: str) -> Path:
+    note_dir = folder / name
+    note_dir.mkdir(parents=True, exist_ok=True)
+    md_filename = note_dir / f"{name}.md"
+    md_filename.write_text(f"---\n{yaml_text}\n---\n\n# {title}\n\nText.\n", encoding="utf8")
+    return md_filename
+
+
+def test_taxonomy_index() -> None:
+    """Keep handles sorted by date and report affected keys on updates."""
+    index = hsg.TaxonomyIndex()
+    first = hsg.TaxonomyEntry("a", "First", tags=("css", "html"))
+    second = hsg.TaxonomyEntry("b", "Second", tags=("css",), series="lesson")
+    assert index.update(first) == {("tags", "css"), ("tags", "html")}
+    assert index.update(second) == {("tags", "css"), ("series", "lesson")}
+    assert index.terms("tags") == ["css", "html"]
+    assert index.handles("tags", "css") == ["a", "b"]
+
+    # Test: unchanged entry affects nothing
+    assert index.update(hsg.TaxonomyEntry("a", "First", tags=("css", "html"))) == set()
+
+    # Test: only changed terms are affected when title and date stay the same
+    assert index.update(hsg.TaxonomyEntry("a", "First", tags=("css", "js"))) == {("tags", "html"), ("tags", "js")}
+    assert "html" not in index.terms("tags")
+
+    # Test: a new title touches every listing of the article
+    assert index.update(hsg.TaxonomyEntry("a", "Renamed", tags=("css", "js"))) == {("tags", "css"), ("tags", "js")}
+
+    # Test: remove method
+    assert index.remove("b") == {("tags", "css"), ("series", "lesson")}
+    assert index.handles("series", "lesson") == []
+
+
+def test_listing_paths_are_unique_and_stay_in_kind_folder() -> None:
+    """Terms that slugify alike get distinct folders, and dot-only terms cannot leave `tags/`."""
+    index = hsg.TaxonomyIndex()
+    paths = [index.listing_path("tags", term) for term in ("C++", "C#", "C", "CSS", ".", "..")]
+    assert len(set(paths)) == len(paths)
+    assert paths[2:4] == ["tags/c", "tags/css"]
+    assert all(path.startswith("tags/") and "/" not in path.removeprefix("tags/") for path in paths)
+    assert all(part not in {".", ".."} for path in paths for part in path.split("/"))
+
+    with TemporaryDirectory() as tmp:
+        html_folder = Path(tmp)
+        (html_folder / "index.html").write_text("root", encoding="utf8")
+        for handle, tags in (("a", ("C++",)), ("b", ("C#",)), ("c", ("C", "..", "."))):
+            index.update(hsg.TaxonomyEntry(handle, handle.upper(), tags=tags))
+        written = index.write_listings(html_folder)
+        assert len(written) == 5  # noqa: PLR2004
+        assert (html_folder / "index.html").read_text(encoding="utf8") == "root"
+        assert all(path.parent.parent == html_folder / "tags" for path in written)
+
+
+def test_listing_paths_of_terms_that_differ_by_case() -> None:
+    """Terms that differ only by case get distinct lower-case folders, and move back when one disappears."""
+    index = hsg.TaxonomyIndex()
+    assert index.update(hsg.TaxonomyEntry("a", "A", tags=("CSS",))) == {("tags", "CSS")}
+    assert index.listing_path("tags", "CSS") == "tags/css"
+
+    # Test: a second spelling moves both listings to hashed folders
+    assert index.update(hsg.TaxonomyEntry("b", "B", tags=("css",))) == {("tags", "css"), ("tags", "CSS")}
+    upper, lower = index.listing_path("tags", "CSS"), index.listing_path("tags", "css")
+    assert upper != lower
+    assert upper.startswith("tags/css-")
+    assert lower.startswith("tags/css-")
+
+    with TemporaryDirectory() as tmp:
+        html_folder = Path(tmp)
+        (html_folder / "tags" / "css").mkdir(parents=True)
+        (html_folder / "tags" / "css" / "index.html").write_text("old", encoding="utf8")
+        written = index.write_listings(html_folder)
+        assert {path.parent.name for path in written} == {upper.removeprefix("tags/"), lower.removeprefix("tags/")}
+        assert not (html_folder / "tags" / "css" / "index.html").exists()
+
+        # Test: when one spelling disappears, the other one returns to the plain folder
+        assert index.remove("b") == {("tags", "css"), ("tags", "CSS")}
+        assert index.listing_path("tags", "CSS") == "tags/css"
+        index.write_listings(html_folder, keys={("tags", "css"), ("tags", "CSS")})
+        assert sorted(path.parent.name for path in html_folder.glob("tags/*/index.html")) == ["css"]
+        assert "A" in (html_folder / "tags" / "css" / "index.html").read_text(encoding="utf8")
+
+
+def test_generate_site_taxonomy() -> None:
+    """Write listing pages, series blocks and update them incrementally."""
+    with TemporaryDirectory() as tmp:
+        md_folder = Path(tmp) / "content"
+        html_folder = Path(tmp) / "site"
+        _write_note(md_folder, "part-1", "date: 2022-01-01\ntags: [css]\nrelated-id: lesson", "Part 1")
+        part_2 = _write_note(md_folder, "part-2", "date: 2022-02-01\ntags: [css, html]\nrelated-id: lesson", "Part 2")
+        _write_note(md_folder, "draft", "date: 2022-03-01\ntags: [css]\npublished: false", "Draft")
+
+        sg = hsg.StaticSiteGenerator(md_folder)
+        assert len(sg.taxonomy) == 2  # noqa: PLR2004
+        assert sg.taxonomy.handles("tags", "css") == ["part-1", "part-2"]
+        sg.generate_site(html_folder, taxonomy_pages=True)
+
+        part_1_html = (html_folder / "part-1" / "index.html").read_text(encoding="utf8")
+        assert 'class="h-ssg-series"' in part_1_html
+        assert '<a href="../part-2/">Part 2</a>' in part_1_html
+        assert "<strong>Part 1</strong>" in part_1_html
+
+        css_listing = (html_folder / "tags" / "css" / "index.html").read_text(encoding="utf8")
+        assert css_listing.index("Part 2") < css_listing.index("Part 1")
+        assert "Draft" not in css_listing
+        assert '<a href="../../part-1/">' in css_listing
+        assert (html_folder / "tags" / "html" / "index.html").is_file()
+
+        # Test: changing one note only touches its listings and series
+        part_2.write_text(
+            "---\ndate: 2022-02-01\ntags: [css]\nrelated-id: lesson\n---\n\n# Part 2\n\nText.\n", encoding="utf8"
+        )
+        affected = sg.update_article(part_2)
+        assert affected == {("tags", "html")}
+        assert not (html_folder / "tags" / "html" / "index.html").exists()
+        assert (html_folder / "tags" / "css" / "index.html").is_file()
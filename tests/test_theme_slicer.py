@@ -1,5 +1,8 @@
 """Tests for ThemeSlicer and PageAssembler."""
 
+import json
+import re
+import shutil
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
@@ -69,6 +72,152 @@ def test_theme_slicer_and_page_assembler() -> None:
         assert "stl-viewer/stl-viewer.js" in with_stl
 
 
+def test_theme_bundle() -> None:
+    """PageAssembler loads the compiled bundle and ignores it once a part changes."""
+    with TemporaryDirectory() as tmp:
+        theme_dir = Path(tmp) / "theme"
+        hsg.ThemeSlicer(THEME_DIST, theme_dir).slice()
+        assert (theme_dir / "bundle.json").is_file()
+
+        from_files = hsg.PageAssembler(theme_dir)
+        (theme_dir / "bundle.json").unlink()
+        assert from_files.from_bundle is True
+        assert hsg.PageAssembler(theme_dir).from_bundle is False
+
+        hsg.compile_theme_bundle(theme_dir)
+        bundled = hsg.PageAssembler(theme_dir)
+        assert bundled.from_bundle is True
+        features = hsg.PageFeatures(katex=True)
+        page = bundled.assemble("<h1>T</h1>", "T", features, asset_prefix="../")
+        assert page == from_files.assemble("<h1>T</h1>", "T", features, asset_prefix="../")
+        assert 'href="../css/app.css"' in page
+        assert "<title>T</title>" in page
+
+        footer = theme_dir / "parts" / "chrome_footer.html"
+        footer.write_text('<footer class="footer">Changed footer</footer>\n', encoding="utf8")
+        stale = hsg.PageAssembler(theme_dir)
+        assert stale.from_bundle is False
+        assert "Changed footer" in stale.assemble("<h1>T</h1>", "T")
+
+
+def test_theme_slicer_incremental() -> None:
+    """A second slice skips unchanged inputs and syncs only what changed."""
+    with TemporaryDirectory() as tmp:
+        dist_dir = Path(tmp) / "dist"
+        theme_dir = Path(tmp) / "theme"
+        shutil.copytree(THEME_DIST, dist_dir)
+        slicer = hsg.ThemeSlicer(dist_dir, theme_dir)
+        slicer.slice()
+        assert slicer.stats.parts_sliced is True
+        assets = slicer.stats.assets_copied
+        assert assets > 0
+
+        slicer.slice()
+        assert slicer.stats == hsg.SliceStats(assets_unchanged=assets)
+        assert hsg.PageAssembler(theme_dir).from_bundle is True
+
+        (dist_dir / "css" / "app.css").write_text("body { color: red; }\n", encoding="utf8")
+        (dist_dir / "js" / "early.js").unlink()
+        slicer.slice()
+        assert slicer.stats == hsg.SliceStats(assets_copied=1, assets_removed=1, assets_unchanged=assets - 2)
+        assert "red" in (theme_dir / "css" / "app.css").read_text(encoding="utf8")
+        assert not (theme_dir / "js" / "early.js").exists()
+
+        source = dist_dir / "article.html"
+        source.write_text(source.read_text(encoding="utf8").replace("Footer", "New footer"), encoding="utf8")
+        slicer.slice()
+        assert slicer.stats.parts_sliced is True
+        assert slicer.stats.assets_copied == 0
+        assert "New footer" in hsg.PageAssembler(theme_dir).assemble("<h1>T</h1>", "T")
+
+
+def test_theme_slicer_fingerprint() -> None:
+    """Fingerprinted CSS/JS names are recorded and referenced by parts and optional parts."""
+    with TemporaryDirectory() as tmp:
+        dist_dir = Path(tmp) / "dist"
+        theme_dir = Path(tmp) / "theme"
+        shutil.copytree(THEME_DIST, dist_dir)
+        slicer = hsg.ThemeSlicer(dist_dir, theme_dir, fingerprint=True)
+        slicer.slice()
+
+        manifest = json.loads((theme_dir / "manifest.json").read_text(encoding="utf8"))
+        app_css = manifest["fingerprints"]["css/app.css"]
+        katex_js = manifest["fingerprints"]["js/katex/katex.js"]
+        assert re.fullmatch(r"css/app\.[0-9a-f]{8}\.css", app_css)
+        assert (theme_dir / app_css).is_file()
+        assert not (theme_dir / "css" / "app.css").exists()
+
+        page = hsg.PageAssembler(theme_dir).assemble("<h1>T</h1>", "T", hsg.PageFeatures(katex=True), "../")
+        assert f'href="../{app_css}"' in page
+        assert f'src="../{katex_js}"' in page
+        assert "css/app.css" not in page
+
+        (dist_dir / "css" / "app.css").write_text("body { color: red; }\n", encoding="utf8")
+        slicer.slice()
+        assert slicer.stats.parts_sliced is True
+        new_app_css = json.loads((theme_dir / "manifest.json").read_text(encoding="utf8"))["fingerprints"][
+            "css/app.css"
+        ]
+        assert new_app_css != app_css
+        assert (theme_dir / new_app_css).is_file()
+        assert not (theme_dir / app_css).exists()
+        assert new_app_css in hsg.PageAssembler(theme_dir).assemble("<h1>T</h1>", "T")
+
+
+def test_theme_slicer_inline_assets() -> None:
+    """Small stylesheets and classic scripts are inlined; deferred scripts and large files stay external."""
+    with TemporaryDirectory() as tmp:
+        dist_dir = Path(tmp) / "dist"
+        theme_dir = Path(tmp) / "theme"
+        shutil.copytree(THEME_DIST, dist_dir)
+        (dist_dir / "css" / "stl-viewer" / "stl-viewer.css").write_text("x" * 2000, encoding="utf8")
+        (dist_dir / "js" / "early.js").write_text("document.write('</script>');\n", encoding="utf8")
+        slicer = hsg.ThemeSlicer(dist_dir, theme_dir, inline_max_size=1024)
+        slicer.slice()
+
+        manifest = json.loads((theme_dir / "manifest.json").read_text(encoding="utf8"))
+        assert manifest["inlined"] == ["css/app.css", "css/chart/chart.css", "css/katex/katex.css", "js/early.js"]
+        page = hsg.PageAssembler(theme_dir).assemble("<h1>T</h1>", "T", hsg.PageFeatures(katex=True, stl=True))
+        app_css = (dist_dir / "css" / "app.css").read_text(encoding="utf8").strip()
+        assert f"<style>{app_css}</style>" in page
+        assert "<script>document.write('<\\/script>');</script>" in page
+        assert "css/app.css" not in page
+        assert "js/early.js" not in page
+        assert 'href="css/stl-viewer/stl-viewer.css"' in page
+        assert 'src="js/app.js"' in page
+
+        (dist_dir / "css" / "app.css").write_text("body { color: red; }\n", encoding="utf8")
+        slicer.slice()
+        assert slicer.stats.parts_sliced is True
+        assert "<style>body { color: red; }</style>" in hsg.PageAssembler(theme_dir).assemble("<h1>T</h1>", "T")
+
+
+def test_feature_assets() -> None:
+    """Marked template tags become optional parts loaded only by pages with the feature."""
+    with TemporaryDirectory() as tmp:
+        theme_dir = Path(tmp) / "theme"
+        hsg.ThemeSlicer(THEME_DIST, theme_dir).slice()
+        manifest = json.loads((theme_dir / "manifest.json").read_text(encoding="utf8"))
+        assert manifest["features"]["mermaid"] == {"head": [], "scripts": ["mermaid_scripts"]}
+        assert manifest["features"]["chart"] == {"head": ["chart_head"], "scripts": ["chart_scripts"]}
+        assert manifest["features"]["katex"] == {"head": ["katex_css"], "scripts": ["katex_js"]}
+
+        assembler = hsg.PageAssembler(theme_dir)
+        plain = assembler.assemble("<h1>T</h1>", "T")
+        assert "mermaid" not in plain
+        assert "chart" not in plain
+        assert "h-ssg:feature" not in plain
+
+        chart = assembler.assemble("<h1>T</h1>", "T", hsg.PageFeatures(chart=True))
+        head, _, body = chart.partition("</head>")
+        assert "css/chart/chart.css" in head
+        assert "js/chart/chart.js" in body
+        assert "mermaid" not in chart
+
+        features = hsg.detect_page_features("<p>x</p>", yaml_dict={"features": ["Mermaid"]})
+        assert "js/mermaid/mermaid.js" in assembler.assemble("<h1>T</h1>", "T", features)
+
+
 def test_detect_page_features() -> None:
     """Detect katex/mermaid/stl features from YAML and content."""
     features = hsg.detect_page_features("<p>Hi</p>", md_content="Hello", yaml_dict={})
@@ -91,6 +240,11 @@ def test_detect_page_features() -> None:
     )
     assert features.stl is True
 
+    # Test: scalar `features` values that are not strings are ignored
+    for value in (5, True, {"mermaid": True}):
+        assert hsg.detect_page_features("<p>x</p>", yaml_dict={"features": value}).extra == frozenset()
+    assert hsg.detect_page_features("<p>x</p>", yaml_dict={"features": "Chart"}).extra == {"chart"}
+
 
 def test_generate_html_with_theme() -> None:
     """Article.generate_html wraps content when a theme is provided."""